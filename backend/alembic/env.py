@@ -13,6 +13,9 @@ from app.models.base import Base
 from app.models.fact import Fact
 from app.models.painting import Painting
 from app.models.painting_alias import PaintingAlias
+from app.models.painting_genre import PaintingGenre
+from app.models.related import PaintingRelated, PaintingRelatedState
+from app.models.tombstone import CatalogTombstone
 
 config = context.config
 
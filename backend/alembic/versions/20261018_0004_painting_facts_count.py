@@ -0,0 +1,118 @@
+"""denormalize facts count onto paintings
+
+Revision ID: 20261018_0004
+Revises: 20240912_0003
+Create Date: 2026-10-18 00:04:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0004"
+down_revision = "20240912_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "paintings",
+        sa.Column("facts_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE paintings p
+        SET facts_count = c.cnt
+        FROM (SELECT painting_id, count(*) AS cnt FROM facts GROUP BY painting_id) c
+        WHERE c.painting_id = p.id
+        """
+    )
+
+    # Statement-level triggers with transition tables: a bulk insert of N facts
+    # touches each affected painting row once instead of N times.
+    op.execute(
+        """
+        CREATE FUNCTION paintings_facts_count_insert() RETURNS trigger AS $$
+        BEGIN
+            UPDATE paintings p
+            SET facts_count = p.facts_count + d.cnt
+            FROM (SELECT painting_id, count(*) AS cnt FROM new_facts GROUP BY painting_id) d
+            WHERE d.painting_id = p.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION paintings_facts_count_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE paintings p
+            SET facts_count = p.facts_count - d.cnt
+            FROM (SELECT painting_id, count(*) AS cnt FROM old_facts GROUP BY painting_id) d
+            WHERE d.painting_id = p.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION paintings_facts_count_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE paintings p
+            SET facts_count = p.facts_count + d.delta
+            FROM (
+                SELECT painting_id, sum(delta) AS delta
+                FROM (
+                    SELECT n.painting_id, 1 AS delta
+                    FROM new_facts n JOIN old_facts o ON o.id = n.id
+                    WHERE o.painting_id IS DISTINCT FROM n.painting_id
+                    UNION ALL
+                    SELECT o.painting_id, -1 AS delta
+                    FROM new_facts n JOIN old_facts o ON o.id = n.id
+                    WHERE o.painting_id IS DISTINCT FROM n.painting_id
+                ) moved
+                GROUP BY painting_id
+            ) d
+            WHERE d.painting_id = p.id AND d.delta <> 0;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_facts_count_insert
+        AFTER INSERT ON facts
+        REFERENCING NEW TABLE AS new_facts
+        FOR EACH STATEMENT EXECUTE FUNCTION paintings_facts_count_insert()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_facts_count_delete
+        AFTER DELETE ON facts
+        REFERENCING OLD TABLE AS old_facts
+        FOR EACH STATEMENT EXECUTE FUNCTION paintings_facts_count_delete()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_facts_count_update
+        AFTER UPDATE ON facts
+        REFERENCING OLD TABLE AS old_facts NEW TABLE AS new_facts
+        FOR EACH STATEMENT EXECUTE FUNCTION paintings_facts_count_update()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_facts_count_update ON facts")
+    op.execute("DROP TRIGGER IF EXISTS trg_facts_count_delete ON facts")
+    op.execute("DROP TRIGGER IF EXISTS trg_facts_count_insert ON facts")
+    op.execute("DROP FUNCTION IF EXISTS paintings_facts_count_update()")
+    op.execute("DROP FUNCTION IF EXISTS paintings_facts_count_delete()")
+    op.execute("DROP FUNCTION IF EXISTS paintings_facts_count_insert()")
+    op.drop_column("paintings", "facts_count")
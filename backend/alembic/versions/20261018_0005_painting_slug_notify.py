@@ -0,0 +1,49 @@
+"""notify listeners when slug mappings change
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18 00:05:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION notify_painting_slugs() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('painting_slugs', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # facts_count bookkeeping updates paintings constantly, so only slug
+    # changes (and inserts/deletes, which affect negative entries) notify.
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_notify_slugs
+        AFTER INSERT OR DELETE OR UPDATE OF artist_slug, painting_slug ON paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_slugs()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_painting_aliases_notify_slugs
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON painting_aliases
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_slugs()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_painting_aliases_notify_slugs ON painting_aliases")
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_notify_slugs ON paintings")
+    op.execute("DROP FUNCTION IF EXISTS notify_painting_slugs()")
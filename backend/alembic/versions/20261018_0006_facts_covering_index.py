@@ -0,0 +1,30 @@
+"""cover fact ordering and version lookups with one index
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18 00:06:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_facts_painting_order",
+        "facts",
+        ["painting_id", "order_index"],
+        unique=False,
+        postgresql_include=["id", "updated_at"],
+    )
+    op.drop_index("ix_facts_painting_id", table_name="facts")
+
+
+def downgrade() -> None:
+    op.create_index("ix_facts_painting_id", "facts", ["painting_id"], unique=False)
+    op.drop_index("ix_facts_painting_order", table_name="facts")
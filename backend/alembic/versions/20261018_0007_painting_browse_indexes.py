@@ -0,0 +1,41 @@
+"""indexes for keyset browsing by artist, museum and genre
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18 00:07:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Browsing by artist walks uq_artist_painting_slug, which already is the
+    # (artist_slug, painting_slug) btree the keyset order needs.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_paintings_museum_order",
+            "paintings",
+            ["museum_name", "artist_slug", "painting_slug"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_paintings_genre_name",
+            "paintings",
+            ["genre_name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_paintings_genre_name", table_name="paintings", postgresql_concurrently=True)
+        op.drop_index("ix_paintings_museum_order", table_name="paintings", postgresql_concurrently=True)
@@ -0,0 +1,134 @@
+"""full-text and trigram search over paintings and facts
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18 00:08:00
+"""
+
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0008"
+down_revision = "20261018_0007"
+branch_labels = None
+depends_on = None
+
+# The stock "russian" configuration stems Cyrillic words with russian_stem and
+# Latin words with english_stem, so it covers both catalog languages. Proper
+# names are additionally indexed unstemmed with "simple". ``{row}`` is the row
+# qualifier: ``NEW.`` inside the triggers, ``t.`` in the backfill.
+PAINTING_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce({row}name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}artist_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce({row}museum_name, '')), 'C')"
+)
+FACT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce({row}name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce({row}description_md, '')), 'B')"
+)
+
+# table -> (vector expression, columns it reads)
+SEARCH_VECTORS = {
+    "paintings": (PAINTING_SEARCH_VECTOR, "name, artist_name, museum_name"),
+    "facts": (FACT_SEARCH_VECTOR, "name, description_md"),
+}
+
+BACKFILL_BATCH_SIZE = 5000
+
+# A stored generated column (or a plain CREATE INDEX) would rewrite or lock the
+# tables for the whole build, so the vectors are plain columns kept current by
+# BEFORE triggers, existing rows are filled in short batches, and the GIN indexes
+# are built CONCURRENTLY.
+
+
+def _backfill(table: str, expression: str) -> None:
+    connection = op.get_bind()
+    statement = sa.text(
+        f"""
+        WITH batch AS (
+            SELECT id FROM {table} WHERE id > :after ORDER BY id LIMIT :batch_size
+        )
+        UPDATE {table} t
+        SET search_vector = {expression.format(row="t.")}
+        FROM batch
+        WHERE t.id = batch.id
+        RETURNING t.id
+        """
+    )
+    after = uuid.UUID(int=0)
+    while True:
+        ids = connection.execute(statement, {"after": after, "batch_size": BACKFILL_BATCH_SIZE}).scalars().all()
+        if not ids:
+            return
+        after = max(ids)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, (expression, columns) in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            f"""
+            CREATE FUNCTION {table}_search_vector() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {expression.format(row="NEW.")};
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_search_vector
+            BEFORE INSERT OR UPDATE OF {columns} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector()
+            """
+        )
+
+    # Each batch commits on its own, so row locks are held only briefly.
+    with op.get_context().autocommit_block():
+        for table, (expression, _) in SEARCH_VECTORS.items():
+            _backfill(table, expression)
+        op.create_index(
+            "ix_paintings_search_vector",
+            "paintings",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_facts_search_vector", "facts", ["search_vector"], postgresql_using="gin", postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_paintings_name_trgm",
+            "paintings",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_paintings_artist_name_trgm",
+            "paintings",
+            ["artist_name"],
+            postgresql_using="gin",
+            postgresql_ops={"artist_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_paintings_artist_name_trgm", table_name="paintings", postgresql_concurrently=True)
+        op.drop_index("ix_paintings_name_trgm", table_name="paintings", postgresql_concurrently=True)
+        op.drop_index("ix_facts_search_vector", table_name="facts", postgresql_concurrently=True)
+        op.drop_index("ix_paintings_search_vector", table_name="paintings", postgresql_concurrently=True)
+    for table in SEARCH_VECTORS:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_vector ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector()")
+        op.drop_column(table, "search_vector")
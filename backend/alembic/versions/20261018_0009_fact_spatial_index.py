@@ -0,0 +1,83 @@
+"""spatial index over fact rectangles and fact change notifications
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18 00:09:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0009"
+down_revision = "20261018_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # btree_gist lets painting_id share one GiST index with the rectangle.
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "CREATE INDEX ix_facts_painting_box ON facts "
+        "USING gist (painting_id, box(point(x, y), point(x + w, y + h)))"
+    )
+
+    # Per-painting invalidation for in-process caches. Payload is the painting
+    # id, or '*' when a statement touched too many paintings to list.
+    op.execute(
+        """
+        CREATE FUNCTION notify_painting_content() RETURNS trigger AS $$
+        DECLARE
+            changed uuid[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(DISTINCT painting_id) INTO changed FROM new_facts;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(DISTINCT painting_id) INTO changed FROM old_facts;
+            ELSE
+                SELECT array_agg(DISTINCT painting_id) INTO changed
+                FROM (SELECT painting_id FROM new_facts UNION SELECT painting_id FROM old_facts) touched;
+            END IF;
+
+            IF cardinality(changed) > 1000 THEN
+                PERFORM pg_notify('painting_content', '*');
+            ELSIF changed IS NOT NULL THEN
+                PERFORM pg_notify('painting_content', painting_id::text) FROM unnest(changed) AS painting_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_facts_notify_content_insert
+        AFTER INSERT ON facts
+        REFERENCING NEW TABLE AS new_facts
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_content()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_facts_notify_content_update
+        AFTER UPDATE ON facts
+        REFERENCING OLD TABLE AS old_facts NEW TABLE AS new_facts
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_content()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_facts_notify_content_delete
+        AFTER DELETE ON facts
+        REFERENCING OLD TABLE AS old_facts
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_content()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_facts_notify_content_delete ON facts")
+    op.execute("DROP TRIGGER IF EXISTS trg_facts_notify_content_update ON facts")
+    op.execute("DROP TRIGGER IF EXISTS trg_facts_notify_content_insert ON facts")
+    op.execute("DROP FUNCTION IF EXISTS notify_painting_content()")
+    op.execute("DROP INDEX IF EXISTS ix_facts_painting_box")
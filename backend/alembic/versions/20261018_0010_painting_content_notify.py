@@ -0,0 +1,61 @@
+"""notify painting_content listeners on painting row changes
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18 00:10:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0010"
+down_revision = "20261018_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE FUNCTION notify_painting_rows() RETURNS trigger AS $$
+        DECLARE
+            changed uuid[];
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                SELECT array_agg(id) INTO changed FROM new_paintings;
+            ELSE
+                SELECT array_agg(id) INTO changed FROM old_paintings;
+            END IF;
+
+            IF cardinality(changed) > 1000 THEN
+                PERFORM pg_notify('painting_content', '*');
+            ELSIF changed IS NOT NULL THEN
+                PERFORM pg_notify('painting_content', painting_id::text) FROM unnest(changed) AS painting_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_notify_content_update
+        AFTER UPDATE ON paintings
+        REFERENCING NEW TABLE AS new_paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_rows()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_notify_content_delete
+        AFTER DELETE ON paintings
+        REFERENCING OLD TABLE AS old_paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_rows()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_notify_content_delete ON paintings")
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_notify_content_update ON paintings")
+    op.execute("DROP FUNCTION IF EXISTS notify_painting_rows()")
@@ -0,0 +1,30 @@
+"""track image derivatives on paintings
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18 00:11:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0011"
+down_revision = "20261018_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("paintings", sa.Column("image_sha256", sa.String(64), nullable=True))
+    op.add_column("paintings", sa.Column("image_width", sa.Integer(), nullable=True))
+    op.add_column("paintings", sa.Column("image_height", sa.Integer(), nullable=True))
+    # The image_url the derivatives were built from; a mismatch marks them stale.
+    op.add_column("paintings", sa.Column("image_source_url", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("paintings", "image_source_url")
+    op.drop_column("paintings", "image_height")
+    op.drop_column("paintings", "image_width")
+    op.drop_column("paintings", "image_sha256")
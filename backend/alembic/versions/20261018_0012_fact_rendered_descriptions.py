@@ -0,0 +1,28 @@
+"""store rendered fact descriptions
+
+Revision ID: 20261018_0012
+Revises: 20261018_0011
+Create Date: 2026-10-18 00:12:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0012"
+down_revision = "20261018_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by the writers and by `python -m app.render_facts` for existing rows.
+    op.add_column("facts", sa.Column("description_html", sa.Text(), nullable=True))
+    op.add_column("facts", sa.Column("description_text", sa.Text(), nullable=True))
+    op.add_column("facts", sa.Column("render_version", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("facts", "render_version")
+    op.drop_column("facts", "description_text")
+    op.drop_column("facts", "description_html")
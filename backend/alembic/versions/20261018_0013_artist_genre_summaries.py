@@ -0,0 +1,87 @@
+"""artist and genre summary materialized views
+
+Revision ID: 20261018_0013
+Revises: 20261018_0012
+Create Date: 2026-10-18 00:13:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0013"
+down_revision = "20261018_0012"
+branch_labels = None
+depends_on = None
+
+# The representative painting is the most annotated one; ties go to the first slug.
+REPRESENTATIVE_COLUMNS = """
+    r.artist_slug AS representative_artist_slug,
+    r.painting_slug AS representative_painting_slug,
+    r.name AS representative_name,
+    r.image_url AS representative_image_url,
+    r.image_sha256 AS representative_image_sha256,
+    r.image_width AS representative_image_width,
+    r.image_height AS representative_image_height
+"""
+
+
+def upgrade() -> None:
+    # Counts come from paintings.facts_count, so a refresh never scans facts.
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW artist_summaries AS
+        SELECT
+            a.artist_slug,
+            a.artist_name,
+            a.paintings_count,
+            a.facts_count,
+            {REPRESENTATIVE_COLUMNS}
+        FROM (
+            SELECT artist_slug, min(artist_name) AS artist_name, count(*) AS paintings_count,
+                   sum(facts_count)::bigint AS facts_count
+            FROM paintings
+            GROUP BY artist_slug
+        ) a
+        CROSS JOIN LATERAL (
+            SELECT p.artist_slug, p.painting_slug, p.name, p.image_url, p.image_sha256, p.image_width, p.image_height
+            FROM paintings p
+            WHERE p.artist_slug = a.artist_slug
+            ORDER BY p.facts_count DESC, p.painting_slug
+            LIMIT 1
+        ) r
+        """
+    )
+    # Unique indexes are what REFRESH ... CONCURRENTLY diffs on; they also serve
+    # the keyset pages and single-row lookups.
+    op.execute("CREATE UNIQUE INDEX ux_artist_summaries_slug ON artist_summaries (artist_slug)")
+
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW genre_summaries AS
+        SELECT
+            g.genre_name,
+            g.paintings_count,
+            g.artists_count,
+            g.facts_count,
+            {REPRESENTATIVE_COLUMNS}
+        FROM (
+            SELECT genre AS genre_name, count(*) AS paintings_count, count(DISTINCT artist_slug) AS artists_count,
+                   sum(facts_count)::bigint AS facts_count
+            FROM paintings, unnest(genre_name) AS genre
+            GROUP BY genre
+        ) g
+        CROSS JOIN LATERAL (
+            SELECT p.artist_slug, p.painting_slug, p.name, p.image_url, p.image_sha256, p.image_width, p.image_height
+            FROM paintings p
+            WHERE p.genre_name @> ARRAY[g.genre_name]
+            ORDER BY p.facts_count DESC, p.artist_slug, p.painting_slug
+            LIMIT 1
+        ) r
+        """
+    )
+    op.execute("CREATE UNIQUE INDEX ux_genre_summaries_name ON genre_summaries (genre_name)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS genre_summaries")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS artist_summaries")
@@ -0,0 +1,98 @@
+"""change feed: alias timestamps, updated_at indexes and tombstones
+
+Revision ID: 20261018_0014
+Revises: 20261018_0013
+Create Date: 2026-10-18 00:14:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0014"
+down_revision = "20261018_0013"
+branch_labels = None
+depends_on = None
+
+TRIGGER_TABLES = (
+    ("paintings", "paintings"),
+    ("facts", "facts"),
+    ("painting_aliases", "aliases"),
+)
+
+
+def upgrade() -> None:
+    # now() is stable, so existing rows get the migration time without a rewrite.
+    op.add_column(
+        "painting_aliases",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "catalog_tombstones",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=True), primary_key=True),
+        sa.Column("entity", sa.Text(), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("painting_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_catalog_tombstones_deleted_at", "catalog_tombstones", ["deleted_at", "entity_id"])
+
+    op.execute(
+        """
+        CREATE FUNCTION record_catalog_tombstones() RETURNS trigger AS $$
+        BEGIN
+            IF TG_TABLE_NAME = 'paintings' THEN
+                INSERT INTO catalog_tombstones (entity, entity_id, painting_id)
+                SELECT 'painting', id, id FROM deleted_rows;
+            ELSIF TG_TABLE_NAME = 'facts' THEN
+                INSERT INTO catalog_tombstones (entity, entity_id, painting_id)
+                SELECT 'fact', id, painting_id FROM deleted_rows;
+            ELSE
+                INSERT INTO catalog_tombstones (entity, entity_id, painting_id)
+                SELECT 'alias', id, painting_id FROM deleted_rows;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, name in TRIGGER_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{name}_tombstones
+            AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS deleted_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION record_catalog_tombstones()
+            """
+        )
+
+    # The change feed walks each table in (updated_at, id) order from a cursor.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_paintings_updated_at", "paintings", ["updated_at", "id"], unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_facts_updated_at", "facts", ["updated_at", "id"], unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_painting_aliases_updated_at",
+            "painting_aliases",
+            ["updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_painting_aliases_updated_at", table_name="painting_aliases", postgresql_concurrently=True)
+        op.drop_index("ix_facts_updated_at", table_name="facts", postgresql_concurrently=True)
+        op.drop_index("ix_paintings_updated_at", table_name="paintings", postgresql_concurrently=True)
+    for table, name in TRIGGER_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{name}_tombstones ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS record_catalog_tombstones()")
+    op.drop_index("ix_catalog_tombstones_deleted_at", table_name="catalog_tombstones")
+    op.drop_table("catalog_tombstones")
+    op.drop_column("painting_aliases", "updated_at")
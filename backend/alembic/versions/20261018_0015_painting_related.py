@@ -0,0 +1,58 @@
+"""precomputed related paintings
+
+Revision ID: 20261018_0015
+Revises: 20261018_0014
+Create Date: 2026-10-18 00:15:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0015"
+down_revision = "20261018_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per neighbour; the primary key serves a painting's list in rank order.
+    op.create_table(
+        "painting_related",
+        sa.Column(
+            "painting_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("paintings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("position", sa.SmallInteger(), primary_key=True),
+        sa.Column(
+            "related_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("paintings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_painting_related_related_id", "painting_related", ["related_id"])
+
+    # What each painting's list was built from, so incremental builds only redo changed paintings.
+    op.create_table(
+        "painting_related_state",
+        sa.Column(
+            "painting_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("paintings.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("features_digest", sa.Text(), nullable=False),
+        sa.Column("related_count", sa.SmallInteger(), nullable=False),
+        sa.Column("built_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("painting_related_state")
+    op.drop_index("ix_painting_related_related_id", table_name="painting_related")
+    op.drop_table("painting_related")
@@ -0,0 +1,72 @@
+"""facts_count triggers bump paintings.updated_at
+
+Revision ID: 20261018_0016
+Revises: 20261018_0015
+Create Date: 2026-10-18 00:16:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0016"
+down_revision = "20261018_0015"
+branch_labels = None
+depends_on = None
+
+# facts_count is part of the painting representation (API and change feed), so
+# the row must look changed to `updated_at >= :since` readers whenever it moves.
+COUNT_FUNCTIONS = {
+    "paintings_facts_count_insert": (
+        "p.facts_count + d.cnt",
+        "(SELECT painting_id, count(*) AS cnt FROM new_facts GROUP BY painting_id) d",
+        "d.painting_id = p.id",
+    ),
+    "paintings_facts_count_delete": (
+        "p.facts_count - d.cnt",
+        "(SELECT painting_id, count(*) AS cnt FROM old_facts GROUP BY painting_id) d",
+        "d.painting_id = p.id",
+    ),
+    "paintings_facts_count_update": (
+        "p.facts_count + d.delta",
+        """(
+                SELECT painting_id, sum(delta) AS delta
+                FROM (
+                    SELECT n.painting_id, 1 AS delta
+                    FROM new_facts n JOIN old_facts o ON o.id = n.id
+                    WHERE o.painting_id IS DISTINCT FROM n.painting_id
+                    UNION ALL
+                    SELECT o.painting_id, -1 AS delta
+                    FROM new_facts n JOIN old_facts o ON o.id = n.id
+                    WHERE o.painting_id IS DISTINCT FROM n.painting_id
+                ) moved
+                GROUP BY painting_id
+            ) d""",
+        "d.painting_id = p.id AND d.delta <> 0",
+    ),
+}
+
+
+def _replace_functions(touch: bool) -> None:
+    for name, (count, source, condition) in COUNT_FUNCTIONS.items():
+        assignments = f"facts_count = {count}, updated_at = now()" if touch else f"facts_count = {count}"
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+            BEGIN
+                UPDATE paintings p
+                SET {assignments}
+                FROM {source}
+                WHERE {condition};
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+
+
+def upgrade() -> None:
+    _replace_functions(touch=True)
+
+
+def downgrade() -> None:
+    _replace_functions(touch=False)
@@ -0,0 +1,57 @@
+"""notify slug and content listeners on TRUNCATE paintings
+
+Revision ID: 20261018_0017
+Revises: 20261018_0016
+Create Date: 2026-10-18 00:17:00
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0017"
+down_revision = "20261018_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # TRUNCATE fires no row-level or DELETE triggers, so without these a
+    # truncated catalog would keep being served from the slug and response caches.
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_notify_slugs ON paintings")
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_notify_slugs
+        AFTER INSERT OR DELETE OR UPDATE OF artist_slug, painting_slug OR TRUNCATE ON paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_slugs()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION notify_painting_rows_truncated() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('painting_content', '*');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_notify_content_truncate
+        AFTER TRUNCATE ON paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_rows_truncated()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_notify_content_truncate ON paintings")
+    op.execute("DROP FUNCTION IF EXISTS notify_painting_rows_truncated()")
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_notify_slugs ON paintings")
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_notify_slugs
+        AFTER INSERT OR DELETE OR UPDATE OF artist_slug, painting_slug ON paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_painting_slugs()
+        """
+    )
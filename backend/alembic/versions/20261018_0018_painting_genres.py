@@ -0,0 +1,101 @@
+"""painting_genres: an ordered access path for browsing by genre
+
+Revision ID: 20261018_0018
+Revises: 20261018_0017
+Create Date: 2026-10-18 00:18:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0018"
+down_revision = "20261018_0017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The GIN index on genre_name finds a genre's paintings but not in
+    # (artist_slug, painting_slug) order, so every browse page sorted the whole
+    # genre. The primary key of this table is that order, per genre.
+    op.create_table(
+        "painting_genres",
+        sa.Column("genre", sa.Text(), primary_key=True),
+        sa.Column("artist_slug", sa.String(200), primary_key=True),
+        sa.Column("painting_slug", sa.String(200), primary_key=True),
+        sa.Column(
+            "painting_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("paintings.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_painting_genres_painting_id", "painting_genres", ["painting_id"])
+    op.execute(
+        """
+        INSERT INTO painting_genres (genre, artist_slug, painting_slug, painting_id)
+        SELECT DISTINCT g.genre, p.artist_slug, p.painting_slug, p.id
+        FROM paintings p, unnest(p.genre_name) AS g(genre)
+        WHERE g.genre IS NOT NULL
+        """
+    )
+
+    # Deletes are covered by the foreign key. Updates only rewrite paintings
+    # whose genres or slugs changed: facts_count bookkeeping updates paintings
+    # constantly, and transition tables rule out an UPDATE OF column list.
+    op.execute(
+        """
+        CREATE FUNCTION sync_painting_genres() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                DELETE FROM painting_genres g
+                USING new_paintings n JOIN old_paintings o ON o.id = n.id
+                WHERE g.painting_id = n.id
+                  AND (n.genre_name, n.artist_slug, n.painting_slug)
+                      IS DISTINCT FROM (o.genre_name, o.artist_slug, o.painting_slug);
+                INSERT INTO painting_genres (genre, artist_slug, painting_slug, painting_id)
+                SELECT DISTINCT g.genre, n.artist_slug, n.painting_slug, n.id
+                FROM new_paintings n
+                JOIN old_paintings o ON o.id = n.id
+                CROSS JOIN unnest(n.genre_name) AS g(genre)
+                WHERE g.genre IS NOT NULL
+                  AND (n.genre_name, n.artist_slug, n.painting_slug)
+                      IS DISTINCT FROM (o.genre_name, o.artist_slug, o.painting_slug);
+            ELSE
+                INSERT INTO painting_genres (genre, artist_slug, painting_slug, painting_id)
+                SELECT DISTINCT g.genre, n.artist_slug, n.painting_slug, n.id
+                FROM new_paintings n
+                CROSS JOIN unnest(n.genre_name) AS g(genre)
+                WHERE g.genre IS NOT NULL;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_genres_insert
+        AFTER INSERT ON paintings
+        REFERENCING NEW TABLE AS new_paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_painting_genres()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_paintings_genres_update
+        AFTER UPDATE ON paintings
+        REFERENCING OLD TABLE AS old_paintings NEW TABLE AS new_paintings
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_painting_genres()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_genres_update ON paintings")
+    op.execute("DROP TRIGGER IF EXISTS trg_paintings_genres_insert ON paintings")
+    op.execute("DROP FUNCTION IF EXISTS sync_painting_genres()")
+    op.drop_index("ix_painting_genres_painting_id", table_name="painting_genres")
+    op.drop_table("painting_genres")
@@ -0,0 +1,70 @@
+import os
+from typing import Callable
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import (
+    ASYNCPG_DSN,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_STATEMENT_CACHE_SIZE,
+)
+from app.db.replicas import Replica, replica_set
+
+FAST_READ_PATH = os.getenv("FAST_READ_PATH", "0") == "1"
+
+_pool: asyncpg.Pool | None = None
+_replica_pools: dict[Replica, asyncpg.Pool] = {}
+
+
+async def _create_pool(dsn: str, init: Callable | None, min_size: int) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        dsn,
+        min_size=min_size,
+        max_size=DB_POOL_SIZE + DB_MAX_OVERFLOW,
+        max_inactive_connection_lifetime=DB_POOL_RECYCLE,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        init=init,
+    )
+
+
+async def open_fast_pool(dsn: str = ASYNCPG_DSN, init: Callable | None = None) -> asyncpg.Pool:
+    global _pool
+    if _pool is None:
+        _pool = await _create_pool(dsn, init, min_size=min(DB_POOL_SIZE, 2))
+        # Replica pools connect on first use, so a replica that is down at startup
+        # only stays out of rotation (the health check ejects it) instead of failing it.
+        for replica in replica_set.replicas:
+            _replica_pools[replica] = await _create_pool(replica.dsn, init, min_size=0)
+    return _pool
+
+
+async def close_fast_pool() -> None:
+    global _pool
+    for pool in _replica_pools.values():
+        await pool.close()
+    _replica_pools.clear()
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def get_fast_pool(replica: Replica | None = None) -> asyncpg.Pool | None:
+    """The primary's fast pool, or ``replica``'s; None while the fast path is off."""
+    if replica is None:
+        return _pool
+    return _replica_pools.get(replica)
+
+
+def fast_pool_for(session: AsyncSession) -> asyncpg.Pool | None:
+    """Fast pool on the server ``get_read_session`` picked for ``session``.
+
+    Reusing that choice keeps the fast path on healthy replicas and honours
+    ``X-Read-Your-Writes`` exactly like the ORM path.
+    """
+    if _pool is None:
+        return None
+    replica = session.info.get("replica")
+    return _pool if replica is None else _replica_pools.get(replica, _pool)
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import suppress
+from typing import Callable
+
+import asyncpg
+
+from app.db.database import ASYNCPG_DSN
+
+logger = logging.getLogger(__name__)
+
+PAINTING_SLUGS_CHANNEL = "painting_slugs"
+PAINTING_CONTENT_CHANNEL = "painting_content"
+
+NotificationHandler = Callable[[str | None], None]
+
+
+class NotificationListener:
+    """Keeps one LISTEN connection per worker and fans payloads out to handlers.
+
+    Handlers are also called with ``None`` whenever the connection is
+    (re)established or lost, because notifications sent in between are gone.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        reconnect_delay: float = 1.0,
+        keepalive_interval: float = 30.0,
+        keepalive_timeout: float = 10.0,
+    ):
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._keepalive_interval = keepalive_interval
+        self._keepalive_timeout = keepalive_timeout
+        self._handlers: dict[str, list[NotificationHandler]] = defaultdict(list)
+        self._task: asyncio.Task | None = None
+        self._connection: asyncpg.Connection | None = None
+        self.connected = False
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        self._handlers[channel].append(handler)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._connection is not None:
+            with suppress(Exception):
+                await self._connection.close()
+            self._connection = None
+        self.connected = False
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._dispatch)
+            except Exception as exc:
+                # Anything short of cancellation (timeouts, DNS, auth, protocol
+                # errors) must not end the task: caches would never be dropped again.
+                logger.warning("Notification listener cannot connect: %r", exc)
+                if connection is not None:
+                    with suppress(Exception):
+                        await connection.close()
+                await asyncio.sleep(self._reconnect_delay)
+                continue
+
+            self._connection = connection
+            self.connected = True
+            self._broadcast(None)
+            try:
+                await self._watch(connection)
+            finally:
+                self.connected = False
+                self._connection = None
+                self._broadcast(None)
+                with suppress(Exception):
+                    await connection.close()
+            await asyncio.sleep(self._reconnect_delay)
+
+    async def _watch(self, connection: asyncpg.Connection) -> None:
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _connection: lost.set())
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), timeout=self._keepalive_interval)
+            except asyncio.TimeoutError:
+                # A half-open TCP connection never answers; treat silence as a lost connection.
+                try:
+                    await connection.execute("SELECT 1", timeout=self._keepalive_timeout)
+                except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                    logger.warning("Notification listener lost its connection: %r", exc)
+                    return
+
+    def _dispatch(self, _connection, _pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, ()):
+            handler(payload)
+
+    def _broadcast(self, payload: str | None) -> None:
+        for handlers in self._handlers.values():
+            for handler in handlers:
+                handler(payload)
+
+
+notification_listener = NotificationListener(ASYNCPG_DSN)
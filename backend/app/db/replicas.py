@@ -0,0 +1,241 @@
+"""Read-replica routing for read-only endpoints.
+
+``get_read_session`` hands out sessions bound to a healthy replica (round robin)
+and falls back to the primary ``engine`` when no replica is usable. A background
+task polls every replica for reachability and replication lag; replicas that
+fail a check or a request are ejected for ``REPLICA_EJECT_SECONDS``.
+
+Read-your-writes: a request carrying ``X-Read-Your-Writes: primary`` is served by
+the primary; one carrying a WAL position (``X-Read-Your-Writes: 0/16B3748``, as
+returned by writes in ``X-Primary-LSN``) is served by a replica that has replayed
+at least that far, or by the primary.
+
+After a change notification the primary also serves all reads for a short fence,
+so caches are never refilled from a replica that has not replayed the change yet.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+
+import asyncpg
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.database import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    AsyncSessionLocal,
+    engine,
+)
+from app.metrics import TimedQueuePool
+
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "2"))
+REPLICA_CHECK_TIMEOUT = float(os.getenv("REPLICA_CHECK_TIMEOUT", "2"))
+REPLICA_EJECT_SECONDS = float(os.getenv("REPLICA_EJECT_SECONDS", "15"))
+
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+# A server that is not in recovery (a stand-in replica) is never behind. Otherwise the
+# replica is caught up if it replayed up to the primary's position, and is as far
+# behind as its last replayed transaction is old if not.
+REPLICA_STATE_SQL = text(
+    """
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        CASE WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn()::text ELSE NULL END AS replay_lsn,
+        CASE WHEN pg_is_in_recovery()
+             THEN extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+             ELSE 0 END AS replay_age
+    """
+)
+
+
+def parse_lsn(value: str) -> int:
+    high, _, low = value.partition("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            poolclass=TimedQueuePool,
+            connect_args={"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+        )
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False, class_=AsyncSession)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        # libpq-style DSN for the replica's asyncpg fast-path pool.
+        self.dsn = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self.healthy = False
+        self.lag = float("inf")
+        # None means "not a streaming replica": always as current as the primary.
+        self.replay_lsn: int | None = None
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    def usable(self, now: float) -> bool:
+        return self.healthy and now >= self.ejected_until and self.lag <= REPLICA_MAX_LAG_SECONDS
+
+    def has_replayed(self, lsn: int) -> bool:
+        return self.replay_lsn is None or self.replay_lsn >= lsn
+
+
+class ReplicaSet:
+    def __init__(self, urls: list[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._round_robin = itertools.count()
+        self._task: asyncio.Task | None = None
+        self.fenced_until = 0.0
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def choose(self, min_lsn: int | None = None) -> Replica | None:
+        now = time.monotonic()
+        if now < self.fenced_until:
+            return None
+        usable = [
+            replica
+            for replica in self.replicas
+            if replica.usable(now) and (min_lsn is None or replica.has_replayed(min_lsn))
+        ]
+        if not usable:
+            return None
+        return usable[next(self._round_robin) % len(usable)]
+
+    def eject(self, replica: Replica) -> None:
+        replica.ejected_until = time.monotonic() + REPLICA_EJECT_SECONDS
+        replica.ejections += 1
+        logger.warning("ejecting replica %s for %ss", replica.name, REPLICA_EJECT_SECONDS)
+
+    def fence(self, payload: str | None = None) -> None:
+        """Send reads to the primary until replicas have had time to replay a change."""
+        if self.replicas:
+            self.fenced_until = time.monotonic() + REPLICA_MAX_LAG_SECONDS + REPLICA_CHECK_INTERVAL
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(REPLICA_CHECK_INTERVAL)
+            try:
+                await self.check()
+            except Exception:  # noqa: BLE001 - the checker must outlive a primary outage
+                logger.exception("replica health check failed")
+
+    async def check(self) -> None:
+        async with engine.connect() as connection:
+            primary_lsn = parse_lsn(await connection.scalar(PRIMARY_LSN_SQL))
+        await asyncio.gather(*(self._check_replica(replica, primary_lsn) for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica, primary_lsn: int) -> None:
+        async def read_state():
+            async with replica.engine.connect() as connection:
+                return (await connection.execute(REPLICA_STATE_SQL)).one()
+
+        try:
+            state = await asyncio.wait_for(read_state(), REPLICA_CHECK_TIMEOUT)
+        except Exception as exc:  # noqa: BLE001 - any failure makes the replica unhealthy
+            if replica.healthy:
+                logger.warning("replica %s is unreachable: %s", replica.name, exc)
+            replica.healthy = False
+            return
+
+        replica.healthy = True
+        if not state.in_recovery:
+            replica.replay_lsn, replica.lag = None, 0.0
+            return
+        replica.replay_lsn = parse_lsn(state.replay_lsn) if state.replay_lsn else 0
+        caught_up = replica.replay_lsn >= primary_lsn
+        replica.lag = 0.0 if caught_up else float(state.replay_age or float("inf"))
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "fenced": now < self.fenced_until,
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "usable": replica.usable(now),
+                    "lag_seconds": replica.lag if replica.healthy else None,
+                    "ejections": replica.ejections,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+replica_set = ReplicaSet(DATABASE_REPLICA_URLS)
+
+
+def read_your_writes(request: Request) -> tuple[bool, int | None]:
+    """``(primary only, minimum LSN)`` asked for by ``X-Read-Your-Writes``; other values are ignored."""
+    value = (request.headers.get(READ_YOUR_WRITES_HEADER) or "").strip()
+    if value.lower() == "primary":
+        return True, None
+    try:
+        return False, parse_lsn(value)
+    except ValueError:
+        return False, None
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """Session for read-only endpoints: a replica when one is usable, else the primary."""
+    primary_only, min_lsn = read_your_writes(request)
+    replica = None if primary_only else replica_set.choose(min_lsn)
+    if replica is None:
+        replica_set.primary_reads += 1
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    replica_set.replica_reads += 1
+    async with replica.sessionmaker() as session:
+        # The fast path reads from the same server (see ``app.db.fastpath.fast_pool_for``).
+        session.info["replica"] = replica
+        try:
+            yield session
+        except (OperationalError, InterfaceError, asyncpg.PostgresConnectionError, OSError):
+            replica_set.eject(replica)
+            raise
+
+
+def read_engine() -> AsyncEngine:
+    """Engine for long read-only work outside a request session, such as exports."""
+    replica = replica_set.choose()
+    return engine if replica is None else replica.engine
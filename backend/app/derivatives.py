@@ -0,0 +1,138 @@
+"""Generate tile pyramids and thumbnails for paintings whose originals changed.
+
+``python -m app.ingest`` starts this in the background after an import; it can
+also be run by hand::
+
+    python -m app.derivatives [--all] [--workers 4] [--limit 100]
+
+Originals are fetched over HTTP(S) or read from ``IMAGE_SOURCE_DIR`` (``file://``
+URLs and plain paths), stored under their SHA-256 and handed to a process pool.
+A painting is updated only if its ``image_url`` did not change meanwhile; the
+update fires the ``painting_content`` notification, so API caches pick up the
+new tile manifest.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import asyncpg
+import httpx
+
+from app.db.database import ASYNCPG_DSN
+from app.services.images import IMAGE_CACHE_DIR, build_derivatives, original_path
+from app.services.summaries import refresh_summaries
+
+IMAGE_SOURCE_DIR = Path(os.getenv("IMAGE_SOURCE_DIR", "images"))
+IMAGE_FETCH_TIMEOUT = float(os.getenv("IMAGE_FETCH_TIMEOUT", "60"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(os.cpu_count() or 2)))
+
+PENDING_SQL = """
+    SELECT id, image_url
+    FROM paintings
+    WHERE $1 OR image_sha256 IS NULL OR image_source_url IS DISTINCT FROM image_url
+    ORDER BY id
+    LIMIT $2
+"""
+
+UPDATE_SQL = """
+    UPDATE paintings
+    SET image_sha256 = $2, image_width = $3, image_height = $4, image_source_url = $5, updated_at = now()
+    WHERE id = $1 AND image_url = $5
+"""
+
+
+async def fetch_original(client: httpx.AsyncClient, image_url: str) -> bytes:
+    parsed = urlparse(image_url)
+    if parsed.scheme in ("http", "https"):
+        response = await client.get(image_url)
+        response.raise_for_status()
+        return response.content
+
+    relative = parsed.path if parsed.scheme == "file" else image_url
+    root = IMAGE_SOURCE_DIR.resolve()
+    path = (root / relative.lstrip("/")).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"{image_url} is outside IMAGE_SOURCE_DIR")
+    return await asyncio.to_thread(path.read_bytes)
+
+
+def store_original(data: bytes) -> str:
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = original_path(sha256)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        scratch = path.with_suffix(f".{os.getpid()}")
+        scratch.write_bytes(data)
+        scratch.replace(path)
+    return sha256
+
+
+async def generate(rebuild_all: bool, limit: int | None, workers: int, concurrency: int) -> tuple[int, int]:
+    connection = await asyncpg.connect(ASYNCPG_DSN)
+    done = failed = 0
+    try:
+        pending = await connection.fetch(PENDING_SQL, rebuild_all, limit)
+        print(f"{len(pending)} paintings need derivatives", file=sys.stderr)
+        if not pending:
+            return done, failed
+
+        loop = asyncio.get_running_loop()
+        fetch_slots = asyncio.Semaphore(concurrency)
+        # Bounds the originals held in memory: fetches may run ahead of the
+        # process pool by ``concurrency`` paintings, not by the whole backlog.
+        pipeline_slots = asyncio.Semaphore(concurrency + workers)
+        # One asyncpg connection runs one statement at a time.
+        connection_lock = asyncio.Lock()
+        async with httpx.AsyncClient(timeout=IMAGE_FETCH_TIMEOUT, follow_redirects=True) as client:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+
+                async def process(painting_id, image_url: str) -> None:
+                    nonlocal done, failed
+                    try:
+                        async with pipeline_slots:
+                            async with fetch_slots:
+                                data = await fetch_original(client, image_url)
+                            sha256 = await asyncio.to_thread(store_original, data)
+                            # Workers read the stored original; the download is not needed any more.
+                            del data
+                            width, height = await loop.run_in_executor(pool, build_derivatives, sha256)
+                    except Exception as exc:  # noqa: BLE001 - one bad original must not stop the run
+                        failed += 1
+                        print(f"{painting_id}: {image_url}: {exc}", file=sys.stderr)
+                        return
+                    async with connection_lock:
+                        await connection.execute(UPDATE_SQL, painting_id, sha256, width, height, image_url)
+                    done += 1
+
+                await asyncio.gather(*(process(row["id"], row["image_url"]) for row in pending))
+        if done:
+            # Representative paintings on artist and genre pages carry tile manifests.
+            await refresh_summaries(connection)
+    finally:
+        await connection.close()
+    return done, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.derivatives", description="Build image derivatives.")
+    parser.add_argument("--all", action="store_true", help="rebuild every painting, not only changed ones")
+    parser.add_argument("--limit", type=int, help="process at most this many paintings")
+    parser.add_argument("--workers", type=int, default=IMAGE_WORKERS, help="image processing processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="originals fetched at once")
+    args = parser.parse_args()
+
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    done, failed = asyncio.run(generate(args.all, args.limit, args.workers, args.concurrency))
+    print(f"built={done} failed={failed} elapsed={time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
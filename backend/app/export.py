@@ -0,0 +1,50 @@
+"""Export the catalog, or what changed since a cursor, as NDJSON.
+
+    python -m app.export [--since CURSOR] [--output catalog.ndjson]
+
+Writes the same stream as ``GET /api/v1/export`` (see ``app.services.export``)
+and prints the cursor for the next incremental run.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app.services.export import export_lines, parse_since
+
+
+async def export(output, since: datetime | None) -> tuple[int, str]:
+    lines = 0
+    last = b""
+    async for chunk in export_lines(since):
+        output.write(chunk)
+        lines += chunk.count(b"\n")
+        last = chunk
+    return lines, json.loads(last)["cursor"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.export", description="Export the catalog as NDJSON.")
+    parser.add_argument("--since", help="cursor printed by the previous export; omit for a full export")
+    parser.add_argument("--output", type=Path, help="defaults to stdout")
+    args = parser.parse_args()
+    try:
+        since = parse_since(args.since) if args.since else None
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    started = time.perf_counter()
+    if args.output is None:
+        lines, cursor = asyncio.run(export(sys.stdout.buffer, since))
+    else:
+        with args.output.open("wb") as output:
+            lines, cursor = asyncio.run(export(output, since))
+    print(f"lines={lines} elapsed={time.perf_counter() - started:.1f}s next cursor: {cursor}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
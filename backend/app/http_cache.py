@@ -0,0 +1,112 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple
+
+from fastapi import Request, Response
+
+from app.services.paintings import PaintingVersion
+
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", "600"))
+CACHE_CONTROL = os.getenv(
+    "HTTP_CACHE_CONTROL",
+    f"public, max-age={HTTP_CACHE_MAX_AGE}, stale-while-revalidate={HTTP_CACHE_STALE_WHILE_REVALIDATE}",
+)
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: datetime
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": CACHE_CONTROL,
+        }
+
+    def encoded(self, coding: str) -> "Validators":
+        """The validators of this representation compressed with ``coding``.
+
+        A gzip or br body is a different representation and needs its own strong
+        ETag (RFC 9110 8.8.3.3), otherwise a cache could serve one for the other.
+        """
+        if coding == "identity":
+            return self
+        return self._replace(etag=f'{self.etag[:-1]}-{coding}"')
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_validators(representation: str, version: PaintingVersion) -> Validators:
+    # Each representation of the same painting (painting JSON, facts list, bundle,
+    # other encodings) needs its own strong ETag, hence the representation prefix.
+    digest = hashlib.sha1(
+        f"{representation}|{version.painting_id}|{version.updated_at.isoformat()}|{version.facts_digest}".encode()
+    ).hexdigest()
+    last_modified = _as_utc(version.updated_at)
+    if version.facts_updated_at is not None:
+        last_modified = max(last_modified, _as_utc(version.facts_updated_at))
+    return Validators(etag=f'"{digest}"', last_modified=last_modified.replace(microsecond=0))
+
+
+def parse_quality_list(header: str | None) -> dict[str, float]:
+    """Parse an Accept-style header into ``{value: q}``; malformed weights count as 0."""
+    weights: dict[str, float] = {}
+    if not header:
+        return weights
+    for part in header.split(","):
+        value, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, raw = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(raw)
+                except ValueError:
+                    weight = 0.0
+        weights[value.strip().lower()] = weight
+    return weights
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def none_match(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` tag list names ``etag``; the comparison is weak (RFC 9110 13.1.2)."""
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match overrides If-Modified-Since (RFC 9110 13.1.2).
+        return none_match(if_none_match, validators.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return validators.last_modified <= _as_utc(since)
+    return False
+
+
+def if_match_satisfied(if_match: str, validators: list[Validators]) -> bool:
+    # If-Match uses strong comparison, so weak tags never match (RFC 9110 13.1.1).
+    candidates = {tag.strip() for tag in if_match.split(",")}
+    return "*" in candidates or any(candidate.etag in candidates for candidate in validators)
+
+
+def not_modified_response(validators: Validators) -> Response:
+    return Response(status_code=304, headers=validators.headers)
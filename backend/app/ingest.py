@@ -0,0 +1,533 @@
+import argparse
+import asyncio
+import csv
+import json
+import subprocess
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import asyncpg
+
+from app.db.database import ASYNCPG_DSN
+from app.services.images import IMAGE_CACHE_DIR
+from app.services.markdown import render_description
+from app.services.summaries import refresh_summaries
+
+# Fact ids are derived from the painting slugs and a per-painting key, so
+# re-importing the same source updates rows in place instead of duplicating them.
+FACT_ID_NAMESPACE = uuid.UUID("6f1f8f7e-3c0b-4c8e-9a55-0d7b3f3f8a21")
+
+PAINTING_FIELDS = (
+    "name",
+    "artist_name",
+    "artist_slug",
+    "painting_slug",
+    "museum_name",
+    "genre_name",
+    "image_url",
+    "source_url",
+    "license_name",
+    "license_url",
+)
+FACT_FIELDS = (
+    "name",
+    "description_md",
+    "description_html",
+    "description_text",
+    "render_version",
+    "geometry_type",
+    "x",
+    "y",
+    "w",
+    "h",
+    "order_index",
+)
+
+STAGING_DDL = (
+    """
+    CREATE TEMP TABLE IF NOT EXISTS staging_paintings (
+        seq bigint NOT NULL,
+        name text NOT NULL,
+        artist_name text NOT NULL,
+        artist_slug varchar(200) NOT NULL,
+        painting_slug varchar(200) NOT NULL,
+        museum_name text,
+        genre_name text[],
+        image_url text NOT NULL,
+        source_url text NOT NULL,
+        license_name text,
+        license_url text
+    ) ON COMMIT DELETE ROWS
+    """,
+    """
+    CREATE TEMP TABLE IF NOT EXISTS staging_facts (
+        seq bigint NOT NULL,
+        id uuid NOT NULL,
+        artist_slug varchar(200) NOT NULL,
+        painting_slug varchar(200) NOT NULL,
+        name text NOT NULL,
+        description_md text NOT NULL,
+        description_html text NOT NULL,
+        description_text text NOT NULL,
+        render_version integer NOT NULL,
+        geometry_type text NOT NULL,
+        x double precision NOT NULL,
+        y double precision NOT NULL,
+        w double precision NOT NULL,
+        h double precision NOT NULL,
+        order_index integer NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """,
+    """
+    CREATE TEMP TABLE IF NOT EXISTS staging_aliases (
+        seq bigint NOT NULL,
+        target_artist_slug varchar(200) NOT NULL,
+        target_painting_slug varchar(200) NOT NULL,
+        artist_slug varchar(200),
+        painting_slug varchar(200),
+        combined_slug varchar(400)
+    ) ON COMMIT DELETE ROWS
+    """,
+)
+
+MERGE_PAINTINGS_SQL = """
+    INSERT INTO paintings (
+        id, name, artist_name, artist_slug, painting_slug, museum_name, genre_name,
+        image_url, source_url, license_name, license_url, created_at, updated_at
+    )
+    SELECT DISTINCT ON (artist_slug, painting_slug)
+        gen_random_uuid(), name, artist_name, artist_slug, painting_slug, museum_name, genre_name,
+        image_url, source_url, license_name, license_url, now(), now()
+    FROM staging_paintings
+    ORDER BY artist_slug, painting_slug, seq DESC
+    ON CONFLICT (artist_slug, painting_slug) DO UPDATE SET
+        name = EXCLUDED.name,
+        artist_name = EXCLUDED.artist_name,
+        museum_name = EXCLUDED.museum_name,
+        genre_name = EXCLUDED.genre_name,
+        image_url = EXCLUDED.image_url,
+        source_url = EXCLUDED.source_url,
+        license_name = EXCLUDED.license_name,
+        license_url = EXCLUDED.license_url,
+        updated_at = now()
+    WHERE (
+        paintings.name, paintings.artist_name, paintings.museum_name, paintings.genre_name,
+        paintings.image_url, paintings.source_url, paintings.license_name, paintings.license_url
+    ) IS DISTINCT FROM (
+        EXCLUDED.name, EXCLUDED.artist_name, EXCLUDED.museum_name, EXCLUDED.genre_name,
+        EXCLUDED.image_url, EXCLUDED.source_url, EXCLUDED.license_name, EXCLUDED.license_url
+    )
+"""
+
+MERGE_FACTS_SQL = """
+    INSERT INTO facts (
+        id, painting_id, name, description_md, description_html, description_text, render_version,
+        geometry_type, x, y, w, h, order_index, created_at, updated_at
+    )
+    SELECT DISTINCT ON (s.id)
+        s.id, p.id, s.name, s.description_md, s.description_html, s.description_text, s.render_version,
+        s.geometry_type, s.x, s.y, s.w, s.h, s.order_index, now(), now()
+    FROM staging_facts s
+    JOIN paintings p ON p.artist_slug = s.artist_slug AND p.painting_slug = s.painting_slug
+    ORDER BY s.id, s.seq DESC
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        description_md = EXCLUDED.description_md,
+        description_html = EXCLUDED.description_html,
+        description_text = EXCLUDED.description_text,
+        render_version = EXCLUDED.render_version,
+        geometry_type = EXCLUDED.geometry_type,
+        x = EXCLUDED.x,
+        y = EXCLUDED.y,
+        w = EXCLUDED.w,
+        h = EXCLUDED.h,
+        order_index = EXCLUDED.order_index,
+        updated_at = now()
+    WHERE (
+        facts.name, facts.description_md, facts.render_version,
+        facts.geometry_type, facts.x, facts.y, facts.w, facts.h, facts.order_index
+    ) IS DISTINCT FROM (
+        EXCLUDED.name, EXCLUDED.description_md, EXCLUDED.render_version,
+        EXCLUDED.geometry_type, EXCLUDED.x, EXCLUDED.y, EXCLUDED.w, EXCLUDED.h, EXCLUDED.order_index
+    )
+"""
+
+ORPHAN_FACTS_SQL = """
+    SELECT count(*)
+    FROM staging_facts s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM paintings p WHERE p.artist_slug = s.artist_slug AND p.painting_slug = s.painting_slug
+    )
+"""
+
+# Only used for documents that carry the painting's complete fact list.
+PRUNE_FACTS_SQL = """
+    DELETE FROM facts f
+    USING paintings p, staging_paintings sp
+    WHERE f.painting_id = p.id
+      AND p.artist_slug = sp.artist_slug
+      AND p.painting_slug = sp.painting_slug
+      AND NOT EXISTS (SELECT 1 FROM staging_facts s WHERE s.id = f.id)
+"""
+
+MERGE_ALIAS_PAIRS_SQL = """
+    INSERT INTO painting_aliases (id, painting_id, artist_slug, painting_slug)
+    SELECT DISTINCT ON (s.artist_slug, s.painting_slug) gen_random_uuid(), p.id, s.artist_slug, s.painting_slug
+    FROM staging_aliases s
+    JOIN paintings p ON p.artist_slug = s.target_artist_slug AND p.painting_slug = s.target_painting_slug
+    WHERE s.combined_slug IS NULL
+    ORDER BY s.artist_slug, s.painting_slug, s.seq DESC
+    ON CONFLICT ON CONSTRAINT uq_painting_alias_pair DO UPDATE SET painting_id = EXCLUDED.painting_id, updated_at = now()
+    WHERE painting_aliases.painting_id <> EXCLUDED.painting_id
+"""
+
+MERGE_ALIAS_COMBINED_SQL = """
+    INSERT INTO painting_aliases (id, painting_id, combined_slug)
+    SELECT DISTINCT ON (s.combined_slug) gen_random_uuid(), p.id, s.combined_slug
+    FROM staging_aliases s
+    JOIN paintings p ON p.artist_slug = s.target_artist_slug AND p.painting_slug = s.target_painting_slug
+    WHERE s.combined_slug IS NOT NULL
+    ORDER BY s.combined_slug, s.seq DESC
+    ON CONFLICT ON CONSTRAINT uq_painting_alias_combined DO UPDATE SET painting_id = EXCLUDED.painting_id, updated_at = now()
+    WHERE painting_aliases.painting_id <> EXCLUDED.painting_id
+"""
+
+
+class RecordError(ValueError):
+    pass
+
+
+@dataclass
+class Batch:
+    paintings: list[tuple] = field(default_factory=list)
+    facts: list[tuple] = field(default_factory=list)
+    aliases: list[tuple] = field(default_factory=list)
+    prune_facts: bool = False
+
+    def __len__(self) -> int:
+        return len(self.paintings) + len(self.facts) + len(self.aliases)
+
+
+@dataclass
+class Stats:
+    paintings: int = 0
+    facts: int = 0
+    aliases: int = 0
+    orphan_facts: int = 0
+    rejected: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def rows(self) -> int:
+        return self.paintings + self.facts + self.aliases
+
+    def rate(self) -> float:
+        return self.rows / max(time.perf_counter() - self.started_at, 1e-9)
+
+
+def fact_id(artist_slug: str, painting_slug: str, key) -> uuid.UUID:
+    return uuid.uuid5(FACT_ID_NAMESPACE, f"{artist_slug}/{painting_slug}#{key}")
+
+
+def _required(record: dict, name: str) -> str:
+    value = record.get(name)
+    if value is None or value == "":
+        raise RecordError(f"missing {name}")
+    return str(value)
+
+
+def _optional(record: dict, name: str) -> str | None:
+    value = record.get(name)
+    return None if value is None or value == "" else str(value)
+
+
+def _genres(value) -> list[str] | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = value.split("|")
+    if not isinstance(value, list) or not all(isinstance(genre, str) for genre in value):
+        raise RecordError("genre_name must be a list of strings or a |-separated string")
+    return [genre.strip() for genre in value if genre.strip()]
+
+
+def _list(record: dict, name: str) -> list:
+    value = record.get(name)
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise RecordError(f"{name} must be a list")
+    return value
+
+
+def painting_row(seq: int, record: dict) -> tuple:
+    return (
+        seq,
+        _required(record, "name"),
+        _required(record, "artist_name"),
+        _required(record, "artist_slug"),
+        _required(record, "painting_slug"),
+        _optional(record, "museum_name"),
+        _genres(record.get("genre_name")),
+        _required(record, "image_url"),
+        _required(record, "source_url"),
+        _optional(record, "license_name"),
+        _optional(record, "license_url"),
+    )
+
+
+def fact_row(seq: int, artist_slug: str, painting_slug: str, record: dict, position: int | None = None) -> tuple:
+    """A fact row; ``position`` is the fact's index in its document's list (``None`` for CSV rows).
+
+    The fact id is derived from ``key``, else ``order_index``, else ``position``.
+    """
+    if not isinstance(record, dict):
+        raise RecordError("fact is not a JSON object")
+    try:
+        x, y, w, h = (float(record[name]) for name in ("x", "y", "w", "h"))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise RecordError(f"bad fact geometry: {exc}") from exc
+    order_index = record.get("order_index")
+    if order_index in (None, ""):
+        order_index = position
+    else:
+        try:
+            order_index = int(order_index)
+        except (TypeError, ValueError) as exc:
+            raise RecordError(f"bad fact order_index: {exc}") from exc
+    key = record.get("key")
+    if key in (None, ""):
+        key = order_index
+    if key is None:
+        raise RecordError("fact needs a key or an order_index")
+    if order_index is None:
+        order_index = 0
+    # Same bounds as the ck_facts_* check constraints: one bad rectangle would
+    # otherwise abort the whole COPY batch inside Postgres.
+    if not (0 <= x <= 1 and 0 <= y <= 1 and 0 < w <= 1 and 0 < h <= 1):
+        raise RecordError(f"fact rectangle out of bounds: x={x} y={y} w={w} h={h}")
+    description_md = str(record.get("description_md") or "")
+    description = render_description(description_md)
+    return (
+        seq,
+        fact_id(artist_slug, painting_slug, key),
+        artist_slug,
+        painting_slug,
+        _required(record, "name"),
+        description_md,
+        description.html,
+        description.text,
+        description.version,
+        _required(record, "geometry_type"),
+        x,
+        y,
+        w,
+        h,
+        order_index,
+    )
+
+
+def alias_row(seq: int, artist_slug: str, painting_slug: str, record: dict) -> tuple:
+    if not isinstance(record, dict):
+        raise RecordError("alias is not a JSON object")
+    combined_slug = _optional(record, "combined_slug")
+    alias_artist_slug = _optional(record, "artist_slug")
+    alias_painting_slug = _optional(record, "painting_slug")
+    if combined_slug is not None and (alias_artist_slug or alias_painting_slug):
+        raise RecordError("alias must be either combined_slug or an artist_slug/painting_slug pair")
+    if combined_slug is None and not (alias_artist_slug and alias_painting_slug):
+        raise RecordError("alias must be either combined_slug or an artist_slug/painting_slug pair")
+    return (seq, artist_slug, painting_slug, alias_artist_slug, alias_painting_slug, combined_slug)
+
+
+def read_jsonl(path: Path) -> Iterator[tuple[int, dict]]:
+    with path.open(encoding="utf-8") as source:
+        for line_number, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+
+def read_csv(path: Path) -> Iterator[tuple[int, dict]]:
+    with path.open(encoding="utf-8", newline="") as source:
+        for line_number, record in enumerate(csv.DictReader(source), start=2):
+            yield line_number, record
+
+
+def add_document(batch: Batch, seq: int, record: dict) -> None:
+    """A JSONL document: one painting with optional nested facts and aliases."""
+    if not isinstance(record, dict):
+        raise RecordError("not a JSON object")
+    row = painting_row(seq, record)
+    artist_slug, painting_slug = row[3], row[4]
+    facts = [
+        fact_row(seq, artist_slug, painting_slug, fact, position)
+        for position, fact in enumerate(_list(record, "facts"))
+    ]
+    # Two facts with one key would get one id, and the merge would silently keep one of them.
+    ids = [fact[1] for fact in facts]
+    if len(set(ids)) != len(ids):
+        raise RecordError("facts of one painting must have distinct keys (or order_index values)")
+    aliases = [alias_row(seq, artist_slug, painting_slug, alias) for alias in _list(record, "aliases")]
+    batch.paintings.append(row)
+    batch.facts.extend(facts)
+    batch.aliases.extend(aliases)
+
+
+def add_csv_row(batch: Batch, kind: str, seq: int, record: dict) -> None:
+    if kind == "paintings":
+        batch.paintings.append(painting_row(seq, record))
+        return
+    if kind == "facts":
+        target = (_required(record, "artist_slug"), _required(record, "painting_slug"))
+        batch.facts.append(fact_row(seq, *target, record))
+    else:
+        target = (_required(record, "target_artist_slug"), _required(record, "target_painting_slug"))
+        batch.aliases.append(alias_row(seq, *target, record))
+
+
+async def load_batch(connection: asyncpg.Connection, batch: Batch, stats: Stats) -> None:
+    async with connection.transaction():
+        if batch.paintings:
+            await connection.copy_records_to_table(
+                "staging_paintings",
+                records=batch.paintings,
+                columns=["seq", *PAINTING_FIELDS],
+            )
+            await connection.execute(MERGE_PAINTINGS_SQL)
+        if batch.facts:
+            await connection.copy_records_to_table(
+                "staging_facts",
+                records=batch.facts,
+                columns=["seq", "id", "artist_slug", "painting_slug", *FACT_FIELDS],
+            )
+            stats.orphan_facts += await connection.fetchval(ORPHAN_FACTS_SQL)
+            await connection.execute(MERGE_FACTS_SQL)
+        if batch.prune_facts and batch.paintings:
+            await connection.execute(PRUNE_FACTS_SQL)
+        if batch.aliases:
+            await connection.copy_records_to_table(
+                "staging_aliases",
+                records=batch.aliases,
+                columns=[
+                    "seq",
+                    "target_artist_slug",
+                    "target_painting_slug",
+                    "artist_slug",
+                    "painting_slug",
+                    "combined_slug",
+                ],
+            )
+            await connection.execute(MERGE_ALIAS_PAIRS_SQL)
+            await connection.execute(MERGE_ALIAS_COMBINED_SQL)
+    stats.paintings += len(batch.paintings)
+    stats.facts += len(batch.facts)
+    stats.aliases += len(batch.aliases)
+
+
+async def ingest(
+    path: Path,
+    fmt: str,
+    kind: str,
+    batch_size: int,
+    strict: bool = False,
+    prune_facts: bool = False,
+    dsn: str = ASYNCPG_DSN,
+) -> Stats:
+    records = read_jsonl(path) if fmt == "jsonl" else read_csv(path)
+    stats = Stats()
+    connection = await asyncpg.connect(dsn)
+    try:
+        for ddl in STAGING_DDL:
+            await connection.execute(ddl)
+
+        batch = Batch(prune_facts=prune_facts)
+        for seq, (line_number, record) in enumerate(records):
+            try:
+                if fmt == "jsonl":
+                    add_document(batch, seq, record)
+                else:
+                    add_csv_row(batch, kind, seq, record)
+            except RecordError as exc:
+                if strict:
+                    raise SystemExit(f"{path}:{line_number}: {exc}") from exc
+                stats.rejected += 1
+                print(f"{path}:{line_number}: skipped: {exc}", file=sys.stderr)
+                continue
+
+            if len(batch) >= batch_size:
+                await load_batch(connection, batch, stats)
+                print(f"{stats.rows} rows loaded, {stats.rate():.0f} rows/s", file=sys.stderr)
+                batch = Batch(prune_facts=prune_facts)
+        if len(batch):
+            await load_batch(connection, batch, stats)
+        if stats.rows:
+            await refresh_summaries(connection)
+    finally:
+        await connection.close()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.ingest", description="Import a painting catalog.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="defaults to the file extension")
+    parser.add_argument(
+        "--kind",
+        choices=("paintings", "facts", "aliases"),
+        default="paintings",
+        help="what a CSV file contains; JSONL documents nest facts and aliases under their painting",
+    )
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per COPY/merge transaction")
+    parser.add_argument("--strict", action="store_true", help="abort on the first invalid record")
+    parser.add_argument(
+        "--no-derivatives",
+        action="store_true",
+        help="do not start image tile/thumbnail generation in the background afterwards",
+    )
+    parser.add_argument(
+        "--prune-facts",
+        action="store_true",
+        help="delete facts of imported paintings that are missing from their JSONL document",
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "jsonl")
+    if args.prune_facts and fmt != "jsonl":
+        parser.error("--prune-facts needs JSONL documents that carry complete fact lists")
+
+    stats = asyncio.run(ingest(args.path, fmt, args.kind, args.batch_size, args.strict, args.prune_facts))
+    print(
+        f"paintings={stats.paintings} facts={stats.facts} aliases={stats.aliases} "
+        f"rejected={stats.rejected} orphan_facts={stats.orphan_facts} "
+        f"elapsed={time.perf_counter() - stats.started_at:.1f}s rate={stats.rate():.0f} rows/s"
+    )
+    if stats.paintings and not args.no_derivatives:
+        start_derivatives()
+
+
+def start_derivatives() -> None:
+    # Tiles are built off the import and request paths; the detached process
+    # outlives this command and logs next to the cache it fills.
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    log_path = IMAGE_CACHE_DIR / "derivatives.log"
+    with log_path.open("ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "app.derivatives"],
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    print(f"building image derivatives in the background (pid {process.pid}, log {log_path})")
+
+
+if __name__ == "__main__":
+    main()
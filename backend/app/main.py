@@ -1,9 +1,46 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app import metrics
+from app.db.database import DB_MAX_OVERFLOW, DB_POOL_SIZE, engine
+from app.db.fastpath import FAST_READ_PATH, close_fast_pool, get_fast_pool, open_fast_pool
+from app.db.notifications import PAINTING_CONTENT_CHANNEL, PAINTING_SLUGS_CHANNEL, notification_listener
+from app.db.replicas import replica_set
+from app.routers.artists import router as artists_router
+from app.routers.export import router as export_router
+from app.routers.genres import router as genres_router
 from app.routers.paintings import router as paintings_router
+from app.routers.search import router as search_router
+from app.routers.tiles import router as tiles_router
+from app.services.response_cache import response_cache
+from app.services.singleflight import SingleFlightTimeout, flights
+from app.services.slug_cache import slug_cache
+from app.services.snapshot import snapshot_store
+from app.services.spatial import spatial_cache
+
+notification_listener.subscribe(PAINTING_SLUGS_CHANNEL, slug_cache.invalidate)
+notification_listener.subscribe(PAINTING_CONTENT_CHANNEL, spatial_cache.invalidate)
+notification_listener.subscribe(PAINTING_CONTENT_CHANNEL, response_cache.invalidate)
+notification_listener.subscribe(PAINTING_SLUGS_CHANNEL, replica_set.fence)
+notification_listener.subscribe(PAINTING_CONTENT_CHANNEL, replica_set.fence)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await notification_listener.start()
+    if FAST_READ_PATH:
+        await open_fast_pool(init=metrics.instrument_asyncpg if metrics.METRICS_ENABLED else None)
+    await replica_set.start()
+    yield
+    await replica_set.stop()
+    await close_fast_pool()
+    await notification_listener.stop()
+
 
-app = FastAPI(title="Art Explorer API")
+app = FastAPI(title="Art Explorer API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,9 +50,133 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if metrics.METRICS_ENABLED:
+    metrics.instrument_engine(engine.sync_engine)
+    for replica in replica_set.replicas:
+        metrics.instrument_engine(replica.engine.sync_engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(paintings_router)
+app.include_router(artists_router)
+app.include_router(genres_router)
+app.include_router(export_router)
+app.include_router(search_router)
+app.include_router(tiles_router)
+
+
+@app.exception_handler(SingleFlightTimeout)
+async def single_flight_timeout(request: Request, exc: SingleFlightTimeout):
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/cache")
+async def cache_stats():
+    return {
+        "slug_cache": slug_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "snapshot": snapshot_store.stats(),
+        "single_flight": {flight.name: flight.stats() for flight in flights},
+    }
+
+
+@app.get("/health/db")
+async def database_stats():
+    return {"replicas": replica_set.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def _pool_connections() -> dict:
+    pool = engine.pool
+    samples = {("orm", "checked_out"): pool.checkedout(), ("orm", "idle"): pool.checkedin()}
+    for i, replica in enumerate(replica_set.replicas):
+        samples[(f"replica{i}", "checked_out")] = replica.engine.pool.checkedout()
+        samples[(f"replica{i}", "idle")] = replica.engine.pool.checkedin()
+    fast_pools = [("fast", get_fast_pool())] + [
+        (f"fast_replica{i}", get_fast_pool(replica)) for i, replica in enumerate(replica_set.replicas)
+    ]
+    for name, fast_pool in fast_pools:
+        if fast_pool is not None:
+            samples[(name, "checked_out")] = fast_pool.get_size() - fast_pool.get_idle_size()
+            samples[(name, "idle")] = fast_pool.get_idle_size()
+    return samples
+
+
+def _pool_saturation() -> dict:
+    samples = {("orm",): engine.pool.checkedout() / (DB_POOL_SIZE + DB_MAX_OVERFLOW)}
+    fast_pool = get_fast_pool()
+    if fast_pool is not None:
+        samples[("fast",)] = (fast_pool.get_size() - fast_pool.get_idle_size()) / fast_pool.get_max_size()
+    return samples
+
+
+def _replica_lag() -> dict:
+    return {(f"replica{i}",): replica.lag for i, replica in enumerate(replica_set.replicas)}
+
+
+def _read_routing() -> dict:
+    return {("primary",): replica_set.primary_reads, ("replica",): replica_set.replica_reads}
+
+
+def _single_flight_calls() -> dict:
+    return {
+        (flight.name, outcome): flight.stats()[outcome]
+        for flight in flights
+        for outcome in ("leaders", "coalesced", "timeouts", "errors")
+    }
+
+
+def _single_flight_waiting() -> dict:
+    return {(flight.name,): flight.waiting for flight in flights}
+
+
+def _cache_stats() -> dict[str, dict]:
+    return {"slug": slug_cache.stats(), "response": response_cache.stats()}
+
+
+def _cache_events() -> dict:
+    return {
+        (cache, name): value
+        for cache, stats in _cache_stats().items()
+        for name, value in stats.items()
+        if name in ("hits", "negative_hits", "misses", "evictions", "invalidations")
+    }
+
+
+def _cache_sizes() -> dict:
+    samples = {}
+    for cache, stats in _cache_stats().items():
+        if "size" in stats:
+            samples[(cache, "entries")] = stats["size"]
+        if "entries" in stats:
+            samples[(cache, "entries")] = stats["entries"]
+        if "bytes" in stats:
+            samples[(cache, "bytes")] = stats["bytes"]
+    return samples
+
+
+metrics.register_gauge("db_pool_connections", "Pooled connections by state.", ("pool", "state"), _pool_connections)
+metrics.register_gauge(
+    "db_pool_saturation", "Checked-out connections as a share of the pool's capacity.", ("pool",), _pool_saturation
+)
+metrics.register_gauge("db_replica_lag_seconds", "Replication lag seen by the last health check.", ("pool",), _replica_lag)
+metrics.register_counter("db_reads_total", "Read-only sessions by the server they went to.", ("target",), _read_routing)
+metrics.register_counter(
+    "singleflight_calls_total",
+    "Cache-miss loads by outcome: run (leaders), joined (coalesced), timed out or failed.",
+    ("flight", "outcome"),
+    _single_flight_calls,
+)
+metrics.register_gauge(
+    "singleflight_waiting", "Requests currently waiting on another request's load.", ("flight",), _single_flight_waiting
+)
+metrics.register_counter("cache_events_total", "Cache hits, misses and evictions.", ("cache", "event"), _cache_events)
+metrics.register_gauge("cache_size", "Current cache size.", ("cache", "unit"), _cache_sizes)
@@ -0,0 +1,246 @@
+"""Request and SQL instrumentation exposed in Prometheus text format at ``/metrics``.
+
+``MetricsMiddleware`` opens a per-request ``RequestStats`` in a context variable;
+SQLAlchemy cursor events, the timed connection pool and the asyncpg query logger
+of the fast pool add to it from wherever the request's statements run. When the
+response is sent, everything is recorded under the matched route template.
+"""
+
+import logging
+import os
+import random
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Requests slower than this are logged with their SQL; 0 disables the log.
+METRICS_SLOW_REQUEST_MS = float(os.getenv("METRICS_SLOW_REQUEST_MS", "0"))
+# Share of requests that keep statement text and timings for the slow log.
+METRICS_SLOW_REQUEST_SAMPLE_RATE = float(os.getenv("METRICS_SLOW_REQUEST_SAMPLE_RATE", "0.1"))
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+logger = logging.getLogger("app.slow_requests")
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in self._series.items():
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{_braces(labels)} {series[-1]}")
+            lines.append(f"{self.name}_count{_braces(labels)} {cumulative}")
+        return lines
+
+
+class Collected:
+    """A gauge or counter whose samples are read from ``collect`` at scrape time.
+
+    ``collect`` returns ``{label values: value}``, so state that already lives
+    elsewhere (pool sizes, cache stats) is not duplicated.
+    """
+
+    def __init__(
+        self, name: str, help_text: str, metric_type: str, labels: tuple[str, ...], collect: Callable[[], dict]
+    ):
+        self.name = name
+        self.help = help_text
+        self.type = metric_type
+        self.labels = labels
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for label_values, value in self.collect().items():
+            lines.append(f"{self.name}{_braces(_labels(self.labels, label_values))} {value}")
+        return lines
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "checkout_seconds", "log")
+
+    def __init__(self, sampled: bool):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.checkout_seconds = 0.0
+        self.log: list[tuple[float, str]] | None = [] if sampled else None
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+        if self.log is not None:
+            self.log.append((seconds, statement))
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+ROUTE_LABELS = ("method", "route")
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.", ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+request_statements = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request.", ROUTE_LABELS, STATEMENT_BUCKETS
+)
+request_db_time = Histogram(
+    "http_request_db_seconds", "Time per request spent waiting on SQL statements.", ROUTE_LABELS, DURATION_BUCKETS
+)
+request_checkout_wait = Histogram(
+    "http_request_pool_checkout_seconds", "Time per request spent waiting for a pooled connection.", ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+pool_checkout_wait = Histogram(
+    "db_pool_checkout_seconds", "Wait for a SQLAlchemy pool checkout.", (), DURATION_BUCKETS
+)
+
+_registry: list[Histogram | Collected] = [
+    request_duration, request_statements, request_db_time, request_checkout_wait, pool_checkout_wait
+]
+
+
+def register_gauge(name: str, help_text: str, labels: tuple[str, ...], collect: Callable[[], dict]) -> None:
+    _registry.append(Collected(name, help_text, "gauge", labels, collect))
+
+
+def register_counter(name: str, help_text: str, labels: tuple[str, ...], collect: Callable[[], dict]) -> None:
+    _registry.append(Collected(name, help_text, "counter", labels, collect))
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            pool_checkout_wait.observe(elapsed)
+            stats = _current.get()
+            if stats is not None:
+                stats.checkout_seconds += elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_started")
+    stats = _current.get()
+    if stats is not None:
+        stats.add_statement(statement, elapsed)
+
+
+def instrument_engine(sync_engine) -> None:
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _log_asyncpg_query(record) -> None:
+    # asyncpg calls loggers through loop.call_soon, which runs in a copy of the
+    # request's context, so the RequestStats object is still reachable.
+    stats = _current.get()
+    if stats is not None:
+        stats.add_statement(record.query, record.elapsed)
+
+
+async def instrument_asyncpg(connection) -> None:
+    """``init`` hook for asyncpg pools whose queries should count towards request stats."""
+    connection.add_query_logger(_log_asyncpg_query)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; unlike ``BaseHTTPMiddleware`` it does not wrap the response stream."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = METRICS_SLOW_REQUEST_MS > 0 and random.random() < METRICS_SLOW_REQUEST_SAMPLE_RATE
+        stats = RequestStats(sampled)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            # FastAPI stores the matched APIRoute in the scope; its path is the template.
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            request_duration.observe(elapsed, *labels)
+            request_statements.observe(stats.statements, *labels)
+            request_db_time.observe(stats.db_seconds, *labels)
+            request_checkout_wait.observe(stats.checkout_seconds, *labels)
+            if stats.log is not None and elapsed * 1000 >= METRICS_SLOW_REQUEST_MS:
+                _log_slow_request(scope, labels, status, elapsed, stats)
+
+
+def _log_slow_request(scope, labels: tuple[str, str], status: int, elapsed: float, stats: RequestStats) -> None:
+    statements = "\n".join(f"  {seconds * 1000:8.2f} ms  {' '.join(sql.split())}" for seconds, sql in stats.log)
+    logger.warning(
+        "slow request %s %s (%s) status=%s total=%.1fms db=%.1fms checkout=%.1fms statements=%d\n%s",
+        scope["method"],
+        scope["path"],
+        labels[1],
+        status,
+        elapsed * 1000,
+        stats.db_seconds * 1000,
+        stats.checkout_seconds * 1000,
+        stats.statements,
+        statements,
+    )
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Integer, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import CheckConstraint, DateTime, FetchedValue, Float, ForeignKey, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -15,12 +15,25 @@ class Fact(Base):
         CheckConstraint("y >= 0 AND y <= 1", name="ck_facts_y"),
         CheckConstraint("w > 0 AND w <= 1", name="ck_facts_w"),
         CheckConstraint("h > 0 AND h <= 1", name="ck_facts_h"),
+        Index("ix_facts_painting_order", "painting_id", "order_index", postgresql_include=["id", "updated_at"]),
+        Index("ix_facts_updated_at", "updated_at", "id"),
+        Index("ix_facts_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_facts_painting_box",
+            "painting_id",
+            text("box(point(x, y), point(x + w, y + h))"),
+            postgresql_using="gist",
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    painting_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("paintings.id"), index=True)
+    painting_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("paintings.id"))
     name: Mapped[str] = mapped_column(Text, nullable=False)
     description_md: Mapped[str] = mapped_column(Text, nullable=False)
+    # Rendered from description_md by app.services.markdown; NULL until rendered.
+    description_html: Mapped[str | None] = mapped_column(Text, nullable=True)
+    description_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    render_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     geometry_type: Mapped[str] = mapped_column(Text, nullable=False)
     x: Mapped[float] = mapped_column(Float, nullable=False)
     y: Mapped[float] = mapped_column(Float, nullable=False)
@@ -29,5 +42,9 @@ class Fact(Base):
     order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Filled by the trg_facts_search_vector trigger from name and description_md.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue(), deferred=True
+    )
 
     painting = relationship("Painting", back_populates="facts")
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import DateTime, FetchedValue, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -10,7 +10,20 @@ from app.models.base import Base
 
 class Painting(Base):
     __tablename__ = "paintings"
-    __table_args__ = (UniqueConstraint("artist_slug", "painting_slug", name="uq_artist_painting_slug"),)
+    __table_args__ = (
+        UniqueConstraint("artist_slug", "painting_slug", name="uq_artist_painting_slug"),
+        Index("ix_paintings_museum_order", "museum_name", "artist_slug", "painting_slug"),
+        Index("ix_paintings_updated_at", "updated_at", "id"),
+        Index("ix_paintings_genre_name", "genre_name", postgresql_using="gin"),
+        Index("ix_paintings_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_paintings_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_paintings_artist_name_trgm",
+            "artist_name",
+            postgresql_using="gin",
+            postgresql_ops={"artist_name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(Text, nullable=False)
@@ -23,8 +36,17 @@ class Painting(Base):
     source_url: Mapped[str] = mapped_column(Text, nullable=False)
     license_name: Mapped[str | None] = mapped_column(Text, nullable=True)
     license_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    facts_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    image_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    image_width: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    image_height: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    image_source_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Filled by the trg_paintings_search_vector trigger from name, artist_name and museum_name.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue(), deferred=True
+    )
 
     aliases = relationship("PaintingAlias", back_populates="painting", cascade="all, delete-orphan")
     facts = relationship("Fact", back_populates="painting", cascade="all, delete-orphan")
@@ -1,6 +1,7 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey, String, UniqueConstraint
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +18,7 @@ class PaintingAlias(Base):
             "(combined_slug IS NULL AND artist_slug IS NOT NULL AND painting_slug IS NOT NULL)",
             name="ck_painting_alias_one_shape",
         ),
+        Index("ix_painting_aliases_updated_at", "updated_at", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -24,5 +26,8 @@ class PaintingAlias(Base):
     artist_slug: Mapped[str | None] = mapped_column(String(200), nullable=True)
     painting_slug: Mapped[str | None] = mapped_column(String(200), nullable=True)
     combined_slug: Mapped[str | None] = mapped_column(String(400), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=datetime.utcnow
+    )
 
     painting = relationship("Painting", back_populates="aliases")
@@ -0,0 +1,20 @@
+import uuid
+
+from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class PaintingGenre(Base):
+    """One (genre, painting) pair in browse order; kept in sync with ``paintings.genre_name`` by triggers."""
+
+    __tablename__ = "painting_genres"
+
+    genre: Mapped[str] = mapped_column(Text, primary_key=True)
+    artist_slug: Mapped[str] = mapped_column(String(200), primary_key=True)
+    painting_slug: Mapped[str] = mapped_column(String(200), primary_key=True)
+    painting_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("paintings.id", ondelete="CASCADE"), nullable=False, index=True
+    )
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, SmallInteger, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class PaintingRelated(Base):
+    """A precomputed neighbour of a painting; written by ``python -m app.related``."""
+
+    __tablename__ = "painting_related"
+    __table_args__ = (Index("ix_painting_related_related_id", "related_id"),)
+
+    painting_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("paintings.id", ondelete="CASCADE"), primary_key=True
+    )
+    position: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    related_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("paintings.id", ondelete="CASCADE"), nullable=False
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class PaintingRelatedState(Base):
+    """The features a painting's related list was last built from."""
+
+    __tablename__ = "painting_related_state"
+
+    painting_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("paintings.id", ondelete="CASCADE"), primary_key=True
+    )
+    features_digest: Mapped[str] = mapped_column(Text, nullable=False)
+    related_count: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    built_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
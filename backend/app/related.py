@@ -0,0 +1,42 @@
+"""Build the related-paintings index.
+
+    python -m app.related [--full] [--top-k 12]
+
+Without ``--full`` only the lists affected by paintings that changed since the
+last build are redone; see ``app.services.related``.
+"""
+
+import argparse
+import asyncio
+import time
+
+import asyncpg
+
+from app.db.database import ASYNCPG_DSN
+from app.services.related import RELATED_TOP_K, RelatedBuildStats, build_related
+
+
+async def build(full: bool, k: int, dsn: str = ASYNCPG_DSN) -> RelatedBuildStats:
+    connection = await asyncpg.connect(dsn)
+    try:
+        return await build_related(connection, full, k)
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.related", description="Build the related-paintings index.")
+    parser.add_argument("--full", action="store_true", help="rebuild every painting's list, not only changed ones")
+    parser.add_argument("--top-k", type=int, default=RELATED_TOP_K, help="neighbours stored per painting")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stats = asyncio.run(build(args.full, args.top_k))
+    print(
+        f"paintings={stats.paintings} rebuilt={stats.rebuilt} rows={stats.rows} "
+        f"elapsed={time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Re-render stored fact descriptions after the Markdown renderer changed.
+
+    python -m app.render_facts [--all] [--batch-size 500] [--workers 4]
+
+Walks ``facts`` in id order and renders every row whose ``render_version`` is not
+the current ``RENDER_VERSION`` (``--all``: every row). Each batch is one UPDATE
+that also bumps ``updated_at``, so ETags change and the ``painting_content``
+notification refreshes API caches. A row is only written if its
+``description_md`` did not change while the batch was being rendered; the
+writer that changed it rendered it already.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import asyncpg
+
+from app.db.database import ASYNCPG_DSN
+from app.services.markdown import RENDER_VERSION, render_description
+
+PENDING_SQL = """
+    SELECT id, description_md, md5(description_md) AS source_digest
+    FROM facts
+    WHERE id > $1 AND ($2 OR render_version IS DISTINCT FROM $3)
+    ORDER BY id
+    LIMIT $4
+"""
+
+UPDATE_SQL = """
+    UPDATE facts f
+    SET description_html = r.html, description_text = r.text, render_version = $5, updated_at = now()
+    FROM unnest($1::uuid[], $2::text[], $3::text[], $4::text[]) AS r(id, source_digest, html, text)
+    WHERE f.id = r.id AND md5(f.description_md) = r.source_digest
+"""
+
+
+def render_batch(descriptions: list[str]) -> list[tuple[str, str]]:
+    return [render_description(description)[:2] for description in descriptions]
+
+
+async def render_all(rerender_all: bool, batch_size: int, workers: int) -> tuple[int, int]:
+    connection = await asyncpg.connect(ASYNCPG_DSN)
+    loop = asyncio.get_running_loop()
+    rendered = skipped = 0
+    last_id = uuid.UUID(int=0)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while rows := await connection.fetch(PENDING_SQL, last_id, rerender_all, RENDER_VERSION, batch_size):
+                last_id = rows[-1]["id"]
+                chunk = -(-len(rows) // workers)
+                chunks = [rows[i : i + chunk] for i in range(0, len(rows), chunk)]
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, render_batch, [row["description_md"] for row in part])
+                    for part in chunks
+                ))
+                outputs = [output for result in results for output in result]
+                status = await connection.execute(
+                    UPDATE_SQL,
+                    [row["id"] for row in rows],
+                    [row["source_digest"] for row in rows],
+                    [html for html, _ in outputs],
+                    [text for _, text in outputs],
+                    RENDER_VERSION,
+                )
+                updated = int(status.split()[-1])
+                rendered += updated
+                skipped += len(rows) - updated
+    finally:
+        await connection.close()
+    return rendered, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.render_facts", description="Re-render fact descriptions.")
+    parser.add_argument("--all", action="store_true", help="re-render every fact, not only outdated ones")
+    parser.add_argument("--batch-size", type=int, default=500, help="facts per UPDATE")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="rendering processes")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rendered, skipped = asyncio.run(render_all(args.all, args.batch_size, args.workers))
+    print(
+        f"rendered={rendered} skipped={skipped} version={RENDER_VERSION} "
+        f"elapsed={time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.replicas import get_read_session
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas.summary import ArtistPage, ArtistSummary
+from app.services.summaries import get_artist_summary, list_artist_summaries, representative
+
+router = APIRouter(prefix="/api/v1/artists", tags=["artists"])
+
+
+def _artist(row) -> ArtistSummary:
+    return ArtistSummary(
+        artist_slug=row.artist_slug,
+        artist_name=row.artist_name,
+        paintings_count=row.paintings_count,
+        facts_count=row.facts_count,
+        representative=representative(row),
+    )
+
+
+@router.get("", response_model=ArtistPage)
+async def list_artists(
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_read_session),
+):
+    after = ""
+    if cursor is not None:
+        try:
+            (after,) = decode_cursor(cursor, 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    rows = await list_artist_summaries(session, limit + 1, after)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].artist_slug])
+    return ArtistPage(items=[_artist(row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/{artist_slug}", response_model=ArtistSummary)
+async def read_artist(artist_slug: str, session: AsyncSession = Depends(get_read_session)):
+    row = await get_artist_summary(session, artist_slug)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Artist not found")
+    return _artist(row)
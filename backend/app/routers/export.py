@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.services.export import export_lines, export_slots, parse_since
+
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+NDJSON = "application/x-ndjson"
+
+
+@router.get("", response_class=StreamingResponse)
+async def export_catalog(since: str | None = None):
+    """Stream the catalog, or the changes since an earlier export's cursor, as NDJSON."""
+    # The slot itself is taken by the stream; this only turns clients away early.
+    if export_slots.locked():
+        raise HTTPException(status_code=503, detail="Too many exports running", headers={"Retry-After": "30"})
+    since_at = None
+    if since is not None:
+        try:
+            since_at = parse_since(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    return StreamingResponse(export_lines(since_at), media_type=NDJSON, headers={"Cache-Control": "no-store"})
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.replicas import get_read_session
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas.summary import GenrePage, GenreSummary
+from app.services.summaries import get_genre_summary, list_genre_summaries, representative
+
+router = APIRouter(prefix="/api/v1/genres", tags=["genres"])
+
+
+def _genre(row) -> GenreSummary:
+    return GenreSummary(
+        genre_name=row.genre_name,
+        paintings_count=row.paintings_count,
+        artists_count=row.artists_count,
+        facts_count=row.facts_count,
+        representative=representative(row),
+    )
+
+
+@router.get("", response_model=GenrePage)
+async def list_genres(
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_read_session),
+):
+    after = ""
+    if cursor is not None:
+        try:
+            (after,) = decode_cursor(cursor, 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    rows = await list_genre_summaries(session, limit + 1, after)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].genre_name])
+    return GenrePage(items=[_genre(row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/{genre_name}", response_model=GenreSummary)
+async def read_genre(genre_name: str, session: AsyncSession = Depends(get_read_session)):
+    row = await get_genre_summary(session, genre_name)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Genre not found")
+    return _genre(row)
@@ -1,59 +1,490 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import RedirectResponse
+import hmac
+import os
+from functools import partial
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_session
-from app.schemas.fact import FactResponse
-from app.schemas.painting import PaintingResponse
-from app.services.facts import get_facts_for_painting
+from app.db.fastpath import fast_pool_for
+from app.db.replicas import PRIMARY_LSN_SQL, get_read_session, read_your_writes
+from app.http_cache import Validators, is_conditional, is_not_modified, make_validators, not_modified_response
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas.batch import PaintingBatchItem, PaintingBatchRequest, PaintingBatchResponse
+from app.schemas.fact import FactEditRequest, FactResponse
+from app.schemas.painting import (
+    PaintingBundleResponse,
+    PaintingPage,
+    PaintingResponse,
+    RelatedPaintingResponse,
+)
+from app.services.fact_edits import FactEditError, FactVersionMismatch, edit_facts
+from app.services.fastpath import facts_adapter, fetch_facts, fetch_painting, fetch_painting_version
+from app.services.facts import get_facts_for_painting, get_facts_for_paintings
 from app.services.paintings import (
-    get_painting_by_alias_pair,
-    get_painting_by_combined_alias,
-    get_painting_by_slugs,
+    PaintingVersion,
+    browse_paintings,
+    get_painting_bundle,
+    get_painting_by_id,
+    get_painting_version,
+    get_paintings_by_alias_pairs,
+    get_paintings_by_ids,
+    get_paintings_by_slug_pairs,
 )
+from app.services.related import RELATED_TOP_K, get_related_paintings
+from app.services.response_cache import CachedResponse, negotiate_encoding, response_cache
+from app.services.singleflight import response_flight
+from app.services.slug_cache import resolve_combined_slug, resolve_painting_pair
+from app.services.snapshot import SnapshotEntry, SnapshotResponse, snapshot_store
+from app.services.spatial import get_facts_at_point, get_facts_in_viewport
+from app.wire import JSON, encode_facts, negotiate_format
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_MAX_FACTS = int(os.getenv("BATCH_MAX_FACTS", "20000"))
+# Bearer token for fact editing; editing is disabled while it is empty.
+FACTS_EDIT_TOKEN = os.getenv("FACTS_EDIT_TOKEN", "")
 
 router = APIRouter(prefix="/api/v1/paintings", tags=["paintings"])
 
 
+@router.get("", response_model=PaintingPage)
+async def list_paintings(
+    artist_slug: str | None = None,
+    museum_name: str | None = None,
+    genre: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_read_session),
+):
+    after = None
+    if cursor is not None:
+        try:
+            after = tuple(decode_cursor(cursor, 2))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    paintings = await browse_paintings(
+        session,
+        limit + 1,
+        artist_slug=artist_slug,
+        museum_name=museum_name,
+        genre=genre,
+        after=after,
+    )
+    next_cursor = None
+    if len(paintings) > limit:
+        paintings = paintings[:limit]
+        next_cursor = encode_cursor([paintings[-1].artist_slug, paintings[-1].painting_slug])
+    return PaintingPage(
+        items=[PaintingResponse.model_validate(painting) for painting in paintings],
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/batch", response_model=PaintingBatchResponse)
+async def read_paintings_batch(payload: PaintingBatchRequest, session: AsyncSession = Depends(get_read_session)):
+    if len(payload.pairs) + len(payload.ids) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=422, detail=f"At most {BATCH_MAX_ITEMS} items per batch")
+
+    pairs = list(dict.fromkeys((pair.artist_slug, pair.painting_slug) for pair in payload.pairs))
+    ids = list(dict.fromkeys(payload.ids))
+    canonical = await get_paintings_by_slug_pairs(session, pairs)
+    aliased = await get_paintings_by_alias_pairs(session, [pair for pair in pairs if pair not in canonical])
+    by_id = {painting.id: painting for painting in await get_paintings_by_ids(session, ids)}
+
+    matched = {painting.id: painting for painting in [*canonical.values(), *aliased.values(), *by_id.values()]}
+    if payload.include_facts and sum(painting.facts_count for painting in matched.values()) > BATCH_MAX_FACTS:
+        raise HTTPException(
+            status_code=422, detail=f"At most {BATCH_MAX_FACTS} facts per batch; request fewer paintings"
+        )
+    facts = await get_facts_for_paintings(session, list(matched)) if payload.include_facts else {}
+
+    def found(painting, status: str) -> PaintingBatchItem:
+        item = PaintingBatchItem(status=status, painting=PaintingResponse.model_validate(painting))
+        if status == "redirect":
+            item.location = f"/api/v1/paintings/{painting.artist_slug}/{painting.painting_slug}"
+        if payload.include_facts:
+            item.facts = [FactResponse.model_validate(fact) for fact in facts.get(painting.id, [])]
+        return item
+
+    items = {}
+    for artist_slug, painting_slug in pairs:
+        key = f"{artist_slug}/{painting_slug}"
+        if (artist_slug, painting_slug) in canonical:
+            items[key] = found(canonical[(artist_slug, painting_slug)], "ok")
+        elif (artist_slug, painting_slug) in aliased:
+            items[key] = found(aliased[(artist_slug, painting_slug)], "redirect")
+        else:
+            items[key] = PaintingBatchItem(status="not_found")
+    for painting_id in ids:
+        if painting_id in by_id:
+            items[str(painting_id)] = found(by_id[painting_id], "ok")
+        else:
+            items[str(painting_id)] = PaintingBatchItem(status="not_found")
+    return PaintingBatchResponse(items=items)
+
+
 @router.get("/{artist_slug}/{painting_slug}", response_model=PaintingResponse)
-async def read_painting(artist_slug: str, painting_slug: str, session: AsyncSession = Depends(get_session)):
-    painting = await get_painting_by_slugs(session, artist_slug, painting_slug)
-    if not painting:
-        alias_painting = await get_painting_by_alias_pair(session, artist_slug, painting_slug)
-        if alias_painting:
-            return RedirectResponse(
-                url=f"/api/v1/paintings/{alias_painting.artist_slug}/{alias_painting.painting_slug}",
-                status_code=301,
-            )
-        raise HTTPException(status_code=404, detail="Painting not found")
-    return PaintingResponse(
-        id=painting.id,
-        name=painting.name,
-        artist_name=painting.artist_name,
-        artist_slug=painting.artist_slug,
-        painting_slug=painting.painting_slug,
-        museum_name=painting.museum_name,
-        genre_name=painting.genre_name,
-        image_url=painting.image_url,
-        source_url=painting.source_url,
-        license_name=painting.license_name,
-        license_url=painting.license_url,
-        facts_count=len(painting.facts),
+async def read_painting(
+    artist_slug: str,
+    painting_slug: str,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+):
+    snapshot = _snapshot_for(request)
+    if snapshot is not None:
+        entry = snapshot.painting(artist_slug, painting_slug)
+        if entry is not None:
+            return _snapshot_response(request, entry)
+        target = snapshot.pair_redirect(artist_slug, painting_slug)
+        if target is not None:
+            return RedirectResponse(url=f"/api/v1/paintings/{target[0]}/{target[1]}", status_code=301)
+
+    resolution = await resolve_painting_pair(session, artist_slug, painting_slug)
+    if not resolution:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    if resolution.is_redirect:
+        return RedirectResponse(
+            url=f"/api/v1/paintings/{resolution.artist_slug}/{resolution.painting_slug}",
+            status_code=301,
+        )
+    response = await _cached_response(
+        request,
+        ("painting", resolution.painting_id),
+        resolution.painting_id,
+        partial(_load_painting, session, resolution.painting_id),
+        partial(_load_version, session, resolution.painting_id),
     )
+    if response is None:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    return response
+
+
+@router.get("/{artist_slug}/{painting_slug}/bundle", response_model=PaintingBundleResponse)
+async def read_painting_bundle(
+    artist_slug: str,
+    painting_slug: str,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+):
+    media_type = negotiate_format(request.headers.get("accept"))
+    snapshot = _snapshot_for(request)
+    if snapshot is not None:
+        entry = snapshot.bundle(artist_slug, painting_slug) if media_type == JSON else None
+        if entry is not None:
+            return _snapshot_response(request, entry, vary="Accept")
+        target = snapshot.pair_redirect(artist_slug, painting_slug)
+        if target is not None:
+            return RedirectResponse(url=f"/api/v1/paintings/{target[0]}/{target[1]}/bundle", status_code=301)
+
+    resolution = await resolve_painting_pair(session, artist_slug, painting_slug)
+    if not resolution:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    if resolution.is_redirect:
+        return RedirectResponse(
+            url=f"/api/v1/paintings/{resolution.artist_slug}/{resolution.painting_slug}/bundle",
+            status_code=301,
+        )
+    response = await _cached_response(
+        request,
+        ("bundle", media_type, resolution.painting_id),
+        resolution.painting_id,
+        partial(_load_bundle, session, resolution.painting_id, media_type),
+        partial(_load_version, session, resolution.painting_id),
+        media_type,
+    )
+    if response is None:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    return response
+
+
+@router.get("/{artist_slug}/{painting_slug}/related", response_model=list[RelatedPaintingResponse])
+async def read_related_paintings(
+    artist_slug: str,
+    painting_slug: str,
+    limit: int = Query(RELATED_TOP_K, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session),
+):
+    resolution = await resolve_painting_pair(session, artist_slug, painting_slug)
+    if not resolution:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    if resolution.is_redirect:
+        return RedirectResponse(
+            url=f"/api/v1/paintings/{resolution.artist_slug}/{resolution.painting_slug}/related?limit={limit}",
+            status_code=301,
+        )
+    rows = await get_related_paintings(session, resolution.painting_id, limit)
+    return [RelatedPaintingResponse.model_validate(row) for row in rows]
 
 
 @router.get("/{artist_and_painting_slug}", include_in_schema=False)
-async def redirect_combined_slug(artist_and_painting_slug: str, session: AsyncSession = Depends(get_session)):
-    alias_painting = await get_painting_by_combined_alias(session, artist_and_painting_slug)
-    if alias_painting:
+async def redirect_combined_slug(
+    artist_and_painting_slug: str, request: Request, session: AsyncSession = Depends(get_read_session)
+):
+    snapshot = _snapshot_for(request)
+    if snapshot is not None:
+        target = snapshot.combined_redirect(artist_and_painting_slug)
+        if target is not None:
+            return RedirectResponse(url=f"/api/v1/paintings/{target[0]}/{target[1]}", status_code=301)
+
+    resolution = await resolve_combined_slug(session, artist_and_painting_slug)
+    if resolution:
         return RedirectResponse(
-            url=f"/api/v1/paintings/{alias_painting.artist_slug}/{alias_painting.painting_slug}",
+            url=f"/api/v1/paintings/{resolution.artist_slug}/{resolution.painting_slug}",
             status_code=301,
         )
     raise HTTPException(status_code=404, detail="Painting not found")
 
 
 @router.get("/by-id/{painting_id}/facts", response_model=list[FactResponse])
-async def read_facts(painting_id: str, session: AsyncSession = Depends(get_session)):
-    facts = await get_facts_for_painting(session, painting_id)
+async def read_facts(painting_id: UUID, request: Request, session: AsyncSession = Depends(get_read_session)):
+    media_type = negotiate_format(request.headers.get("accept"))
+    snapshot = _snapshot_for(request)
+    if snapshot is not None and media_type == JSON:
+        entry = snapshot.facts(painting_id)
+        if entry is not None:
+            return _snapshot_response(request, entry, vary="Accept")
+
+    response = await _cached_response(
+        request,
+        ("facts", media_type, painting_id),
+        painting_id,
+        partial(_load_facts, session, painting_id, media_type),
+        partial(_load_version, session, painting_id),
+        media_type,
+    )
+    if response is None:
+        body = b"[]" if media_type == JSON else encode_facts(media_type, painting_id, [])
+        return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+    return response
+
+
+def _is_editor(authorization: str | None) -> bool:
+    scheme, _, token = (authorization or "").partition(" ")
+    return (
+        bool(FACTS_EDIT_TOKEN)
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(token.encode(), FACTS_EDIT_TOKEN.encode())
+    )
+
+
+def _require_editor(authorization: str | None = Header(None)) -> None:
+    if not FACTS_EDIT_TOKEN:
+        raise HTTPException(status_code=403, detail="Fact editing is disabled")
+    if not _is_editor(authorization):
+        raise HTTPException(status_code=401, detail="Invalid editor token", headers={"WWW-Authenticate": "Bearer"})
+
+
+@router.patch("/by-id/{painting_id}/facts", response_model=list[FactResponse], dependencies=[Depends(_require_editor)])
+async def update_facts(
+    painting_id: UUID,
+    edits: FactEditRequest,
+    if_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_session),
+):
+    """Create, update, delete and reorder a painting's facts in one transaction.
+
+    ``If-Match`` must carry the current database ETag of the painting's facts (or
+    bundle): the one returned by a ``GET`` sent with the editor token or a valid
+    ``X-Read-Your-Writes`` (which skip the catalog snapshot), or by the previous
+    ``PATCH``. The response carries the new facts, their ETag and ``X-Primary-LSN``
+    for read-your-writes on replicas.
+    """
+    if if_match is None:
+        raise HTTPException(status_code=428, detail="If-Match is required")
+    try:
+        edited = await edit_facts(session, painting_id, edits, if_match)
+    except FactVersionMismatch:
+        raise HTTPException(status_code=412, detail="Facts were changed by someone else") from None
+    except FactEditError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from None
+    if edited is None:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    version, facts = edited
+    body = facts_adapter.dump_json([FactResponse.model_validate(fact) for fact in facts])
+    headers = {
+        "ETag": make_validators("facts", version).etag,
+        "X-Primary-LSN": await session.scalar(PRIMARY_LSN_SQL),
+    }
+    return Response(content=body, media_type=JSON, headers=headers)
+
+
+def _snapshot_for(request: Request):
+    """The catalog snapshot, unless the request must see the database as it is now.
+
+    Editors (a valid editor token) and read-your-writes readers (``primary`` or a
+    WAL position) are served from the database, so they see their own edits and
+    get the ETags ``If-Match`` expects. Any other header value keeps the snapshot,
+    so clients cannot push snapshot traffic onto Postgres at will.
+    """
+    primary_only, min_lsn = read_your_writes(request)
+    if primary_only or min_lsn is not None or _is_editor(request.headers.get("authorization")):
+        return None
+    return snapshot_store.current()
+
+
+def _snapshot_response(request: Request, entry: SnapshotEntry, vary: str | None = None) -> Response:
+    headers = entry.validators.headers
+    if vary:
+        headers["Vary"] = vary
+    if is_not_modified(request, entry.validators):
+        return Response(status_code=304, headers=headers)
+    return SnapshotResponse(entry.body, media_type=JSON, headers=headers)
+
+
+async def _cached_response(
+    request: Request, key: tuple, painting_id: UUID, load, load_version, media_type: str | None = None
+) -> Response | None:
+    """Serve a painting representation from the response cache, loading it on a miss.
+
+    ``key[0]`` names the representation. ``load`` returns ``None`` when the painting
+    does not exist, or ``(validators, body)``; ``load_version`` returns its
+    ``PaintingVersion`` or ``None``. Concurrent misses for the same key share one
+    load, so it must not depend on the request. Passing ``media_type`` marks the
+    representation as negotiated through ``Accept``.
+    """
+    vary = "Accept-Encoding" if media_type is None else "Accept, Accept-Encoding"
+    entry = response_cache.get(key)
+    if entry is None:
+        if is_conditional(request):
+            # Revalidating a body this worker has not cached: the version query
+            # alone decides a 304, so the body is only loaded when it changed.
+            version = await load_version()
+            if version is None:
+                return None
+            validators = make_validators(_representation(key[0], media_type or JSON), version)
+            response = _revalidate(request, validators, vary)
+            if response is not None:
+                return response
+        entry = await response_flight.do(key, partial(_fill_response_cache, key, painting_id, load, media_type))
+        if entry is None:
+            return None
+    coding = response_cache.coding(entry, request.headers.get("accept-encoding"))
+    validators = entry.validators.encoded(coding)
+    if is_not_modified(request, validators):
+        response = not_modified_response(validators)
+        response.headers["Vary"] = entry.vary
+        return response
+    return response_cache.response(entry, coding)
+
+
+def _revalidate(request: Request, validators: Validators, vary: str) -> Response | None:
+    # Without the body its size is unknown, so either the identity or the
+    # negotiated compressed variant may be the one the client holds.
+    codings = dict.fromkeys(("identity", negotiate_encoding(request.headers.get("accept-encoding"))))
+    for coding in codings:
+        if is_not_modified(request, validators.encoded(coding)):
+            response = not_modified_response(validators.encoded(coding))
+            response.headers["Vary"] = vary
+            return response
+    return None
+
+
+async def _fill_response_cache(key: tuple, painting_id: UUID, load, media_type: str | None) -> CachedResponse | None:
+    generation = response_cache.generation
+    loaded = await load()
+    if loaded is None:
+        return None
+    validators, body = loaded
+    if media_type is None:
+        return response_cache.put(key, painting_id, body, validators, generation)
+    return response_cache.put(
+        key, painting_id, body, validators, generation, media_type, vary="Accept, Accept-Encoding"
+    )
+
+
+async def _load_version(session: AsyncSession, painting_id: UUID) -> PaintingVersion | None:
+    pool = fast_pool_for(session)
+    if pool is not None:
+        async with pool.acquire() as connection:
+            return await fetch_painting_version(connection, painting_id)
+    return await get_painting_version(session, painting_id)
+
+
+async def _load_painting(session: AsyncSession, painting_id: UUID):
+    pool = fast_pool_for(session)
+    if pool is not None:
+        async with pool.acquire() as connection:
+            version = await fetch_painting_version(connection, painting_id)
+            if not version:
+                return None
+            painting = await fetch_painting(connection, painting_id)
+    else:
+        version = await get_painting_version(session, painting_id)
+        if not version:
+            return None
+        row = await get_painting_by_id(session, painting_id)
+        painting = PaintingResponse.model_validate(row) if row else None
+    if painting is None:
+        return None
+    return make_validators("painting", version), painting.model_dump_json().encode()
+
+
+def _representation(name: str, media_type: str) -> str:
+    # JSON keeps the plain name so its ETags survive the addition of other formats.
+    return name if media_type == JSON else f"{name}:{media_type}"
+
+
+async def _load_facts(session: AsyncSession, painting_id: UUID, media_type: str):
+    pool = fast_pool_for(session)
+    if pool is not None:
+        async with pool.acquire() as connection:
+            version = await fetch_painting_version(connection, painting_id)
+            if not version:
+                return None
+            facts = await fetch_facts(connection, painting_id)
+    else:
+        version = await get_painting_version(session, painting_id)
+        if not version:
+            return None
+        facts = await get_facts_for_painting(session, painting_id)
+        if media_type == JSON:
+            facts = [FactResponse.model_validate(fact) for fact in facts]
+    validators = make_validators(_representation("facts", media_type), version)
+    if media_type != JSON:
+        return validators, encode_facts(media_type, painting_id, facts)
+    return validators, facts_adapter.dump_json(facts)
+
+
+async def _load_bundle(session: AsyncSession, painting_id: UUID, media_type: str):
+    bundle = await get_painting_bundle(session, painting_id)
+    if not bundle:
+        return None
+    validators = make_validators(_representation("bundle", media_type), bundle.version)
+    # Built from plain rows exactly as the snapshot export builds it.
+    painting = PaintingBundleResponse.model_validate({**bundle.painting, "facts": bundle.facts})
+    if media_type != JSON:
+        fields = painting.model_dump(mode="json")
+        return validators, encode_facts(media_type, painting.id, fields.pop("facts"), fields)
+    return validators, painting.model_dump_json().encode()
+
+
+@router.get("/by-id/{painting_id}/facts/at", response_model=list[FactResponse])
+async def read_facts_at_point(
+    painting_id: UUID,
+    x: float = Query(..., ge=0, le=1),
+    y: float = Query(..., ge=0, le=1),
+    session: AsyncSession = Depends(get_read_session),
+):
+    facts = await get_facts_at_point(session, painting_id, x, y)
+    if facts is None:
+        raise HTTPException(status_code=404, detail="Painting not found")
+    return [FactResponse.model_validate(fact) for fact in facts]
+
+
+@router.get("/by-id/{painting_id}/facts/viewport", response_model=list[FactResponse])
+async def read_facts_in_viewport(
+    painting_id: UUID,
+    x: float = Query(..., ge=0, le=1),
+    y: float = Query(..., ge=0, le=1),
+    w: float = Query(..., gt=0, le=1),
+    h: float = Query(..., gt=0, le=1),
+    min_extent: float = Query(0.0, ge=0, le=1),
+    limit: int | None = Query(None, ge=1, le=5000),
+    session: AsyncSession = Depends(get_read_session),
+):
+    facts = await get_facts_in_viewport(session, painting_id, x, y, w, h, min_extent=min_extent, limit=limit)
+    if facts is None:
+        raise HTTPException(status_code=404, detail="Painting not found")
     return [FactResponse.model_validate(fact) for fact in facts]
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.replicas import get_read_session
+from app.schemas.painting import PaintingResponse
+from app.schemas.search import FactMatch, SearchResponse, SearchResult
+from app.services.search import search_paintings
+
+router = APIRouter(prefix="/api/v1/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_session),
+):
+    hits = await search_paintings(session, q, limit)
+    return SearchResponse(
+        query=q,
+        results=[
+            SearchResult(
+                painting=PaintingResponse.model_validate(hit.painting),
+                score=hit.score,
+                matched_facts=[
+                    FactMatch(id=fact.id, name=fact.name, order_index=fact.order_index, snippet=fact.snippet)
+                    for fact in hit.facts
+                ],
+            )
+            for hit in hits
+        ],
+    )
@@ -0,0 +1,58 @@
+import re
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app.http_cache import none_match
+from app.services.images import derivative_file
+
+router = APIRouter(prefix="/api/v1/tiles", tags=["tiles"])
+
+# Derivatives are content-addressed, so a URL always names the same bytes.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Resolve a single-range ``Range`` header to ``(start, end)`` inclusive.
+
+    Returns ``None`` for headers we serve in full (multiple ranges, other units,
+    and invalid ranges such as ``bytes=5-3``, which RFC 9110 says to ignore), and
+    raises 416 when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first and last and int(last) < int(first):
+        return None
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+@router.get("/{sha256}/{path:path}")
+def read_tile(sha256: str, path: str, request: Request):
+    file = derivative_file(sha256, path)
+    if file is None or not file.is_file():
+        raise HTTPException(status_code=404, detail="Derivative not found")
+
+    etag = f'"{sha256[:16]}-{path}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag, "Accept-Ranges": "bytes"}
+    media_type = "application/xml" if path.endswith(".dzi") else "image/jpeg"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and none_match(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    data = file.read_bytes()
+    range_header = request.headers.get("range")
+    byte_range = _byte_range(range_header, len(data)) if range_header else None
+    if byte_range is None:
+        return Response(content=data, media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+    return Response(content=data[start : end + 1], status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,29 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.fact import FactResponse
+from app.schemas.painting import PaintingResponse
+
+
+class PaintingSlugPair(BaseModel):
+    artist_slug: str
+    painting_slug: str
+
+
+class PaintingBatchRequest(BaseModel):
+    pairs: list[PaintingSlugPair] = []
+    ids: list[UUID] = []
+    include_facts: bool = False
+
+
+class PaintingBatchItem(BaseModel):
+    status: Literal["ok", "redirect", "not_found"]
+    location: str | None = None
+    painting: PaintingResponse | None = None
+    facts: list[FactResponse] | None = None
+
+
+class PaintingBatchResponse(BaseModel):
+    items: dict[str, PaintingBatchItem]
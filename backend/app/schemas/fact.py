@@ -1,6 +1,6 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class FactResponse(BaseModel):
@@ -8,6 +8,8 @@ class FactResponse(BaseModel):
     painting_id: UUID
     name: str
     description_md: str
+    description_html: str | None = None
+    description_text: str | None = None
     geometry_type: str
     x: float
     y: float
@@ -16,3 +18,44 @@ class FactResponse(BaseModel):
     order_index: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# Rectangle bounds repeat the ck_facts_* check constraints, so a bad edit is
+# rejected with a 422 before any statement runs.
+class FactCreate(BaseModel):
+    id: UUID = Field(default_factory=uuid4)
+    name: str = Field(min_length=1)
+    description_md: str = ""
+    geometry_type: str = Field(min_length=1)
+    x: float = Field(ge=0, le=1)
+    y: float = Field(ge=0, le=1)
+    w: float = Field(gt=0, le=1)
+    h: float = Field(gt=0, le=1)
+
+
+class FactUpdate(BaseModel):
+    id: UUID
+    name: str | None = Field(default=None, min_length=1)
+    description_md: str | None = None
+    geometry_type: str | None = Field(default=None, min_length=1)
+    x: float | None = Field(default=None, ge=0, le=1)
+    y: float | None = Field(default=None, ge=0, le=1)
+    w: float | None = Field(default=None, gt=0, le=1)
+    h: float | None = Field(default=None, gt=0, le=1)
+
+
+class FactEditRequest(BaseModel):
+    create: list[FactCreate] = []
+    update: list[FactUpdate] = []
+    delete: list[UUID] = []
+    # The painting's complete fact order after the edit, created facts included.
+    order: list[UUID] | None = None
+
+    @model_validator(mode="after")
+    def _check_ids(self) -> "FactEditRequest":
+        ids = [fact.id for fact in self.create] + [fact.id for fact in self.update] + self.delete
+        if len(ids) != len(set(ids)):
+            raise ValueError("a fact id may appear only once across create, update and delete")
+        if self.order is not None and len(self.order) != len(set(self.order)):
+            raise ValueError("order lists a fact more than once")
+        return self
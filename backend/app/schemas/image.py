@@ -0,0 +1,45 @@
+import math
+
+from pydantic import BaseModel
+
+# Part of the content address contract: changing these requires a new IMAGE_CACHE_DIR.
+TILE_SIZE = 256
+TILE_OVERLAP = 1
+TILE_FORMAT = "jpg"
+THUMBNAIL_SIZES = (160, 320, 640)
+
+TILES_URL = "/api/v1/tiles"
+
+
+class TileManifest(BaseModel):
+    width: int
+    height: int
+    tile_size: int
+    overlap: int
+    format: str
+    max_level: int
+    dzi_url: str
+    # Placeholders: {level}, {col}, {row}.
+    tile_url_template: str
+    thumbnails: dict[str, str]
+
+
+def max_level(width: int, height: int) -> int:
+    return math.ceil(math.log2(max(width, height, 1)))
+
+
+def tile_manifest(sha256: str | None, width: int | None, height: int | None) -> TileManifest | None:
+    if not sha256 or not width or not height:
+        return None
+    base = f"{TILES_URL}/{sha256}"
+    return TileManifest(
+        width=width,
+        height=height,
+        tile_size=TILE_SIZE,
+        overlap=TILE_OVERLAP,
+        format=TILE_FORMAT,
+        max_level=max_level(width, height),
+        dzi_url=f"{base}/image.dzi",
+        tile_url_template=f"{base}/image_files/{{level}}/{{col}}_{{row}}.{TILE_FORMAT}",
+        thumbnails={str(size): f"{base}/thumbnails/{size}.{TILE_FORMAT}" for size in THUMBNAIL_SIZES},
+    )
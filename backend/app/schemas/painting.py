@@ -1,6 +1,9 @@
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+
+from app.schemas.fact import FactResponse
+from app.schemas.image import TileManifest, tile_manifest
 
 
 class PaintingResponse(BaseModel):
@@ -16,5 +19,26 @@ class PaintingResponse(BaseModel):
     license_name: str | None
     license_url: str | None
     facts_count: int
+    image_sha256: str | None = Field(default=None, exclude=True)
+    image_width: int | None = Field(default=None, exclude=True)
+    image_height: int | None = Field(default=None, exclude=True)
 
     model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def tiles(self) -> TileManifest | None:
+        return tile_manifest(self.image_sha256, self.image_width, self.image_height)
+
+
+class PaintingBundleResponse(PaintingResponse):
+    facts: list[FactResponse]
+
+
+class RelatedPaintingResponse(PaintingResponse):
+    score: float
+
+
+class PaintingPage(BaseModel):
+    items: list[PaintingResponse]
+    next_cursor: str | None
@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.painting import PaintingResponse
+
+
+class FactMatch(BaseModel):
+    id: UUID
+    name: str
+    order_index: int
+    snippet: str
+
+
+class SearchResult(BaseModel):
+    painting: PaintingResponse
+    score: float
+    matched_facts: list[FactMatch]
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: list[SearchResult]
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field, computed_field
+
+from app.schemas.image import TileManifest, tile_manifest
+
+
+class RepresentativePainting(BaseModel):
+    artist_slug: str
+    painting_slug: str
+    name: str
+    image_url: str
+    image_sha256: str | None = Field(default=None, exclude=True)
+    image_width: int | None = Field(default=None, exclude=True)
+    image_height: int | None = Field(default=None, exclude=True)
+
+    @computed_field
+    @property
+    def tiles(self) -> TileManifest | None:
+        return tile_manifest(self.image_sha256, self.image_width, self.image_height)
+
+
+class ArtistSummary(BaseModel):
+    artist_slug: str
+    artist_name: str
+    paintings_count: int
+    facts_count: int
+    representative: RepresentativePainting
+
+
+class ArtistPage(BaseModel):
+    items: list[ArtistSummary]
+    next_cursor: str | None
+
+
+class GenreSummary(BaseModel):
+    genre_name: str
+    paintings_count: int
+    artists_count: int
+    facts_count: int
+    representative: RepresentativePainting
+
+
+class GenrePage(BaseModel):
+    items: list[GenreSummary]
+    next_cursor: str | None
@@ -1,12 +1,14 @@
 import asyncio
 import uuid
 
-from sqlalchemy import delete
+from sqlalchemy import delete, text
 
 from app.db.database import AsyncSessionLocal
 from app.models.fact import Fact
 from app.models.painting import Painting
 from app.models.painting_alias import PaintingAlias
+from app.services.markdown import render_description
+from app.services.summaries import REFRESH_SUMMARIES_SQL
 
 
 async def seed() -> None:
@@ -97,6 +99,8 @@ async def seed() -> None:
                 order_index=6,
             ),
         ]
+        for fact in facts:
+            fact.description_html, fact.description_text, fact.render_version = render_description(fact.description_md)
         session.add(painting)
         session.add_all(facts)
         session.add_all(
@@ -114,6 +118,10 @@ async def seed() -> None:
         )
         await session.commit()
 
+        for statement in REFRESH_SUMMARIES_SQL:
+            await session.execute(text(statement))
+        await session.commit()
+
 
 if __name__ == "__main__":
     asyncio.run(seed())
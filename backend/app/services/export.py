@@ -0,0 +1,174 @@
+"""Change feed: the whole catalog, or what changed since a cursor, as NDJSON.
+
+One JSON object per line::
+
+    {"type": "painting", "updated_at": ..., "data": {PaintingResponse}}
+    {"type": "alias", "updated_at": ..., "data": {"id", "painting_id", "artist_slug", "painting_slug", "combined_slug"}}
+    {"type": "fact", "updated_at": ..., "data": {FactResponse}}
+    {"type": "tombstone", "entity": "painting" | "alias" | "fact", "id": ..., "painting_id": ..., "deleted_at": ...}
+    {"type": "end", "cursor": ...}
+
+Pass the ``end`` cursor as ``since`` next time to get only what changed after
+it; a stream without the ``end`` line was cut short and should be retried from
+the previous cursor. Tombstones are only sent by incremental exports, and only
+for ids that do not exist anymore: a fact deleted and re-created by an import
+arrives as an upsert.
+
+Everything is read in one REPEATABLE READ transaction through server-side
+cursors, ``EXPORT_FETCH_SIZE`` rows at a time, and the next batch is only
+fetched once the client took the previous one. ``updated_at`` is the writing
+transaction's start time, so a row can become visible after rows with later
+timestamps were exported; the export stops ``EXPORT_SAFETY_WINDOW_SECONDS``
+before its snapshot so such rows land in the next export instead of being
+skipped (writes running longer than the window can still be missed).
+
+At most ``EXPORT_MAX_CONCURRENT`` exports run at once, each statement is
+bounded by ``EXPORT_STATEMENT_TIMEOUT_SECONDS``, and a client that stops
+reading for ``EXPORT_IDLE_TIMEOUT_SECONDS`` loses its transaction (its stream
+ends without the ``end`` line).
+"""
+
+import asyncio
+import json
+import os
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from app.db.replicas import read_engine
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas.fact import FactResponse
+from app.schemas.painting import PaintingResponse
+
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "1000"))
+EXPORT_SAFETY_WINDOW_SECONDS = float(os.getenv("EXPORT_SAFETY_WINDOW_SECONDS", "60"))
+EXPORT_MAX_CONCURRENT = int(os.getenv("EXPORT_MAX_CONCURRENT", "4"))
+EXPORT_STATEMENT_TIMEOUT_SECONDS = float(os.getenv("EXPORT_STATEMENT_TIMEOUT_SECONDS", "30"))
+EXPORT_IDLE_TIMEOUT_SECONDS = float(os.getenv("EXPORT_IDLE_TIMEOUT_SECONDS", "60"))
+
+# Each export pins a connection and a snapshot for as long as its client reads.
+export_slots = asyncio.Semaphore(EXPORT_MAX_CONCURRENT)
+
+BEGINNING = datetime.min.replace(tzinfo=timezone.utc)
+
+UNTIL_SQL = text("SELECT now() - make_interval(secs => :window)")
+
+TIMEOUTS_SQL = text(
+    """
+    SELECT set_config('statement_timeout', :statement_timeout, true),
+           set_config('idle_in_transaction_session_timeout', :idle_timeout, true)
+    """
+)
+
+PAINTINGS_SQL = text(
+    """
+    SELECT id, name, artist_name, artist_slug, painting_slug, museum_name, genre_name,
+           image_url, source_url, license_name, license_url, facts_count,
+           image_sha256, image_width, image_height, updated_at
+    FROM paintings
+    WHERE updated_at >= :since AND updated_at < :until
+    ORDER BY updated_at, id
+    """
+)
+
+ALIASES_SQL = text(
+    """
+    SELECT id, painting_id, artist_slug, painting_slug, combined_slug, updated_at
+    FROM painting_aliases
+    WHERE updated_at >= :since AND updated_at < :until
+    ORDER BY updated_at, id
+    """
+)
+
+FACTS_SQL = text(
+    """
+    SELECT id, painting_id, name, description_md, description_html, description_text,
+           geometry_type, x, y, w, h, order_index, updated_at
+    FROM facts
+    WHERE updated_at >= :since AND updated_at < :until
+    ORDER BY updated_at, id
+    """
+)
+
+TOMBSTONES_SQL = text(
+    """
+    SELECT t.entity, t.entity_id, t.painting_id, t.deleted_at
+    FROM catalog_tombstones t
+    WHERE t.deleted_at >= :since AND t.deleted_at < :until
+      AND NOT CASE t.entity
+          WHEN 'painting' THEN EXISTS (SELECT 1 FROM paintings p WHERE p.id = t.entity_id)
+          WHEN 'fact' THEN EXISTS (SELECT 1 FROM facts f WHERE f.id = t.entity_id)
+          ELSE EXISTS (SELECT 1 FROM painting_aliases a WHERE a.id = t.entity_id)
+      END
+    ORDER BY t.deleted_at, t.entity_id
+    """
+)
+
+
+def parse_since(cursor: str) -> datetime:
+    try:
+        (value,) = decode_cursor(cursor, 1)
+        return datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError("Malformed export cursor") from exc
+
+
+def _painting_line(row) -> str:
+    data = PaintingResponse.model_validate(row._mapping).model_dump_json()
+    return f'{{"type":"painting","updated_at":"{row.updated_at.isoformat()}","data":{data}}}\n'
+
+
+def _alias_line(row) -> str:
+    data = {
+        "id": str(row.id),
+        "painting_id": str(row.painting_id),
+        "artist_slug": row.artist_slug,
+        "painting_slug": row.painting_slug,
+        "combined_slug": row.combined_slug,
+    }
+    return json.dumps(
+        {"type": "alias", "updated_at": row.updated_at.isoformat(), "data": data}, ensure_ascii=False
+    ) + "\n"
+
+
+def _fact_line(row) -> str:
+    data = FactResponse.model_validate(row._mapping).model_dump_json()
+    return f'{{"type":"fact","updated_at":"{row.updated_at.isoformat()}","data":{data}}}\n'
+
+
+def _tombstone_line(row) -> str:
+    return json.dumps({
+        "type": "tombstone",
+        "entity": row.entity,
+        "id": str(row.entity_id),
+        "painting_id": str(row.painting_id) if row.painting_id else None,
+        "deleted_at": row.deleted_at.isoformat(),
+    }) + "\n"
+
+
+async def export_lines(since: datetime | None = None) -> AsyncIterator[bytes]:
+    """Yield the export in chunks of up to ``EXPORT_FETCH_SIZE`` lines."""
+    streams = [(PAINTINGS_SQL, _painting_line), (ALIASES_SQL, _alias_line), (FACTS_SQL, _fact_line)]
+    if since is not None:
+        streams.append((TOMBSTONES_SQL, _tombstone_line))
+
+    async with export_slots, read_engine().connect() as connection:
+        connection = await connection.execution_options(isolation_level="REPEATABLE READ")
+        async with connection.begin():
+            await connection.execute(
+                TIMEOUTS_SQL,
+                {
+                    "statement_timeout": f"{int(EXPORT_STATEMENT_TIMEOUT_SECONDS * 1000)}ms",
+                    "idle_timeout": f"{int(EXPORT_IDLE_TIMEOUT_SECONDS * 1000)}ms",
+                },
+            )
+            until = await connection.scalar(UNTIL_SQL, {"window": EXPORT_SAFETY_WINDOW_SECONDS})
+            params = {"since": since or BEGINNING, "until": until}
+            for statement, render in streams:
+                result = await connection.stream(
+                    statement, params, execution_options={"yield_per": EXPORT_FETCH_SIZE}
+                )
+                async for rows in result.partitions():
+                    yield "".join(map(render, rows)).encode()
+    yield json.dumps({"type": "end", "cursor": encode_cursor([until.isoformat()])}).encode() + b"\n"
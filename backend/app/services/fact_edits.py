@@ -0,0 +1,173 @@
+"""Apply a curator's batch of fact edits to one painting in one transaction.
+
+Creates, updates, deletes and the new order are each one set-based statement
+over ``unnest`` arrays, whatever the number of facts. The painting row is locked
+first and the caller's ``If-Match`` is compared with the painting's current
+facts ETag, so concurrent editors cannot overwrite each other's changes.
+
+All statements share the transaction's ``now()`` as ``updated_at``, and the
+``painting_content`` notifications the fact triggers send are all for the
+same painting id. Postgres delivers identical notifications of a transaction
+once, on commit, so each batch invalidates caches once.
+"""
+
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.http_cache import if_match_satisfied, make_validators
+from app.models.fact import Fact
+from app.schemas.fact import FactEditRequest
+from app.services.facts import get_facts_for_painting
+from app.services.markdown import render_description
+from app.services.paintings import PaintingVersion, get_painting_version
+
+# Representations whose ETags cover the painting's facts, and the content
+# codings the response cache may have served them with.
+FACT_REPRESENTATIONS = ("facts", "bundle")
+FACT_CODINGS = ("identity", "gzip", "br")
+
+LOCK_PAINTING_SQL = text("SELECT id FROM paintings WHERE id = :painting_id FOR UPDATE")
+
+CURRENT_FACTS_SQL = text("SELECT id, order_index FROM facts WHERE painting_id = :painting_id")
+
+TAKEN_IDS_SQL = text("SELECT id FROM facts WHERE id = ANY(CAST(:ids AS uuid[]))")
+
+DELETE_FACTS_SQL = text("DELETE FROM facts WHERE painting_id = :painting_id AND id = ANY(CAST(:ids AS uuid[]))")
+
+# NULL means "keep the current value". Rows whose values do not change keep their updated_at.
+UPDATE_FACTS_SQL = text(
+    """
+    UPDATE facts f
+    SET name = coalesce(u.name, f.name),
+        description_md = coalesce(u.description_md, f.description_md),
+        description_html = CASE WHEN u.description_md IS NULL THEN f.description_html ELSE u.description_html END,
+        description_text = CASE WHEN u.description_md IS NULL THEN f.description_text ELSE u.description_text END,
+        render_version = CASE WHEN u.description_md IS NULL THEN f.render_version ELSE u.render_version END,
+        geometry_type = coalesce(u.geometry_type, f.geometry_type),
+        x = coalesce(u.x, f.x),
+        y = coalesce(u.y, f.y),
+        w = coalesce(u.w, f.w),
+        h = coalesce(u.h, f.h),
+        updated_at = now()
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:names AS text[]), CAST(:descriptions AS text[]), CAST(:html AS text[]),
+        CAST(:texts AS text[]), CAST(:render_versions AS integer[]), CAST(:geometry_types AS text[]),
+        CAST(:x AS double precision[]), CAST(:y AS double precision[]),
+        CAST(:w AS double precision[]), CAST(:h AS double precision[])
+    ) AS u(id, name, description_md, description_html, description_text, render_version, geometry_type, x, y, w, h)
+    WHERE f.id = u.id AND f.painting_id = :painting_id
+      AND (f.name, f.description_md, f.geometry_type, f.x, f.y, f.w, f.h) IS DISTINCT FROM (
+          coalesce(u.name, f.name), coalesce(u.description_md, f.description_md),
+          coalesce(u.geometry_type, f.geometry_type),
+          coalesce(u.x, f.x), coalesce(u.y, f.y), coalesce(u.w, f.w), coalesce(u.h, f.h)
+      )
+    """
+)
+
+# Created facts are appended after :first_index in request order; an explicit order moves them afterwards.
+INSERT_FACTS_SQL = text(
+    """
+    INSERT INTO facts (
+        id, painting_id, name, description_md, description_html, description_text, render_version,
+        geometry_type, x, y, w, h, order_index, created_at, updated_at
+    )
+    SELECT c.id, CAST(:painting_id AS uuid), c.name, c.description_md, c.description_html, c.description_text,
+           c.render_version, c.geometry_type, c.x, c.y, c.w, c.h, CAST(:first_index AS integer) + c.position - 1,
+           now(), now()
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:names AS text[]), CAST(:descriptions AS text[]), CAST(:html AS text[]),
+        CAST(:texts AS text[]), CAST(:render_versions AS integer[]), CAST(:geometry_types AS text[]),
+        CAST(:x AS double precision[]), CAST(:y AS double precision[]),
+        CAST(:w AS double precision[]), CAST(:h AS double precision[])
+    ) WITH ORDINALITY
+      AS c(id, name, description_md, description_html, description_text, render_version, geometry_type, x, y, w, h,
+           position)
+    """
+)
+
+REORDER_FACTS_SQL = text(
+    """
+    UPDATE facts f
+    SET order_index = o.position - 1, updated_at = now()
+    FROM unnest(CAST(:ids AS uuid[])) WITH ORDINALITY AS o(id, position)
+    WHERE f.id = o.id AND f.painting_id = :painting_id AND f.order_index <> o.position - 1
+    """
+)
+
+
+class FactVersionMismatch(Exception):
+    """``If-Match`` does not name the painting's current facts."""
+
+
+class FactEditError(ValueError):
+    """The edit does not apply to the painting's current facts."""
+
+
+def _columns(facts) -> dict[str, list]:
+    rendered = [
+        render_description(fact.description_md) if fact.description_md is not None else None for fact in facts
+    ]
+    return {
+        "ids": [fact.id for fact in facts],
+        "names": [fact.name for fact in facts],
+        "descriptions": [fact.description_md for fact in facts],
+        "html": [description.html if description else None for description in rendered],
+        "texts": [description.text if description else None for description in rendered],
+        "render_versions": [description.version if description else None for description in rendered],
+        "geometry_types": [fact.geometry_type for fact in facts],
+        "x": [fact.x for fact in facts],
+        "y": [fact.y for fact in facts],
+        "w": [fact.w for fact in facts],
+        "h": [fact.h for fact in facts],
+    }
+
+
+async def edit_facts(
+    session: AsyncSession, painting_id: uuid.UUID, edits: FactEditRequest, if_match: str
+) -> tuple[PaintingVersion, list[Fact]] | None:
+    """Apply ``edits`` and return the new version and facts, or ``None`` if the painting does not exist."""
+    async with session.begin():
+        if (await session.execute(LOCK_PAINTING_SQL, {"painting_id": painting_id})).first() is None:
+            return None
+        version = await get_painting_version(session, painting_id)
+        current_validators = [
+            make_validators(name, version).encoded(coding)
+            for name in FACT_REPRESENTATIONS
+            for coding in FACT_CODINGS
+        ]
+        if not if_match_satisfied(if_match, current_validators):
+            raise FactVersionMismatch()
+
+        result = await session.execute(CURRENT_FACTS_SQL, {"painting_id": painting_id})
+        current = {row.id: row.order_index for row in result}
+        edited = [*(fact.id for fact in edits.update), *edits.delete]
+        missing = [str(fact_id) for fact_id in edited if fact_id not in current]
+        if missing:
+            raise FactEditError(f"unknown facts: {', '.join(missing)}")
+        created = [fact.id for fact in edits.create]
+        if created:
+            taken = (await session.execute(TAKEN_IDS_SQL, {"ids": created})).scalars().all()
+            if taken:
+                raise FactEditError(f"fact ids already exist: {', '.join(map(str, taken))}")
+        deleted = set(edits.delete)
+        remaining = {fact_id: index for fact_id, index in current.items() if fact_id not in deleted}
+        if edits.order is not None and set(edits.order) != {*remaining, *created}:
+            raise FactEditError("order must list every fact of the painting after the edit exactly once")
+
+        if edits.delete:
+            await session.execute(DELETE_FACTS_SQL, {"painting_id": painting_id, "ids": edits.delete})
+        if edits.update:
+            await session.execute(UPDATE_FACTS_SQL, {"painting_id": painting_id, **_columns(edits.update)})
+        if edits.create:
+            first_index = max(remaining.values(), default=-1) + 1
+            await session.execute(
+                INSERT_FACTS_SQL, {"painting_id": painting_id, "first_index": first_index, **_columns(edits.create)}
+            )
+        if edits.order is not None:
+            await session.execute(REORDER_FACTS_SQL, {"painting_id": painting_id, "ids": edits.order})
+
+        version = await get_painting_version(session, painting_id)
+        facts = await get_facts_for_painting(session, painting_id)
+    return version, facts
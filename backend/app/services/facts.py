@@ -1,4 +1,8 @@
-from sqlalchemy import select
+import uuid
+from collections import defaultdict
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.fact import Fact
@@ -8,3 +12,18 @@ async def get_facts_for_painting(session: AsyncSession, painting_id) -> list[Fac
     stmt = select(Fact).where(Fact.painting_id == painting_id).order_by(Fact.order_index)
     result = await session.execute(stmt)
     return list(result.scalars().all())
+
+
+async def get_facts_for_paintings(session: AsyncSession, painting_ids: list[uuid.UUID]) -> dict[uuid.UUID, list[Fact]]:
+    facts_by_painting: dict[uuid.UUID, list[Fact]] = defaultdict(list)
+    if not painting_ids:
+        return facts_by_painting
+    stmt = (
+        select(Fact)
+        .where(Fact.painting_id == any_(bindparam("painting_ids", painting_ids, type_=ARRAY(UUID))))
+        .order_by(Fact.painting_id, Fact.order_index)
+    )
+    result = await session.execute(stmt)
+    for fact in result.scalars():
+        facts_by_painting[fact.painting_id].append(fact)
+    return facts_by_painting
@@ -0,0 +1,59 @@
+import uuid
+
+import asyncpg
+from pydantic import TypeAdapter
+
+from app.schemas.fact import FactResponse
+from app.schemas.painting import PaintingResponse
+from app.services.paintings import FACTS_DIGEST_SQL, PaintingVersion
+
+# Plain $n statements so asyncpg prepares them once per connection and keeps
+# them in its statement cache.
+PAINTING_VERSION_SQL = f"""
+    SELECT p.id, p.updated_at, v.facts_updated_at, v.facts_digest
+    FROM paintings p
+    LEFT JOIN LATERAL (
+        SELECT max(f.updated_at) AS facts_updated_at, {FACTS_DIGEST_SQL} AS facts_digest
+        FROM facts f
+        WHERE f.painting_id = p.id
+    ) v ON true
+    WHERE p.id = $1
+"""
+
+PAINTING_SQL = """
+    SELECT id, name, artist_name, artist_slug, painting_slug, museum_name, genre_name,
+           image_url, source_url, license_name, license_url, facts_count,
+           image_sha256, image_width, image_height
+    FROM paintings
+    WHERE id = $1
+"""
+
+FACTS_SQL = """
+    SELECT id, painting_id, name, description_md, description_html, description_text,
+           geometry_type, x, y, w, h, order_index
+    FROM facts
+    WHERE painting_id = $1
+    ORDER BY order_index
+"""
+
+facts_adapter = TypeAdapter(list[FactResponse])
+
+
+async def fetch_painting_version(connection: asyncpg.Connection, painting_id: uuid.UUID) -> PaintingVersion | None:
+    record = await connection.fetchrow(PAINTING_VERSION_SQL, painting_id)
+    if record is None:
+        return None
+    return PaintingVersion(*record)
+
+
+async def fetch_painting(connection: asyncpg.Connection, painting_id: uuid.UUID) -> PaintingResponse | None:
+    record = await connection.fetchrow(PAINTING_SQL, painting_id)
+    if record is None:
+        return None
+    # Column types already match the schema, so skip validation entirely.
+    return PaintingResponse.model_construct(**record)
+
+
+async def fetch_facts(connection: asyncpg.Connection, painting_id: uuid.UUID) -> list[FactResponse]:
+    records = await connection.fetch(FACTS_SQL, painting_id)
+    return [FactResponse.model_construct(**record) for record in records]
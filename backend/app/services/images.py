@@ -0,0 +1,125 @@
+"""Deep-zoom tiles and thumbnails derived from painting originals.
+
+Derivatives live in a content-addressed directory keyed by the SHA-256 of the
+original bytes, so identical originals share one pyramid and a file, once
+written, never changes::
+
+    IMAGE_CACHE_DIR/
+        originals/<sha>
+        <sha[:2]>/<sha>/manifest.json
+                       image.dzi
+                       image_files/<level>/<col>_<row>.jpg
+                       thumbnails/<size>.jpg
+
+The layout follows Deep Zoom (DZI): level ``max_level`` is the full image, every
+level below halves it, down to a single pixel at level 0. Tile geometry and the
+manifest URLs are defined in ``app.schemas.image``.
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+from pathlib import Path
+
+from app.schemas.image import THUMBNAIL_SIZES, TILE_FORMAT, TILE_OVERLAP, TILE_SIZE, max_level
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - only the derivative builder needs Pillow
+    Image = None
+
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", "image_cache"))
+
+TILE_QUALITY = 85
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+DERIVATIVE_PATH_RE = re.compile(r"^(image\.dzi|image_files/\d+/\d+_\d+\.jpg|thumbnails/\d+\.jpg)$")
+
+
+def derivative_dir(sha256: str, cache_dir: Path = IMAGE_CACHE_DIR) -> Path:
+    return cache_dir / sha256[:2] / sha256
+
+
+def original_path(sha256: str, cache_dir: Path = IMAGE_CACHE_DIR) -> Path:
+    return cache_dir / "originals" / sha256
+
+
+def derivative_file(sha256: str, path: str, cache_dir: Path = IMAGE_CACHE_DIR) -> Path | None:
+    """Map a tiles URL path to a file, or ``None`` if it is not a derivative path."""
+    if not SHA256_RE.match(sha256) or not DERIVATIVE_PATH_RE.match(path):
+        return None
+    return derivative_dir(sha256, cache_dir) / path
+
+
+def _dzi(width: int, height: int) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" TileSize="{TILE_SIZE}" '
+        f'Overlap="{TILE_OVERLAP}" Format="{TILE_FORMAT}"><Size Width="{width}" Height="{height}"/></Image>\n'
+    )
+
+
+def _write_tiles(level_image, level_dir: Path) -> None:
+    level_dir.mkdir(parents=True)
+    width, height = level_image.size
+    for col in range(math.ceil(width / TILE_SIZE)):
+        for row in range(math.ceil(height / TILE_SIZE)):
+            left = max(col * TILE_SIZE - TILE_OVERLAP, 0)
+            top = max(row * TILE_SIZE - TILE_OVERLAP, 0)
+            right = min((col + 1) * TILE_SIZE + TILE_OVERLAP, width)
+            bottom = min((row + 1) * TILE_SIZE + TILE_OVERLAP, height)
+            tile = level_image.crop((left, top, right, bottom))
+            tile.save(level_dir / f"{col}_{row}.{TILE_FORMAT}", quality=TILE_QUALITY)
+
+
+def build_derivatives(sha256: str, cache_dir: Path = IMAGE_CACHE_DIR) -> tuple[int, int]:
+    """Build the tile pyramid and thumbnails for a stored original; returns ``(width, height)``.
+
+    Runs in a worker process. Output is assembled in a scratch directory and
+    renamed into place, so readers never see a half-written pyramid.
+    """
+    target = derivative_dir(sha256, cache_dir)
+    manifest_path = target / "manifest.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        return manifest["width"], manifest["height"]
+    if Image is None:
+        raise RuntimeError("Pillow is required to build image derivatives")
+
+    scratch = cache_dir / "tmp" / f"{sha256}.{os.getpid()}"
+    shutil.rmtree(scratch, ignore_errors=True)
+    try:
+        with Image.open(original_path(sha256, cache_dir)) as original:
+            image = original.convert("RGB")
+        width, height = image.size
+        top_level = max_level(width, height)
+
+        level_image = image
+        for level in range(top_level, -1, -1):
+            if level != top_level:
+                scale = 2 ** (top_level - level)
+                size = (max(math.ceil(width / scale), 1), max(math.ceil(height / scale), 1))
+                level_image = level_image.resize(size, Image.Resampling.LANCZOS)
+            _write_tiles(level_image, scratch / "image_files" / str(level))
+
+        (scratch / "thumbnails").mkdir()
+        for size in THUMBNAIL_SIZES:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+            thumbnail.save(scratch / "thumbnails" / f"{size}.{TILE_FORMAT}", quality=TILE_QUALITY)
+
+        (scratch / "image.dzi").write_text(_dzi(width, height))
+        (scratch / "manifest.json").write_text(json.dumps({"width": width, "height": height}))
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            scratch.rename(target)
+        except OSError:
+            # Another worker finished the same original first.
+            if not manifest_path.exists():
+                raise
+        return width, height
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
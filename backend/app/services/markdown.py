@@ -0,0 +1,69 @@
+"""Render fact descriptions once, when they are written.
+
+``description_md`` is rendered to sanitized HTML and a plain-text excerpt by the
+writers (``app.ingest``, ``app.seed``) and stored next to the source together
+with ``RENDER_VERSION``. Requests only read the stored columns. Bump
+``RENDER_VERSION`` whenever the output of :func:`render_description` changes and
+run ``python -m app.render_facts`` to re-render the stored rows.
+
+Sanitizing is done by the parser itself: raw HTML is escaped rather than passed
+through, and links with scripting schemes (``javascript:``, ``vbscript:``,
+``file:``, non-image ``data:``) are not turned into links. The dialect matches
+the frontend's ReactMarkdown setup: CommonMark with GFM tables and strikethrough,
+links opening in a new tab.
+"""
+
+from typing import NamedTuple
+
+from markdown_it import MarkdownIt
+
+RENDER_VERSION = 1
+EXCERPT_LENGTH = 200
+
+_markdown = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+
+def _render_link_open(self, tokens, idx, options, env):
+    tokens[idx].attrSet("target", "_blank")
+    tokens[idx].attrSet("rel", "noreferrer")
+    return self.renderToken(tokens, idx, options, env)
+
+
+_markdown.add_render_rule("link_open", _render_link_open)
+
+
+class RenderedDescription(NamedTuple):
+    html: str
+    text: str
+    version: int
+
+
+def _plain_text(tokens) -> str:
+    blocks = []
+    for token in tokens:
+        if token.type == "inline":
+            blocks.append("".join(
+                " " if child.type in ("softbreak", "hardbreak") else child.content
+                for child in token.children or ()
+                if child.type in ("text", "code_inline", "softbreak", "hardbreak")
+            ))
+        elif token.type in ("fence", "code_block"):
+            blocks.append(token.content)
+    return " ".join(" ".join(blocks).split())
+
+
+def excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    # Prefer a word boundary unless that would throw away most of the excerpt.
+    space = cut.rfind(" ")
+    if space >= length // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+def render_description(description_md: str) -> RenderedDescription:
+    tokens = _markdown.parse(description_md)
+    html = _markdown.renderer.render(tokens, _markdown.options, {})
+    return RenderedDescription(html, excerpt(_plain_text(tokens)), RENDER_VERSION)
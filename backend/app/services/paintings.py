@@ -1,38 +1,187 @@
-from sqlalchemy import select
+import uuid
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import Row, String, and_, any_, bindparam, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.painting import Painting
 from app.models.painting_alias import PaintingAlias
+from app.models.painting_genre import PaintingGenre
 
 
-async def get_painting_by_slugs(session: AsyncSession, artist_slug: str, painting_slug: str) -> Painting | None:
-    stmt = (
-        select(Painting)
-        .where(Painting.artist_slug == artist_slug, Painting.painting_slug == painting_slug)
-        .options(selectinload(Painting.facts))
-    )
+class PaintingVersion(NamedTuple):
+    painting_id: uuid.UUID
+    updated_at: datetime
+    facts_updated_at: datetime | None
+    facts_digest: str | None
+
+
+# Hash over the (id, updated_at) set of a painting's facts: changes on any fact
+# insert, update or delete. Served by an index-only scan of ix_facts_painting_order.
+FACTS_DIGEST_SQL = "md5(string_agg(f.id::text || '@' || extract(epoch FROM f.updated_at)::text, ',' ORDER BY f.id))"
+
+PAINTING_VERSION_SQL = text(
+    f"""
+    SELECT p.id, p.updated_at, v.facts_updated_at, v.facts_digest
+    FROM paintings p
+    LEFT JOIN LATERAL (
+        SELECT max(f.updated_at) AS facts_updated_at, {FACTS_DIGEST_SQL} AS facts_digest
+        FROM facts f
+        WHERE f.painting_id = p.id
+    ) v ON true
+    WHERE p.id = :painting_id
+    """
+)
+
+
+async def get_painting_version(session: AsyncSession, painting_id) -> PaintingVersion | None:
+    result = await session.execute(PAINTING_VERSION_SQL, {"painting_id": painting_id})
+    row = result.first()
+    if row is None:
+        return None
+    return PaintingVersion(*row)
+
+
+async def get_painting_by_id(session: AsyncSession, painting_id) -> Painting | None:
+    return await session.get(Painting, painting_id)
+
+
+async def get_paintings_by_ids(session: AsyncSession, painting_ids: list[uuid.UUID]) -> list[Painting]:
+    if not painting_ids:
+        return []
+    stmt = select(Painting).where(Painting.id == any_(bindparam("painting_ids", painting_ids, type_=ARRAY(UUID))))
     result = await session.execute(stmt)
-    return result.scalars().first()
+    return list(result.scalars().all())
 
 
-async def get_painting_by_alias_pair(session: AsyncSession, artist_slug: str, painting_slug: str) -> Painting | None:
-    stmt = (
-        select(Painting)
-        .join(PaintingAlias, PaintingAlias.painting_id == Painting.id)
-        .where(PaintingAlias.artist_slug == artist_slug, PaintingAlias.painting_slug == painting_slug)
-        .options(selectinload(Painting.facts))
+def _requested_pairs(pairs: list[tuple[str, str]]):
+    # Joining the requested pairs (not artist_slug = ANY(...) AND painting_slug = ANY(...),
+    # which matches their cross product) keeps the result to one row per pair.
+    return (
+        func.unnest(
+            bindparam("artist_slugs", [artist_slug for artist_slug, _ in pairs], type_=ARRAY(String)),
+            bindparam("painting_slugs", [painting_slug for _, painting_slug in pairs], type_=ARRAY(String)),
+        )
+        .table_valued("artist_slug", "painting_slug")
+        .render_derived(name="requested")
+    )
+
+
+async def get_paintings_by_slug_pairs(
+    session: AsyncSession, pairs: list[tuple[str, str]]
+) -> dict[tuple[str, str], Painting]:
+    if not pairs:
+        return {}
+    requested = _requested_pairs(pairs)
+    stmt = select(Painting).join(
+        requested,
+        and_(Painting.artist_slug == requested.c.artist_slug, Painting.painting_slug == requested.c.painting_slug),
     )
     result = await session.execute(stmt)
-    return result.scalars().first()
+    return {(painting.artist_slug, painting.painting_slug): painting for painting in result.scalars()}
 
 
-async def get_painting_by_combined_alias(session: AsyncSession, combined_slug: str) -> Painting | None:
+async def get_paintings_by_alias_pairs(
+    session: AsyncSession, pairs: list[tuple[str, str]]
+) -> dict[tuple[str, str], Painting]:
+    if not pairs:
+        return {}
+    requested = _requested_pairs(pairs)
     stmt = (
-        select(Painting)
-        .join(PaintingAlias, PaintingAlias.painting_id == Painting.id)
-        .where(PaintingAlias.combined_slug == combined_slug)
-        .options(selectinload(Painting.facts))
+        select(PaintingAlias.artist_slug, PaintingAlias.painting_slug, Painting)
+        .join(Painting, PaintingAlias.painting_id == Painting.id)
+        .join(
+            requested,
+            and_(
+                PaintingAlias.artist_slug == requested.c.artist_slug,
+                PaintingAlias.painting_slug == requested.c.painting_slug,
+            ),
+        )
     )
     result = await session.execute(stmt)
-    return result.scalars().first()
+    return {(artist_slug, painting_slug): painting for artist_slug, painting_slug, painting in result}
+
+
+async def browse_paintings(
+    session: AsyncSession,
+    limit: int,
+    artist_slug: str | None = None,
+    museum_name: str | None = None,
+    genre: str | None = None,
+    after: tuple[str, str] | None = None,
+) -> list[Painting]:
+    # A genre is walked through painting_genres, whose primary key is (genre, artist_slug,
+    # painting_slug): the keyset order comes from the index instead of sorting the genre.
+    order = PaintingGenre if genre is not None and artist_slug is None else Painting
+    stmt = select(Painting).order_by(order.artist_slug, order.painting_slug).limit(limit)
+    if artist_slug is not None:
+        stmt = stmt.where(Painting.artist_slug == artist_slug)
+    if museum_name is not None:
+        stmt = stmt.where(Painting.museum_name == museum_name)
+    if genre is not None:
+        stmt = stmt.join(PaintingGenre, PaintingGenre.painting_id == Painting.id).where(PaintingGenre.genre == genre)
+    if after is not None:
+        stmt = stmt.where(tuple_(order.artist_slug, order.painting_slug) > tuple_(*after))
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+BUNDLE_PAINTING_COLUMNS = (
+    "id", "name", "artist_name", "artist_slug", "painting_slug", "museum_name", "genre_name", "image_url",
+    "source_url", "license_name", "license_url", "facts_count", "image_sha256", "image_width", "image_height",
+)
+BUNDLE_FACT_COLUMNS = (
+    "id", "painting_id", "name", "description_md", "description_html", "description_text", "geometry_type",
+    "x", "y", "w", "h", "order_index",
+)
+
+# The caller has already resolved the slugs (usually from the slug cache), so the
+# bundle is one primary-key lookup joined to the painting's facts: one row per
+# fact (a single row with null fact columns for a painting without facts). The
+# rows are plain columns; PaintingBundleResponse does the only serialization.
+PAINTING_BUNDLE_SQL = text(
+    f"""
+    SELECT
+        {", ".join(f"p.{column}" for column in BUNDLE_PAINTING_COLUMNS)},
+        p.updated_at,
+        v.facts_updated_at,
+        v.facts_digest,
+        {", ".join(f"f.{column} AS fact_{column}" for column in BUNDLE_FACT_COLUMNS)}
+    FROM paintings p
+    LEFT JOIN LATERAL (
+        SELECT max(f.updated_at) AS facts_updated_at, {FACTS_DIGEST_SQL} AS facts_digest
+        FROM facts f
+        WHERE f.painting_id = p.id
+    ) v ON true
+    LEFT JOIN facts f ON f.painting_id = p.id
+    WHERE p.id = :painting_id
+    ORDER BY f.order_index
+    """
+)
+
+
+class PaintingBundle(NamedTuple):
+    version: PaintingVersion
+    painting: dict
+    facts: list[dict]
+
+
+def bundle_from_rows(rows) -> PaintingBundle | None:
+    if not rows:
+        return None
+    first = rows[0]._mapping
+    version = PaintingVersion(first["id"], first["updated_at"], first["facts_updated_at"], first["facts_digest"])
+    painting = {column: first[column] for column in BUNDLE_PAINTING_COLUMNS}
+    facts = [
+        {column: row._mapping[f"fact_{column}"] for column in BUNDLE_FACT_COLUMNS}
+        for row in rows
+        if row._mapping["fact_id"] is not None
+    ]
+    return PaintingBundle(version, painting, facts)
+
+
+async def get_painting_bundle(session: AsyncSession, painting_id: uuid.UUID) -> PaintingBundle | None:
+    result = await session.execute(PAINTING_BUNDLE_SQL, {"painting_id": painting_id})
+    return bundle_from_rows(result.all())
@@ -0,0 +1,302 @@
+"""Precomputed "related paintings", built offline and served by index lookup.
+
+``python -m app.related`` encodes every painting as a sparse tf-idf vector over
+its artist, genres, museum and the lexemes of its facts' ``search_vector``, and
+scores paintings against each other in batches with vectorized cosine
+similarity (an inverted index and ``np.bincount`` rather than a per-pair query).
+The top ``RELATED_TOP_K`` neighbours of each painting are stored in
+``painting_related`` (migration 20261018_0015), so the endpoint reads at most K
+rows by primary key.
+
+Incremental builds (the default) only redo paintings whose features changed
+since their list was built (``painting_related_state.features_digest``), new
+paintings, paintings whose list mentions a changed or deleted painting, and
+paintings a changed painting now outranks a stored neighbour of. Document
+frequencies still drift as the catalog grows, so run ``--full`` from time to time.
+"""
+
+import hashlib
+import os
+import uuid
+from collections.abc import Iterator
+from typing import NamedTuple
+
+import asyncpg
+import numpy as np
+from sqlalchemy import Row, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "12"))
+# Fact lexemes found in more than this share of paintings are treated as stop words.
+RELATED_MAX_DF = float(os.getenv("RELATED_MAX_DF", "0.2"))
+# Upper bound on the dense score block (query paintings x catalog) built per batch.
+RELATED_SCORE_CELLS = 8_000_000
+RELATED_WRITE_BATCH = 1000
+
+FIELD_WEIGHTS = {"artist": 3.0, "genre": 2.0, "museum": 1.0, "word": 1.0}
+
+RELATED_SQL = text(
+    """
+    SELECT p.id, p.name, p.artist_name, p.artist_slug, p.painting_slug, p.museum_name, p.genre_name,
+           p.image_url, p.source_url, p.license_name, p.license_url, p.facts_count,
+           p.image_sha256, p.image_width, p.image_height, r.score
+    FROM painting_related r
+    JOIN paintings p ON p.id = r.related_id
+    WHERE r.painting_id = :painting_id
+    ORDER BY r.position
+    LIMIT :limit
+    """
+)
+
+FEATURES_SQL = """
+    SELECT p.id, p.artist_slug, p.museum_name, p.genre_name, w.words
+    FROM paintings p
+    LEFT JOIN LATERAL (
+        SELECT array_agg(DISTINCT l.lexeme) AS words
+        FROM facts f, unnest(f.search_vector) AS l
+        WHERE f.painting_id = p.id
+    ) w ON true
+    ORDER BY p.id
+"""
+
+STATE_SQL = """
+    SELECT s.painting_id, s.features_digest, s.related_count, count(r.position) AS stored_count
+    FROM painting_related_state s
+    LEFT JOIN painting_related r ON r.painting_id = s.painting_id
+    GROUP BY s.painting_id
+"""
+
+REFERENCING_SQL = "SELECT DISTINCT painting_id FROM painting_related WHERE related_id = ANY($1::uuid[])"
+
+WEAKEST_SQL = """
+    SELECT painting_id, count(*) AS related_count, min(score) AS min_score
+    FROM painting_related
+    WHERE painting_id = ANY($1::uuid[])
+    GROUP BY painting_id
+"""
+
+UPSERT_STATE_SQL = """
+    INSERT INTO painting_related_state (painting_id, features_digest, related_count, built_at)
+    SELECT id, digest, related_count, now()
+    FROM unnest($1::uuid[], $2::text[], $3::smallint[]) AS s(id, digest, related_count)
+    ON CONFLICT (painting_id) DO UPDATE
+    SET features_digest = excluded.features_digest,
+        related_count = excluded.related_count,
+        built_at = excluded.built_at
+"""
+
+
+async def get_related_paintings(session: AsyncSession, painting_id: uuid.UUID, limit: int) -> list[Row]:
+    result = await session.execute(RELATED_SQL, {"painting_id": painting_id, "limit": limit})
+    return list(result.all())
+
+
+def painting_tokens(
+    artist_slug: str, museum_name: str | None, genres: list[str] | None, words: list[str] | None
+) -> list[str]:
+    tokens = [f"artist:{artist_slug}"]
+    tokens += [f"genre:{genre}" for genre in genres or ()]
+    if museum_name:
+        tokens.append(f"museum:{museum_name}")
+    tokens += [f"word:{word}" for word in words or ()]
+    return sorted(set(tokens))
+
+
+def features_digest(tokens: list[str]) -> str:
+    return hashlib.md5("\n".join(tokens).encode()).hexdigest()
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenate ``arange(start, start + count)`` for every pair, without a Python loop."""
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+
+class RelatedIndex:
+    """L2-normalized tf-idf rows in CSR form plus the same entries as posting lists."""
+
+    def __init__(self, token_rows: list[list[str]], max_df: float = RELATED_MAX_DF):
+        vocabulary: dict[str, int] = {}
+        counts = np.fromiter((len(tokens) for tokens in token_rows), dtype=np.int64, count=len(token_rows))
+        indices = np.fromiter(
+            (vocabulary.setdefault(token, len(vocabulary)) for tokens in token_rows for token in tokens),
+            dtype=np.int64,
+            count=int(counts.sum()),
+        )
+        self.size = n = len(token_rows)
+        rows = np.repeat(np.arange(n), counts)
+
+        df = np.bincount(indices, minlength=len(vocabulary))
+        idf = np.log((1 + n) / (1 + df)) + 1
+        field_weight = np.array([FIELD_WEIGHTS[token.partition(":")[0]] for token in vocabulary])
+        stop_words = np.array([token.startswith("word:") for token in vocabulary], dtype=bool) & (df > max_df * n)
+        keep = ~stop_words[indices]
+        indices, rows = indices[keep], rows[keep]
+        values = (field_weight * idf)[indices]
+        norms = np.sqrt(np.bincount(rows, values * values, minlength=n))
+        values = values / norms[rows]
+
+        # A token only one painting has adds to its norm but can never match another painting.
+        shared = df[indices] > 1
+        indices, rows, values = indices[shared], rows[shared], values[shared]
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        self.indices = indices
+        self.values = values
+
+        order = np.argsort(indices, kind="stable")
+        self.posting_rows = rows[order]
+        self.posting_values = values[order]
+        self.posting_ptr = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=len(vocabulary)))))
+
+    def scores(self, rows: np.ndarray) -> np.ndarray:
+        """Cosine similarity of ``rows`` against every painting, as a ``len(rows) x size`` block."""
+        starts = self.indptr[rows]
+        counts = self.indptr[rows + 1] - starts
+        entries = _ranges(starts, counts)
+        query = np.repeat(np.arange(len(rows)), counts)
+        tokens = self.indices[entries]
+
+        posting_starts = self.posting_ptr[tokens]
+        lengths = self.posting_ptr[tokens + 1] - posting_starts
+        postings = _ranges(posting_starts, lengths)
+        cells = np.repeat(query, lengths) * self.size + self.posting_rows[postings]
+        products = np.repeat(self.values[entries], lengths) * self.posting_values[postings]
+        scores = np.bincount(cells, products, minlength=len(rows) * self.size).reshape(len(rows), self.size)
+        scores[np.arange(len(rows)), rows] = 0.0
+        return scores
+
+    def top_k(self, rows: np.ndarray, k: int) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
+        """Yield ``(row, neighbour rows, scores)`` best first, in batches bounded by ``RELATED_SCORE_CELLS``."""
+        k = min(k, self.size - 1)
+        batch = max(1, RELATED_SCORE_CELLS // max(self.size, 1))
+        for start in range(0, len(rows), batch):
+            chunk = rows[start : start + batch]
+            if k <= 0:
+                for row in chunk:
+                    yield int(row), np.empty(0, dtype=np.int64), np.empty(0)
+                continue
+            scores = self.scores(chunk)
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            for row, neighbours, neighbour_scores in zip(chunk, best, best_scores):
+                matched = neighbour_scores > 0
+                yield int(row), neighbours[matched], neighbour_scores[matched]
+
+
+class RelatedBuildStats(NamedTuple):
+    paintings: int
+    rebuilt: int
+    rows: int
+
+
+async def _write(
+    connection: asyncpg.Connection,
+    ids: list[uuid.UUID],
+    digests: list[str],
+    results: list[tuple[int, np.ndarray, np.ndarray]],
+) -> int:
+    painting_ids = [ids[row] for row, _, _ in results]
+    records = [
+        (ids[row], position, ids[neighbour], float(score))
+        for row, neighbours, scores in results
+        for position, (neighbour, score) in enumerate(zip(neighbours, scores))
+    ]
+    async with connection.transaction():
+        await connection.execute("DELETE FROM painting_related WHERE painting_id = ANY($1::uuid[])", painting_ids)
+        if records:
+            await connection.copy_records_to_table(
+                "painting_related", records=records, columns=["painting_id", "position", "related_id", "score"]
+            )
+        await connection.execute(
+            UPSERT_STATE_SQL,
+            painting_ids,
+            [digests[row] for row, _, _ in results],
+            [len(neighbours) for _, neighbours, _ in results],
+        )
+    return len(records)
+
+
+async def _build(
+    connection: asyncpg.Connection,
+    index: RelatedIndex,
+    rows: np.ndarray,
+    k: int,
+    ids: list[uuid.UUID],
+    digests: list[str],
+    changed: set[int],
+    outranked: dict[int, float],
+) -> tuple[int, int]:
+    """Rebuild and store the lists of ``rows``; note the best score each ``changed`` row gives its neighbours."""
+    rebuilt = written = 0
+    results: list[tuple[int, np.ndarray, np.ndarray]] = []
+    for result in index.top_k(rows, k):
+        row, neighbours, scores = result
+        if row in changed:
+            for neighbour, score in zip(neighbours.tolist(), scores.tolist()):
+                outranked[neighbour] = max(outranked.get(neighbour, 0.0), score)
+        results.append(result)
+        if len(results) >= RELATED_WRITE_BATCH:
+            written += await _write(connection, ids, digests, results)
+            rebuilt += len(results)
+            results = []
+    if results:
+        written += await _write(connection, ids, digests, results)
+        rebuilt += len(results)
+    return rebuilt, written
+
+
+async def build_related(
+    connection: asyncpg.Connection, full: bool = False, k: int = RELATED_TOP_K
+) -> RelatedBuildStats:
+    features = await connection.fetch(FEATURES_SQL)
+    ids = [row["id"] for row in features]
+    token_rows = [
+        painting_tokens(row["artist_slug"], row["museum_name"], row["genre_name"], row["words"]) for row in features
+    ]
+    digests = [features_digest(tokens) for tokens in token_rows]
+    index = RelatedIndex(token_rows)
+    positions = {painting_id: row for row, painting_id in enumerate(ids)}
+
+    changed: set[int] = set()
+    if full:
+        targets = set(range(len(ids)))
+    else:
+        state = {row["painting_id"]: row for row in await connection.fetch(STATE_SQL)}
+        changed = {
+            row
+            for row, painting_id in enumerate(ids)
+            if painting_id not in state or state[painting_id]["features_digest"] != digests[row]
+        }
+        # Fewer stored rows than were built: a neighbour was deleted and its rows cascaded away.
+        stale = {pid for pid, row in state.items() if row["stored_count"] < row["related_count"]}
+        referencing = await connection.fetch(REFERENCING_SQL, [ids[row] for row in changed])
+        stale.update(row["painting_id"] for row in referencing)
+        # Paintings deleted since the features were read have no position and need no list.
+        targets = changed | {positions[pid] for pid in stale if pid in positions}
+
+    outranked: dict[int, float] = {}
+    rebuilt, written = await _build(
+        connection, index, np.array(sorted(targets), dtype=np.int64), k, ids, digests, changed, outranked
+    )
+
+    # A changed painting may now belong in the lists of its own neighbours.
+    candidates = [row for row in outranked if row not in targets]
+    if candidates:
+        weakest = {
+            positions[row["painting_id"]]: row
+            for row in await connection.fetch(WEAKEST_SQL, [ids[row] for row in candidates])
+        }
+        more = [
+            row
+            for row in candidates
+            if row not in weakest or weakest[row]["related_count"] < k or weakest[row]["min_score"] < outranked[row]
+        ]
+        more_rebuilt, more_written = await _build(
+            connection, index, np.array(sorted(more), dtype=np.int64), k, ids, digests, set(), {}
+        )
+        rebuilt += more_rebuilt
+        written += more_written
+    return RelatedBuildStats(len(ids), rebuilt, written)
@@ -0,0 +1,67 @@
+import uuid
+from typing import NamedTuple
+
+from sqlalchemy import false, literal_column, select, true, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.painting import Painting
+from app.models.painting_alias import PaintingAlias
+
+
+class SlugResolution(NamedTuple):
+    painting_id: uuid.UUID
+    artist_slug: str
+    painting_slug: str
+    is_redirect: bool
+
+
+async def resolve_slugs(
+    session: AsyncSession,
+    artist_slug: str | None = None,
+    painting_slug: str | None = None,
+    combined_slug: str | None = None,
+) -> SlugResolution | None:
+    # Aliases point at painting ids rather than at other slugs, so joining the
+    # winning candidate back to paintings always yields the current canonical
+    # pair: however many times a painting was renamed, the client gets one 301.
+    candidates = []
+    if artist_slug is not None and painting_slug is not None:
+        candidates.append(
+            select(
+                Painting.id.label("painting_id"),
+                false().label("is_redirect"),
+                literal_column("0").label("priority"),
+            ).where(Painting.artist_slug == artist_slug, Painting.painting_slug == painting_slug)
+        )
+        candidates.append(
+            select(
+                PaintingAlias.painting_id.label("painting_id"),
+                true().label("is_redirect"),
+                literal_column("1").label("priority"),
+            ).where(
+                PaintingAlias.artist_slug == artist_slug, PaintingAlias.painting_slug == painting_slug
+            )
+        )
+    if combined_slug is not None:
+        candidates.append(
+            select(
+                PaintingAlias.painting_id.label("painting_id"),
+                true().label("is_redirect"),
+                literal_column("2").label("priority"),
+            ).where(PaintingAlias.combined_slug == combined_slug)
+        )
+    if not candidates:
+        return None
+
+    candidate = union_all(*candidates).subquery("candidate")
+    stmt = (
+        select(Painting.id, Painting.artist_slug, Painting.painting_slug, candidate.c.is_redirect)
+        .join(candidate, candidate.c.painting_id == Painting.id)
+        .order_by(candidate.c.priority)
+        .limit(1)
+    )
+    result = await session.execute(stmt)
+    row = result.first()
+    if row is None:
+        return None
+    return SlugResolution(*row)
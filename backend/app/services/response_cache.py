@@ -0,0 +1,180 @@
+import gzip
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi import Response
+
+from app.http_cache import Validators, parse_quality_list
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Upper bound on staleness should a painting_content notification be lost.
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+# Bodies smaller than this are not worth compressing.
+RESPONSE_CACHE_MIN_COMPRESS_BYTES = int(os.getenv("RESPONSE_CACHE_MIN_COMPRESS_BYTES", "512"))
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    weights = parse_quality_list(accept_encoding)
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if weights.get(coding, weights.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CachedResponse:
+    __slots__ = ("key", "painting_id", "validators", "media_type", "vary", "variants", "size", "expires_at")
+
+    def __init__(
+        self,
+        key: tuple,
+        painting_id: uuid.UUID,
+        body: bytes,
+        validators: Validators,
+        media_type: str,
+        vary: str,
+        expires_at: float,
+    ):
+        self.key = key
+        self.painting_id = painting_id
+        self.validators = validators
+        self.media_type = media_type
+        self.vary = vary
+        self.variants = {"identity": body}
+        self.size = len(body)
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """Serialized response bodies keyed by (representation, painting id).
+
+    Entries are trusted until a painting_content notification drops them or
+    ``ttl`` seconds pass, so a hit needs neither the database nor Pydantic and
+    a missed notification costs at most ``ttl`` of staleness. Compressed
+    variants are built lazily, the first time a client asks for that encoding,
+    and carry their own ETags.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.generation = 0
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self._keys_by_painting: dict[uuid.UUID, set[tuple]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: tuple,
+        painting_id: uuid.UUID,
+        body: bytes,
+        validators: Validators,
+        generation: int,
+        media_type: str = "application/json",
+        vary: str = "Accept-Encoding",
+    ) -> CachedResponse:
+        entry = CachedResponse(key, painting_id, body, validators, media_type, vary, time.monotonic() + self.ttl)
+        # Never let one huge painting flush the whole cache.
+        if generation != self.generation or entry.size > self.max_bytes // 8:
+            return entry
+        self._remove(key)
+        self._entries[key] = entry
+        self._keys_by_painting.setdefault(painting_id, set()).add(key)
+        self.size += entry.size
+        self._evict()
+        return entry
+
+    def coding(self, entry: CachedResponse, accept_encoding: str | None) -> str:
+        if len(entry.variants["identity"]) < RESPONSE_CACHE_MIN_COMPRESS_BYTES:
+            return "identity"
+        return negotiate_encoding(accept_encoding)
+
+    def response(self, entry: CachedResponse, coding: str) -> Response:
+        body = entry.variants.get(coding)
+        if body is None:
+            body = compress(entry.variants["identity"], coding)
+            entry.variants[coding] = body
+            if self._entries.get(entry.key) is entry:
+                entry.size += len(body)
+                self.size += len(body)
+                self._evict()
+        headers = {**entry.validators.encoded(coding).headers, "Vary": entry.vary}
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(content=body, media_type=entry.media_type, headers=headers)
+
+    def invalidate(self, payload: str | None = None) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        if payload is None or payload == "*":
+            self._entries.clear()
+            self._keys_by_painting.clear()
+            self.size = 0
+            return
+        for key in self._keys_by_painting.pop(uuid.UUID(payload), set()):
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry.size
+        keys = self._keys_by_painting.get(entry.painting_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_painting[entry.painting_id]
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS)
@@ -0,0 +1,129 @@
+import os
+import uuid
+from typing import NamedTuple
+
+from sqlalchemy import Row, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.painting import Painting
+from app.services.paintings import get_paintings_by_ids
+
+# Upper bound on the matches per source that are ranked at all. Scoring is the
+# expensive part, so a very common term ranks an arbitrary subset of its matches
+# instead of every one of them.
+SEARCH_MATCH_LIMIT = int(os.getenv("SEARCH_MATCH_LIMIT", "10000"))
+# Upper bound on the best-ranked matches per source that are merged into the
+# final ranking.
+SEARCH_CANDIDATE_LIMIT = int(os.getenv("SEARCH_CANDIDATE_LIMIT", "2000"))
+SEARCH_FACTS_PER_PAINTING = int(os.getenv("SEARCH_FACTS_PER_PAINTING", "3"))
+
+QUERY_CTE = """
+    query AS (
+        SELECT websearch_to_tsquery('russian', :q) || websearch_to_tsquery('simple', :q) AS tsq
+    )
+"""
+
+RANK_SQL = text(
+    f"""
+    WITH {QUERY_CTE},
+    painting_matches AS (
+        SELECT p.id, p.name, p.artist_name, p.search_vector
+        FROM paintings p, query
+        WHERE p.search_vector @@ query.tsq OR p.name % :q OR p.artist_name % :q
+        LIMIT :matches
+    ),
+    painting_hits AS (
+        SELECT pm.id AS painting_id,
+               ts_rank_cd(pm.search_vector, query.tsq) AS text_rank,
+               greatest(similarity(pm.name, :q), similarity(pm.artist_name, :q)) AS fuzzy_rank
+        FROM painting_matches pm, query
+        ORDER BY text_rank + fuzzy_rank DESC
+        LIMIT :candidates
+    ),
+    fact_matches AS (
+        SELECT f.painting_id, f.search_vector
+        FROM facts f, query
+        WHERE f.search_vector @@ query.tsq
+        LIMIT :matches
+    ),
+    fact_candidates AS (
+        SELECT fm.painting_id, ts_rank_cd(fm.search_vector, query.tsq) AS fact_rank
+        FROM fact_matches fm, query
+        ORDER BY fact_rank DESC
+        LIMIT :candidates
+    ),
+    fact_hits AS (
+        SELECT painting_id, max(fact_rank) AS fact_rank
+        FROM fact_candidates
+        GROUP BY painting_id
+    )
+    SELECT coalesce(ph.painting_id, fh.painting_id) AS painting_id,
+           coalesce(ph.text_rank, 0) + coalesce(ph.fuzzy_rank, 0) + 0.5 * coalesce(fh.fact_rank, 0) AS score
+    FROM painting_hits ph
+    FULL OUTER JOIN fact_hits fh ON fh.painting_id = ph.painting_id
+    ORDER BY score DESC
+    LIMIT :limit
+    """
+)
+
+# Snippets are HTML with <mark> around matches, so the Markdown source is
+# HTML-escaped before it is highlighted; raw HTML in a description never
+# reaches a client that renders the snippet.
+ESCAPED_DESCRIPTION = (
+    "replace(replace(replace(replace(f.description_md, '&', '&amp;'), '<', '&lt;'), '>', '&gt;'), '\"', '&quot;')"
+)
+
+# Headlines are the expensive part of full-text search, so they are only built
+# for the facts of the final page of results.
+FACT_MATCHES_SQL = text(
+    f"""
+    WITH {QUERY_CTE}
+    SELECT painting_id, id, name, order_index, snippet
+    FROM (
+        SELECT f.painting_id, f.id, f.name, f.order_index,
+               ts_headline(
+                   'russian', {ESCAPED_DESCRIPTION}, query.tsq,
+                   'StartSel=<mark>, StopSel=</mark>, MaxWords=24, MinWords=8, MaxFragments=1'
+               ) AS snippet,
+               row_number() OVER (
+                   PARTITION BY f.painting_id ORDER BY ts_rank_cd(f.search_vector, query.tsq) DESC, f.order_index
+               ) AS position
+        FROM facts f, query
+        WHERE f.painting_id = ANY(:painting_ids) AND f.search_vector @@ query.tsq
+    ) ranked
+    WHERE position <= :per_painting
+    ORDER BY painting_id, position
+    """
+)
+
+
+class SearchHit(NamedTuple):
+    painting: Painting
+    score: float
+    facts: list[Row]
+
+
+async def search_paintings(session: AsyncSession, query: str, limit: int) -> list[SearchHit]:
+    result = await session.execute(
+        RANK_SQL,
+        {"q": query, "matches": SEARCH_MATCH_LIMIT, "candidates": SEARCH_CANDIDATE_LIMIT, "limit": limit},
+    )
+    ranked = result.all()
+    if not ranked:
+        return []
+
+    painting_ids: list[uuid.UUID] = [row.painting_id for row in ranked]
+    paintings = {painting.id: painting for painting in await get_paintings_by_ids(session, painting_ids)}
+    result = await session.execute(
+        FACT_MATCHES_SQL,
+        {"q": query, "painting_ids": painting_ids, "per_painting": SEARCH_FACTS_PER_PAINTING},
+    )
+    facts: dict[uuid.UUID, list[Row]] = {}
+    for row in result:
+        facts.setdefault(row.painting_id, []).append(row)
+
+    return [
+        SearchHit(paintings[row.painting_id], float(row.score), facts.get(row.painting_id, []))
+        for row in ranked
+        if row.painting_id in paintings
+    ]
@@ -0,0 +1,93 @@
+"""Coalesce concurrent identical lookups into one in-flight database query.
+
+When a cache entry is missing (a cold start, an invalidation, a painting that
+just went viral), every request for it would otherwise run the same queries on
+its own pooled connection. ``SingleFlight.do(key, load)`` runs ``load`` for the
+first caller only; callers that arrive while it is running wait for its result,
+or its exception, instead of querying.
+
+Waiters give up after ``SINGLEFLIGHT_TIMEOUT`` seconds with ``SingleFlightTimeout``
+(served as 503). If the leading request is cancelled, say because its client
+went away, one of the waiters takes over and runs the load itself.
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", "10"))
+
+T = TypeVar("T")
+
+
+class SingleFlightTimeout(Exception):
+    """A waiter gave up on an in-flight load."""
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+
+class SingleFlight:
+    def __init__(self, name: str, timeout: float = SINGLEFLIGHT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        self.waiting = 0
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        while (flight := self._flights.get(key)) is not None:
+            self.coalesced += 1
+            self.waiting += 1
+            try:
+                # shield: a waiter timing out must not cancel the shared future.
+                return await asyncio.wait_for(asyncio.shield(flight), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise SingleFlightTimeout(f"{self.name} lookup did not finish in {self.timeout}s") from None
+            except _LeaderCancelled:
+                continue
+            finally:
+                self.waiting -= 1
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self.leaders += 1
+        try:
+            result = await load()
+        except Exception as exc:
+            self.errors += 1
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+            if not flight.done():
+                # Cancelled (or interrupted): a waiter runs the load instead.
+                flight.set_exception(_LeaderCancelled())
+            # Mark the exception retrieved, so a flight nobody joined is not logged.
+            flight.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "waiting": self.waiting,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+slug_flight = SingleFlight("slug")
+response_flight = SingleFlight("response")
+spatial_flight = SingleFlight("spatial")
+
+flights = (slug_flight, response_flight, spatial_flight)
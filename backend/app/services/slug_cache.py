@@ -0,0 +1,98 @@
+import os
+import time
+from collections import OrderedDict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.resolver import SlugResolution, resolve_slugs
+from app.services.singleflight import slug_flight
+
+SLUG_CACHE_MAX_ENTRIES = int(os.getenv("SLUG_CACHE_MAX_ENTRIES", "100000"))
+SLUG_CACHE_TTL_SECONDS = float(os.getenv("SLUG_CACHE_TTL_SECONDS", "300"))
+SLUG_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("SLUG_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+
+MISSING = object()
+
+
+class SlugCache:
+    def __init__(self, max_entries: int, ttl: float, negative_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.generation = 0
+        self._entries: OrderedDict[tuple, tuple[float, SlugResolution | None]] = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: tuple, value: SlugResolution | None, generation: int) -> None:
+        # A write that raced with an invalidation may carry a stale mapping.
+        if generation != self.generation or self.max_entries <= 0:
+            return
+        ttl = self.ttl if value is not None else self.negative_ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, _payload: str | None = None) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+slug_cache = SlugCache(SLUG_CACHE_MAX_ENTRIES, SLUG_CACHE_TTL_SECONDS, SLUG_CACHE_NEGATIVE_TTL_SECONDS)
+
+
+async def _resolve(session: AsyncSession, key: tuple, **slugs) -> SlugResolution | None:
+    cached = slug_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    async def load() -> SlugResolution | None:
+        generation = slug_cache.generation
+        resolution = await resolve_slugs(session, **slugs)
+        slug_cache.set(key, resolution, generation)
+        return resolution
+
+    return await slug_flight.do(key, load)
+
+
+async def resolve_painting_pair(session: AsyncSession, artist_slug: str, painting_slug: str) -> SlugResolution | None:
+    key = ("pair", artist_slug, painting_slug)
+    return await _resolve(session, key, artist_slug=artist_slug, painting_slug=painting_slug)
+
+
+async def resolve_combined_slug(session: AsyncSession, combined_slug: str) -> SlugResolution | None:
+    return await _resolve(session, ("combined", combined_slug), combined_slug=combined_slug)
@@ -0,0 +1,244 @@
+"""Memory-mapped catalog snapshot for serving reads without Postgres.
+
+``python -m app.snapshot`` writes the file; with ``SNAPSHOT_PATH`` set, the API
+answers ``read_painting``, ``read_painting_bundle`` (JSON), ``redirect_combined_slug``
+and ``read_facts`` from it and falls back to the database for keys it does not contain. Writes reach the
+snapshot only through a new export.
+
+Layout (little-endian)::
+
+    header   magic b"AXSNAP01", entry count u32, slot count u32,
+             index offset u64, created_at f64
+    records  key bytes followed by value bytes, back to back
+    index    slot count x (hash u64, record offset u64, key length u16,
+             kind u16, value length u32); open addressing, linear probing,
+             hash 0 marks an empty slot
+
+Keys are ``p:<artist>/<painting>`` (canonical pair), ``b:<artist>/<painting>``
+(bundle), ``a:<artist>/<painting>`` (pair alias), ``c:<combined>`` (combined
+alias) and ``f:<painting id>`` (facts). Painting, bundle and facts values start with the response validators (last-modified
+epoch seconds as i64, 40-byte ETag digest) followed by the exact JSON body the
+database path would send; redirect values are the 16-byte painting id followed
+by ``<artist>/<painting>``.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+from fastapi import Response
+
+from app.http_cache import Validators
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "")
+# How often a request may stat the file to notice a swapped snapshot.
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv("SNAPSHOT_CHECK_INTERVAL", "1"))
+
+MAGIC = b"AXSNAP01"
+HEADER = struct.Struct("<8sIIQd")
+SLOT = struct.Struct("<QQHHI")
+VALIDATORS = struct.Struct("<q40s")
+REDIRECT_ID = struct.Struct("<16s")
+
+PAINTING = 1
+FACTS = 2
+REDIRECT = 3
+BUNDLE = 4
+
+
+def _hash(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+def pack_validated(validators: Validators, body: bytes) -> bytes:
+    return VALIDATORS.pack(int(validators.last_modified.timestamp()), validators.etag.strip('"').encode()) + body
+
+
+def pack_redirect(painting_id: uuid.UUID, artist_slug: str, painting_slug: str) -> bytes:
+    return REDIRECT_ID.pack(painting_id.bytes) + f"{artist_slug}/{painting_slug}".encode()
+
+
+class SnapshotWriter:
+    """Appends records to a scratch file and swaps it into place on ``commit``."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.scratch = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._file = self.scratch.open("wb")
+        self._file.write(b"\0" * HEADER.size)
+        self._offset = HEADER.size
+        self._entries: list[tuple[int, int, int, int, int]] = []
+
+    def add(self, key: str, kind: int, value: bytes) -> None:
+        key_bytes = key.encode()
+        self._file.write(key_bytes)
+        self._file.write(value)
+        self._entries.append((_hash(key_bytes), self._offset, len(key_bytes), kind, len(value)))
+        self._offset += len(key_bytes) + len(value)
+
+    def commit(self) -> int:
+        # Keep the load factor at or below one half so probes stay short.
+        slot_count = 1
+        while slot_count < 2 * len(self._entries):
+            slot_count *= 2
+        slots: list[tuple | None] = [None] * slot_count
+        mask = slot_count - 1
+        for entry in self._entries:
+            i = entry[0] & mask
+            while slots[i] is not None:
+                i = (i + 1) & mask
+            slots[i] = entry
+        empty = SLOT.pack(0, 0, 0, 0, 0)
+        self._file.write(b"".join(empty if slot is None else SLOT.pack(*slot) for slot in slots))
+
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, len(self._entries), slot_count, self._offset, time.time()))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        # Readers holding the old file keep their mapping; new opens see the new file.
+        os.replace(self.scratch, self.path)
+        return len(self._entries)
+
+    def abort(self) -> None:
+        self._file.close()
+        self.scratch.unlink(missing_ok=True)
+
+
+class SnapshotEntry(NamedTuple):
+    validators: Validators
+    body: memoryview
+
+
+class Snapshot:
+    def __init__(self, path: Path):
+        with path.open("rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.entries, self.slot_count, self.index_offset, self.created_at = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        index_end = self.index_offset + self.slot_count * SLOT.size
+        if self.slot_count & (self.slot_count - 1) or index_end > len(self._mmap):
+            raise ValueError(f"{path} is truncated")
+        self._view = memoryview(self._mmap)
+
+    def lookup(self, key: str) -> tuple[int, memoryview] | None:
+        key_bytes = key.encode()
+        key_hash = _hash(key_bytes)
+        mask = self.slot_count - 1
+        i = key_hash & mask
+        while True:
+            slot_hash, offset, key_length, kind, value_length = SLOT.unpack_from(
+                self._mmap, self.index_offset + i * SLOT.size
+            )
+            if slot_hash == 0:
+                return None
+            if slot_hash == key_hash and self._view[offset : offset + key_length] == key_bytes:
+                start = offset + key_length
+                return kind, self._view[start : start + value_length]
+            i = (i + 1) & mask
+
+    def _validated(self, key: str) -> SnapshotEntry | None:
+        found = self.lookup(key)
+        if found is None:
+            return None
+        last_modified, digest = VALIDATORS.unpack_from(found[1])
+        validators = Validators(
+            etag=f'"{digest.decode()}"', last_modified=datetime.fromtimestamp(last_modified, timezone.utc)
+        )
+        return SnapshotEntry(validators, found[1][VALIDATORS.size :])
+
+    def _redirect(self, key: str) -> tuple[str, str] | None:
+        found = self.lookup(key)
+        if found is None:
+            return None
+        artist_slug, _, painting_slug = bytes(found[1][REDIRECT_ID.size :]).decode().partition("/")
+        return artist_slug, painting_slug
+
+    def painting(self, artist_slug: str, painting_slug: str) -> SnapshotEntry | None:
+        return self._validated(f"p:{artist_slug}/{painting_slug}")
+
+    def bundle(self, artist_slug: str, painting_slug: str) -> SnapshotEntry | None:
+        return self._validated(f"b:{artist_slug}/{painting_slug}")
+
+    def facts(self, painting_id: uuid.UUID) -> SnapshotEntry | None:
+        return self._validated(f"f:{painting_id}")
+
+    def pair_redirect(self, artist_slug: str, painting_slug: str) -> tuple[str, str] | None:
+        return self._redirect(f"a:{artist_slug}/{painting_slug}")
+
+    def combined_redirect(self, combined_slug: str) -> tuple[str, str] | None:
+        return self._redirect(f"c:{combined_slug}")
+
+
+class SnapshotStore:
+    """Holds the current snapshot and reopens it when the file is replaced."""
+
+    def __init__(self, path: str):
+        self.path = Path(path) if path else None
+        self._snapshot: Snapshot | None = None
+        self._identity: tuple[int, int] | None = None
+        self._checked_at = 0.0
+        self.swaps = 0
+        self.errors = 0
+
+    def current(self) -> Snapshot | None:
+        if self.path is None:
+            return None
+        now = time.monotonic()
+        if now - self._checked_at >= SNAPSHOT_CHECK_INTERVAL:
+            self._checked_at = now
+            self._reload()
+        return self._snapshot
+
+    def _reload(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._snapshot, self._identity = None, None
+            return
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        if identity == self._identity:
+            return
+        # A file that cannot be opened is not retried until it changes again;
+        # until then the previous snapshot (if any) keeps serving.
+        self._identity = identity
+        try:
+            snapshot = Snapshot(self.path)
+        except (OSError, ValueError, struct.error):
+            self.errors += 1
+            logger.exception("Ignoring unreadable snapshot %s; keeping the previous one", self.path)
+            return
+        # The previous mapping is not closed: in-flight responses may still be
+        # sending slices of it, and it is unmapped once they are gone.
+        self._snapshot = snapshot
+        self.swaps += 1
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "path": str(self.path) if self.path else None,
+            "entries": snapshot.entries if snapshot else 0,
+            "created_at": snapshot.created_at if snapshot else None,
+            "swaps": self.swaps,
+            "errors": self.errors,
+        }
+
+
+class SnapshotResponse(Response):
+    """Sends a slice of the mapped file as the body without copying it."""
+
+    def render(self, content) -> memoryview:
+        return content
+
+
+snapshot_store = SnapshotStore(SNAPSHOT_PATH)
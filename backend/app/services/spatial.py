@@ -0,0 +1,157 @@
+import os
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.fact import Fact
+from app.models.painting import Painting
+from app.services.facts import get_facts_for_painting
+from app.services.singleflight import spatial_flight
+
+SPATIAL_CACHE_MAX_PAINTINGS = int(os.getenv("SPATIAL_CACHE_MAX_PAINTINGS", "256"))
+# Paintings with fewer facts are answered by the GiST index; only annotation-heavy
+# paintings are worth keeping in memory.
+SPATIAL_CACHE_MIN_FACTS = int(os.getenv("SPATIAL_CACHE_MIN_FACTS", "200"))
+
+# Cached in place of an index for paintings below SPATIAL_CACHE_MIN_FACTS, so their
+# reads go straight to the GiST index without re-checking facts_count.
+SMALL_PAINTING = object()
+
+FACT_BOX = func.box(func.point(Fact.x, Fact.y), func.point(Fact.x + Fact.w, Fact.y + Fact.h))
+
+
+def _point_box(x: float, y: float):
+    return func.box(func.point(x, y), func.point(x, y))
+
+
+class FactSpatialIndex:
+    def __init__(self, facts: list[Fact]):
+        self.facts = facts
+        self.x0 = np.fromiter((fact.x for fact in facts), dtype=np.float64, count=len(facts))
+        self.y0 = np.fromiter((fact.y for fact in facts), dtype=np.float64, count=len(facts))
+        w = np.fromiter((fact.w for fact in facts), dtype=np.float64, count=len(facts))
+        h = np.fromiter((fact.h for fact in facts), dtype=np.float64, count=len(facts))
+        self.x1 = self.x0 + w
+        self.y1 = self.y0 + h
+        self.extent = np.maximum(w, h)
+
+    def containing(self, x: float, y: float) -> list[Fact]:
+        mask = (self.x0 <= x) & (x <= self.x1) & (self.y0 <= y) & (y <= self.y1)
+        return [self.facts[i] for i in np.flatnonzero(mask)]
+
+    def intersecting(
+        self, x: float, y: float, w: float, h: float, min_extent: float = 0.0, limit: int | None = None
+    ) -> list[Fact]:
+        mask = (self.x0 <= x + w) & (x <= self.x1) & (self.y0 <= y + h) & (y <= self.y1)
+        if min_extent > 0:
+            mask &= self.extent >= min_extent
+        indices = np.flatnonzero(mask)
+        if limit is not None and len(indices) > limit:
+            largest = np.argsort(-self.extent[indices], kind="stable")[:limit]
+            indices = np.sort(indices[largest])
+        return [self.facts[i] for i in indices]
+
+
+class SpatialIndexCache:
+    def __init__(self, max_paintings: int):
+        self.max_paintings = max_paintings
+        self.generation = 0
+        self._indexes: OrderedDict[uuid.UUID, FactSpatialIndex | object] = OrderedDict()
+
+    def get(self, painting_id: uuid.UUID) -> FactSpatialIndex | object | None:
+        index = self._indexes.get(painting_id)
+        if index is not None:
+            self._indexes.move_to_end(painting_id)
+        return index
+
+    def set(self, painting_id: uuid.UUID, index: FactSpatialIndex | object, generation: int) -> None:
+        if generation != self.generation or self.max_paintings <= 0:
+            return
+        self._indexes[painting_id] = index
+        self._indexes.move_to_end(painting_id)
+        while len(self._indexes) > self.max_paintings:
+            self._indexes.popitem(last=False)
+
+    def invalidate(self, payload: str | None = None) -> None:
+        self.generation += 1
+        if payload is None or payload == "*":
+            self._indexes.clear()
+            return
+        self._indexes.pop(uuid.UUID(payload), None)
+
+
+spatial_cache = SpatialIndexCache(SPATIAL_CACHE_MAX_PAINTINGS)
+
+
+async def _get_spatial_index(session: AsyncSession, painting_id: uuid.UUID) -> FactSpatialIndex | object | None:
+    """The painting's index, ``SMALL_PAINTING`` for a painting read from SQL, or None if it does not exist."""
+    index = spatial_cache.get(painting_id)
+    if index is not None:
+        return index
+
+    async def load() -> FactSpatialIndex | object | None:
+        generation = spatial_cache.generation
+        facts_count = await session.scalar(select(Painting.facts_count).where(Painting.id == painting_id))
+        if facts_count is None:
+            return None
+        if facts_count < SPATIAL_CACHE_MIN_FACTS:
+            # Adding facts updates facts_count, whose notification drops this entry.
+            spatial_cache.set(painting_id, SMALL_PAINTING, generation)
+            return SMALL_PAINTING
+        index = FactSpatialIndex(await get_facts_for_painting(session, painting_id))
+        spatial_cache.set(painting_id, index, generation)
+        return index
+
+    return await spatial_flight.do(painting_id, load)
+
+
+async def get_facts_at_point(
+    session: AsyncSession, painting_id: uuid.UUID, x: float, y: float
+) -> list[Fact] | None:
+    index = await _get_spatial_index(session, painting_id)
+    if index is None:
+        return None
+    if index is not SMALL_PAINTING:
+        return index.containing(x, y)
+    stmt = (
+        select(Fact)
+        .where(Fact.painting_id == painting_id, FACT_BOX.op("&&")(_point_box(x, y)))
+        .order_by(Fact.order_index)
+    )
+    result = await session.execute(stmt)
+    return list(result.scalars().all())
+
+
+async def get_facts_in_viewport(
+    session: AsyncSession,
+    painting_id: uuid.UUID,
+    x: float,
+    y: float,
+    w: float,
+    h: float,
+    min_extent: float = 0.0,
+    limit: int | None = None,
+) -> list[Fact] | None:
+    index = await _get_spatial_index(session, painting_id)
+    if index is None:
+        return None
+    if index is not SMALL_PAINTING:
+        return index.intersecting(x, y, w, h, min_extent, limit)
+
+    viewport = func.box(func.point(x, y), func.point(x + w, y + h))
+    stmt = select(Fact).where(Fact.painting_id == painting_id, FACT_BOX.op("&&")(viewport))
+    if min_extent > 0:
+        stmt = stmt.where(func.greatest(Fact.w, Fact.h) >= min_extent)
+    if limit is not None:
+        # When zoomed out, keep the largest annotations and drop the tiny ones.
+        stmt = stmt.order_by(func.greatest(Fact.w, Fact.h).desc(), Fact.order_index).limit(limit)
+    else:
+        stmt = stmt.order_by(Fact.order_index)
+    result = await session.execute(stmt)
+    facts = list(result.scalars().all())
+    if limit is not None:
+        facts.sort(key=lambda fact: fact.order_index)
+    return facts
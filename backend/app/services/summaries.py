@@ -0,0 +1,78 @@
+"""Artist and genre aggregates served from materialized views.
+
+``artist_summaries`` and ``genre_summaries`` (migration 20261018_0013) hold the
+painting and fact counts and a representative painting per artist and genre, so
+reads are index lookups on the views' unique keys however large the catalog is.
+The views are refreshed with ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` by the
+writers (ingest, seed, derivatives, the synthetic catalog) once they are done,
+or by hand with ``python -m app.summaries``; readers are never blocked by a refresh.
+"""
+
+import asyncpg
+from sqlalchemy import Row, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.summary import RepresentativePainting
+
+SUMMARY_VIEWS = ("artist_summaries", "genre_summaries")
+REFRESH_SUMMARIES_SQL = tuple(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}" for view in SUMMARY_VIEWS)
+
+ARTIST_SUMMARIES_SQL = text(
+    """
+    SELECT * FROM artist_summaries
+    WHERE artist_slug > :after
+    ORDER BY artist_slug
+    LIMIT :limit
+    """
+)
+
+ARTIST_SUMMARY_SQL = text("SELECT * FROM artist_summaries WHERE artist_slug = :artist_slug")
+
+GENRE_SUMMARIES_SQL = text(
+    """
+    SELECT * FROM genre_summaries
+    WHERE genre_name > :after
+    ORDER BY genre_name
+    LIMIT :limit
+    """
+)
+
+GENRE_SUMMARY_SQL = text("SELECT * FROM genre_summaries WHERE genre_name = :genre_name")
+
+
+def representative(row: Row) -> RepresentativePainting:
+    return RepresentativePainting(
+        artist_slug=row.representative_artist_slug,
+        painting_slug=row.representative_painting_slug,
+        name=row.representative_name,
+        image_url=row.representative_image_url,
+        image_sha256=row.representative_image_sha256,
+        image_width=row.representative_image_width,
+        image_height=row.representative_image_height,
+    )
+
+
+async def list_artist_summaries(session: AsyncSession, limit: int, after: str = "") -> list[Row]:
+    result = await session.execute(ARTIST_SUMMARIES_SQL, {"after": after, "limit": limit})
+    return list(result.all())
+
+
+async def get_artist_summary(session: AsyncSession, artist_slug: str) -> Row | None:
+    result = await session.execute(ARTIST_SUMMARY_SQL, {"artist_slug": artist_slug})
+    return result.first()
+
+
+async def list_genre_summaries(session: AsyncSession, limit: int, after: str = "") -> list[Row]:
+    result = await session.execute(GENRE_SUMMARIES_SQL, {"after": after, "limit": limit})
+    return list(result.all())
+
+
+async def get_genre_summary(session: AsyncSession, genre_name: str) -> Row | None:
+    result = await session.execute(GENRE_SUMMARY_SQL, {"genre_name": genre_name})
+    return result.first()
+
+
+async def refresh_summaries(connection: asyncpg.Connection) -> None:
+    for statement in REFRESH_SUMMARIES_SQL:
+        await connection.execute(statement)
+
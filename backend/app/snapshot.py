@@ -0,0 +1,136 @@
+"""Export the catalog to a memory-mapped snapshot file.
+
+    python -m app.snapshot [--output catalog.snapshot]
+
+The export reads one REPEATABLE READ view of the database and atomically
+replaces the output file, so servers running with ``SNAPSHOT_PATH`` pointing at
+it switch over on their next check without a restart. Bodies and ETags are
+produced by the same schemas and version query as the API, so clients keep
+their validators when a server moves between the snapshot and the database.
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import asyncpg
+
+from app.db.database import ASYNCPG_DSN
+from app.http_cache import make_validators
+from app.schemas.painting import PaintingBundleResponse, PaintingResponse
+from app.services.fastpath import facts_adapter
+from app.services.paintings import FACTS_DIGEST_SQL, PaintingVersion
+from app.services.snapshot import (
+    BUNDLE,
+    FACTS,
+    PAINTING,
+    REDIRECT,
+    SNAPSHOT_PATH,
+    SnapshotWriter,
+    pack_redirect,
+    pack_validated,
+)
+
+PAINTINGS_SQL = f"""
+    SELECT p.id, p.name, p.artist_name, p.artist_slug, p.painting_slug, p.museum_name, p.genre_name,
+           p.image_url, p.source_url, p.license_name, p.license_url, p.facts_count,
+           p.image_sha256, p.image_width, p.image_height,
+           p.updated_at, v.facts_updated_at, v.facts_digest
+    FROM paintings p
+    LEFT JOIN LATERAL (
+        SELECT max(f.updated_at) AS facts_updated_at, {FACTS_DIGEST_SQL} AS facts_digest
+        FROM facts f
+        WHERE f.painting_id = p.id
+    ) v ON true
+    ORDER BY p.id
+"""
+
+FACTS_SQL = """
+    SELECT id, painting_id, name, description_md, description_html, description_text,
+           geometry_type, x, y, w, h, order_index
+    FROM facts
+    ORDER BY painting_id, order_index
+"""
+
+ALIASES_SQL = """
+    SELECT a.artist_slug AS alias_artist_slug, a.painting_slug AS alias_painting_slug, a.combined_slug,
+           p.id, p.artist_slug, p.painting_slug
+    FROM painting_aliases a
+    JOIN paintings p ON p.id = a.painting_id
+"""
+
+FETCH_SIZE = 2000
+
+
+async def _rows(cursor):
+    while rows := await cursor.fetch(FETCH_SIZE):
+        for row in rows:
+            yield row
+
+
+async def export(output: Path, dsn: str = ASYNCPG_DSN) -> dict[str, int]:
+    counts = {"paintings": 0, "facts": 0, "aliases": 0}
+    writer = SnapshotWriter(output)
+    connection = await asyncpg.connect(dsn)
+    try:
+        async with connection.transaction(isolation="repeatable_read", readonly=True):
+            # Paintings and facts come back in the same painting id order and are merge-joined.
+            facts = _rows(await connection.cursor(FACTS_SQL))
+            pending_fact = await anext(facts, None)
+            async for row in _rows(await connection.cursor(PAINTINGS_SQL)):
+                version = PaintingVersion(row["id"], row["updated_at"], row["facts_updated_at"], row["facts_digest"])
+                painting = PaintingResponse.model_validate(dict(row))
+                writer.add(
+                    f"p:{row['artist_slug']}/{row['painting_slug']}",
+                    PAINTING,
+                    pack_validated(make_validators("painting", version), painting.model_dump_json().encode()),
+                )
+
+                painting_facts = []
+                while pending_fact is not None and pending_fact["painting_id"] == row["id"]:
+                    painting_facts.append(dict(pending_fact))
+                    pending_fact = await anext(facts, None)
+                fact_models = facts_adapter.validate_python(painting_facts)
+                body = facts_adapter.dump_json(fact_models)
+                writer.add(f"f:{row['id']}", FACTS, pack_validated(make_validators("facts", version), body))
+                bundle = PaintingBundleResponse.model_validate({**dict(row), "facts": fact_models})
+                writer.add(
+                    f"b:{row['artist_slug']}/{row['painting_slug']}",
+                    BUNDLE,
+                    pack_validated(make_validators("bundle", version), bundle.model_dump_json().encode()),
+                )
+                counts["paintings"] += 1
+                counts["facts"] += len(painting_facts)
+
+            for row in await connection.fetch(ALIASES_SQL):
+                target = pack_redirect(row["id"], row["artist_slug"], row["painting_slug"])
+                if row["combined_slug"] is not None:
+                    writer.add(f"c:{row['combined_slug']}", REDIRECT, target)
+                else:
+                    writer.add(f"a:{row['alias_artist_slug']}/{row['alias_painting_slug']}", REDIRECT, target)
+                counts["aliases"] += 1
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        await connection.close()
+    writer.commit()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.snapshot", description="Export a catalog snapshot.")
+    parser.add_argument("--output", type=Path, default=Path(SNAPSHOT_PATH or "catalog.snapshot"))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = asyncio.run(export(args.output))
+    print(
+        f"paintings={counts['paintings']} facts={counts['facts']} aliases={counts['aliases']} "
+        f"size={args.output.stat().st_size} bytes elapsed={time.perf_counter() - started:.1f}s -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
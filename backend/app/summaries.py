@@ -0,0 +1,35 @@
+"""Refresh the artist and genre summary views.
+
+    python -m app.summaries
+
+The writers refresh the views themselves after they change the catalog; this
+is for changes made any other way (manual SQL, restored dumps).
+"""
+
+import argparse
+import asyncio
+import time
+
+import asyncpg
+
+from app.db.database import ASYNCPG_DSN
+from app.services.summaries import SUMMARY_VIEWS, refresh_summaries
+
+
+async def refresh(dsn: str = ASYNCPG_DSN) -> None:
+    connection = await asyncpg.connect(dsn)
+    try:
+        await refresh_summaries(connection)
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    argparse.ArgumentParser(prog="python -m app.summaries", description="Refresh artist and genre summaries.").parse_args()
+    started = time.perf_counter()
+    asyncio.run(refresh())
+    print(f"refreshed {', '.join(SUMMARY_VIEWS)} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
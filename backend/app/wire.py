@@ -0,0 +1,254 @@
+"""Compact encodings for fact lists, negotiated through ``Accept``.
+
+JSON stays the default; ``read_facts`` and the bundle endpoint additionally serve:
+
+``application/msgpack`` (when the optional ``msgpack`` package is installed)
+    A map ``{"painting_id": bin16, "columns": [...], "rows": [[...], ...]}``. Field names
+    and ``painting_id`` are sent once; each row holds, in ``columns`` order, the fact id
+    (16 raw bytes), name, description_md, description_html, description_text,
+    geometry_type, x, y, w, h (float32) and order_index. Bundles add ``"painting"``: the painting fields without ``facts``.
+
+``application/vnd.artexplorer.facts+columnar``
+    A little-endian frame laid out so that every numeric array starts on a 4-byte
+    boundary and can be viewed in place (``numpy.frombuffer``, ``Float32Array``)::
+
+        magic           4 bytes     b"AXF2"
+        flags           uint16      bit 0: painting metadata present (bundles)
+                                    bit 1: null mask present
+        G               uint16      geometry_type dictionary size
+        N               uint32      number of facts
+        painting_id     16 bytes
+        [metadata]      uint32 length + UTF-8 JSON, zero-padded to 4 bytes
+        ids             16 * N bytes
+        x, y, w, h      4 arrays of N float32
+        order_index     N int32
+        name_offsets    N + 1 uint32, into the names blob
+        desc_offsets    N + 1 uint32, into the descriptions blob
+        html_offsets    N + 1 uint32, into the HTML blob
+        text_offsets    N + 1 uint32, into the excerpts blob
+        geometry_codes  N uint16, indexes into the dictionary
+        dictionary      G entries of uint16 length + UTF-8
+        names blob      UTF-8
+        descriptions    UTF-8
+        HTML            UTF-8
+        excerpts        UTF-8
+        [null mask]     N uint8: bit 0 description_html is null, bit 1 description_text is null
+
+Both binary formats carry coordinates as float32, which is exact to ~1e-7 for the
+0..1 range facts live in. Facts whose description has not been rendered yet have
+``null`` HTML and excerpt in both formats; the columnar frame only appends the null
+mask when there are such facts, so readers that ignore it see empty strings.
+:func:`decode_columnar` is the reference decoder; it returns the same dicts the JSON
+endpoint would (ids as strings).
+"""
+
+import json
+import struct
+import uuid
+from operator import attrgetter, itemgetter
+
+import numpy as np
+
+from app.http_cache import parse_quality_list
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is optional, JSON and columnar always work
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+COLUMNAR = "application/vnd.artexplorer.facts+columnar"
+
+COLUMNAR_MAGIC = b"AXF2"
+COLUMNAR_HAS_METADATA = 0x1
+COLUMNAR_HAS_NULL_MASK = 0x2
+NULL_HTML = 0x1
+NULL_TEXT = 0x2
+_HEADER = struct.Struct("<4sHHI16s")
+
+FACT_COLUMNS = (
+    "id", "name", "description_md", "description_html", "description_text",
+    "geometry_type", "x", "y", "w", "h", "order_index",
+)
+
+
+def available_formats() -> tuple[str, ...]:
+    if msgpack is None:
+        return (JSON, COLUMNAR)
+    return (JSON, MSGPACK, COLUMNAR)
+
+
+def negotiate_format(accept: str | None) -> str:
+    # Only explicitly named formats win; */* and anything unknown get JSON.
+    weights = parse_quality_list(accept)
+    weights[MSGPACK] = max(weights.get(MSGPACK, 0.0), weights.get("application/x-msgpack", 0.0))
+    best, best_weight = JSON, weights.get(JSON, 0.0)
+    for media_type in available_formats():
+        if weights.get(media_type, 0.0) > best_weight:
+            best, best_weight = media_type, weights[media_type]
+    return best
+
+
+def _uuid_bytes(value) -> bytes:
+    return value.bytes if isinstance(value, uuid.UUID) else uuid.UUID(str(value)).bytes
+
+
+def _columns(facts) -> list[list]:
+    # Facts arrive as ORM rows / FactResponse objects, or as dicts parsed from the bundle JSON.
+    if not facts:
+        return [[] for _ in FACT_COLUMNS]
+    getter = itemgetter if isinstance(facts[0], dict) else attrgetter
+    rows = list(map(getter(*FACT_COLUMNS), facts))
+    return [list(column) for column in zip(*rows)]
+
+
+def encode_msgpack(painting_id: uuid.UUID, facts, painting: dict | None = None) -> bytes:
+    ids, *columns = _columns(facts)
+    document = {
+        "painting_id": painting_id.bytes,
+        "columns": list(FACT_COLUMNS),
+        "rows": [list(row) for row in zip(map(_uuid_bytes, ids), *columns)],
+    }
+    if painting is not None:
+        document["painting"] = painting
+    return msgpack.packb(document, use_single_float=True)
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _string_column(values: list[str | None]) -> tuple[bytes, bytes]:
+    encoded = [value.encode() if value is not None else b"" for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets.tobytes(), b"".join(encoded)
+
+
+def encode_columnar(painting_id: uuid.UUID, facts, painting: dict | None = None) -> bytes:
+    ids, names, descriptions, html, excerpts, geometry_types, xs, ys, ws, hs, order_index = _columns(facts)
+    dictionary: dict[str, int] = {}
+    codes = np.fromiter(
+        (dictionary.setdefault(value, len(dictionary)) for value in geometry_types), dtype="<u2", count=len(ids)
+    )
+    name_offsets, name_blob = _string_column(names)
+    description_offsets, description_blob = _string_column(descriptions)
+    html_offsets, html_blob = _string_column(html)
+    excerpt_offsets, excerpt_blob = _string_column(excerpts)
+
+    flags = 0
+    parts = []
+    if painting is not None:
+        flags |= COLUMNAR_HAS_METADATA
+        metadata = json.dumps(painting, separators=(",", ":")).encode()
+        parts.append(_pad(struct.pack("<I", len(metadata)) + metadata))
+    parts += [
+        b"".join(map(_uuid_bytes, ids)),
+        np.array([xs, ys, ws, hs], dtype="<f4").tobytes(),
+        np.array(order_index, dtype="<i4").tobytes(),
+        name_offsets,
+        description_offsets,
+        html_offsets,
+        excerpt_offsets,
+        codes.tobytes(),
+        b"".join(struct.pack("<H", len(value.encode())) + value.encode() for value in dictionary),
+        name_blob,
+        description_blob,
+        html_blob,
+        excerpt_blob,
+    ]
+    nulls = np.fromiter(
+        ((NULL_HTML if a is None else 0) | (NULL_TEXT if b is None else 0) for a, b in zip(html, excerpts)),
+        dtype="u1",
+        count=len(ids),
+    )
+    if nulls.any():
+        flags |= COLUMNAR_HAS_NULL_MASK
+        parts.append(nulls.tobytes())
+    header = _HEADER.pack(COLUMNAR_MAGIC, flags, len(dictionary), len(ids), painting_id.bytes)
+    return header + b"".join(parts)
+
+
+def encode_facts(media_type: str, painting_id: uuid.UUID, facts, painting: dict | None = None) -> bytes:
+    if media_type == MSGPACK:
+        return encode_msgpack(painting_id, facts, painting)
+    if media_type == COLUMNAR:
+        return encode_columnar(painting_id, facts, painting)
+    raise ValueError(f"Unsupported facts encoding: {media_type}")
+
+
+def decode_columnar(data: bytes) -> tuple[dict | None, list[dict]]:
+    """Decode a columnar frame into ``(painting metadata or None, facts)``."""
+    magic, flags, dictionary_size, count, painting_id = _HEADER.unpack_from(data)
+    if magic != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar facts frame")
+    offset = _HEADER.size
+    painting = None
+    if flags & COLUMNAR_HAS_METADATA:
+        (length,) = struct.unpack_from("<I", data, offset)
+        painting = json.loads(data[offset + 4 : offset + 4 + length])
+        offset += 4 + length + (-(4 + length) % 4)
+
+    def array(dtype: str, size: int) -> np.ndarray:
+        nonlocal offset
+        values = np.frombuffer(data, dtype=dtype, count=size, offset=offset)
+        offset += values.nbytes
+        return values
+
+    ids = [str(uuid.UUID(bytes=bytes(value))) for value in array("V16", count)]
+    xs, ys, ws, hs = (array("<f4", count).tolist() for _ in range(4))
+    order_index = array("<i4", count).tolist()
+    name_offsets = array("<u4", count + 1).tolist()
+    description_offsets = array("<u4", count + 1).tolist()
+    html_offsets = array("<u4", count + 1).tolist()
+    excerpt_offsets = array("<u4", count + 1).tolist()
+    codes = array("<u2", count).tolist()
+    dictionary = []
+    for _ in range(dictionary_size):
+        (length,) = struct.unpack_from("<H", data, offset)
+        dictionary.append(data[offset + 2 : offset + 2 + length].decode())
+        offset += 2 + length
+    names_start = offset
+    descriptions_start = names_start + name_offsets[-1]
+    html_start = descriptions_start + description_offsets[-1]
+    excerpts_start = html_start + html_offsets[-1]
+
+    nulls = [0] * count
+    if flags & COLUMNAR_HAS_NULL_MASK:
+        nulls = list(data[excerpts_start + excerpt_offsets[-1] :][:count])
+
+    def string(start: int, offsets: list[int], i: int) -> str:
+        return data[start + offsets[i] : start + offsets[i + 1]].decode()
+
+    painting_id = str(uuid.UUID(bytes=painting_id))
+    facts = []
+    for i in range(count):
+        facts.append({
+            "id": ids[i],
+            "painting_id": painting_id,
+            "name": string(names_start, name_offsets, i),
+            "description_md": string(descriptions_start, description_offsets, i),
+            "description_html": None if nulls[i] & NULL_HTML else string(html_start, html_offsets, i),
+            "description_text": None if nulls[i] & NULL_TEXT else string(excerpts_start, excerpt_offsets, i),
+            "geometry_type": dictionary[codes[i]],
+            "x": xs[i],
+            "y": ys[i],
+            "w": ws[i],
+            "h": hs[i],
+            "order_index": order_index[i],
+        })
+    return painting, facts
+
+
+def decode_msgpack(data: bytes) -> tuple[dict | None, list[dict]]:
+    """Decode a MessagePack facts document into ``(painting metadata or None, facts)``."""
+    document = msgpack.unpackb(data)
+    painting_id = str(uuid.UUID(bytes=document["painting_id"]))
+    facts = []
+    for row in document["rows"]:
+        fact = dict(zip(document["columns"], row))
+        fact["id"] = str(uuid.UUID(bytes=fact["id"]))
+        fact["painting_id"] = painting_id
+        facts.append(fact)
+    return document.get("painting"), facts
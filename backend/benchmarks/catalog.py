@@ -0,0 +1,161 @@
+"""Generate a synthetic catalog in the local database for load tests.
+
+Rows are written with COPY straight into ``paintings``, ``facts`` and
+``painting_aliases``; every artist slug starts with ``--prefix`` so the synthetic
+catalog can be dropped again with ``--reset`` without touching real data::
+
+    python -m benchmarks.catalog --paintings 20000 --facts-mean 25 --alias-ratio 0.2 --genres 40
+
+Facts per painting follow a Lomax (Pareto II) distribution: most paintings carry a
+handful of facts and a long tail carries thousands, like a real annotated catalog.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+import asyncpg
+import numpy as np
+
+from app.db.database import ASYNCPG_DSN
+from app.services.markdown import render_description
+from app.services.summaries import refresh_summaries
+
+PAINTING_COLUMNS = (
+    "id", "name", "artist_name", "artist_slug", "painting_slug", "museum_name", "genre_name",
+    "image_url", "source_url", "license_name", "license_url", "created_at", "updated_at",
+)
+FACT_COLUMNS = (
+    "id", "painting_id", "name", "description_md", "description_html", "description_text", "render_version",
+    "geometry_type", "x", "y", "w", "h", "order_index", "created_at", "updated_at",
+)
+ALIAS_COLUMNS = ("id", "painting_id", "artist_slug", "painting_slug", "combined_slug")
+
+GEOMETRY_TYPES = np.array(["rect", "ellipse", "polygon"])
+WORDS = np.array("мазок свет тень фигура небо облако дерево лицо рука складка ткань фон".split())
+PAINTINGS_PER_ARTIST = 8
+
+
+def fact_counts(rng: np.random.Generator, paintings: int, mean: float, skew: float, maximum: int) -> np.ndarray:
+    # numpy's pareto() is Lomax with mean 1 / (skew - 1); rescale to the requested mean.
+    counts = rng.pareto(skew, paintings) * mean * (skew - 1)
+    return np.minimum(counts.astype(np.int64), maximum)
+
+
+def text(rng: np.random.Generator, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS, rng.integers(low, high + 1)))
+
+
+def chunk_rows(
+    rng: np.random.Generator, prefix: str, start: int, stop: int, args: argparse.Namespace, now: datetime
+) -> tuple[list[tuple], list[tuple], list[tuple]]:
+    genres = [f"{prefix}-genre-{i}" for i in range(args.genres)]
+    counts = fact_counts(rng, stop - start, args.facts_mean, args.facts_skew, args.facts_max)
+    paintings, facts, aliases = [], [], []
+    for number, count in zip(range(start, stop), counts):
+        painting_id = uuid.uuid4()
+        artist = number // PAINTINGS_PER_ARTIST
+        artist_slug, painting_slug = f"{prefix}-artist-{artist}", f"painting-{number}"
+        paintings.append((
+            painting_id,
+            f"Painting {number}",
+            f"Artist {artist}",
+            artist_slug,
+            painting_slug,
+            f"Museum {artist % 97}",
+            list(rng.choice(genres, min(len(genres), rng.integers(1, 4)), replace=False)) if genres else None,
+            f"https://example.org/{artist_slug}/{painting_slug}.jpg",
+            f"https://example.org/{artist_slug}/{painting_slug}",
+            "Public domain",
+            None,
+            now,
+            now,
+        ))
+
+        w = rng.uniform(0.01, 0.3, count)
+        h = rng.uniform(0.01, 0.3, count)
+        x = rng.uniform(0, 1, count) * (1 - w)
+        y = rng.uniform(0, 1, count) * (1 - h)
+        geometry = rng.choice(GEOMETRY_TYPES, count, p=[0.8, 0.15, 0.05])
+        for i in range(count):
+            description = text(rng, 5, 40)
+            facts.append((
+                uuid.uuid4(), painting_id, text(rng, 1, 4), description, *render_description(description),
+                str(geometry[i]), float(x[i]), float(y[i]), float(w[i]), float(h[i]), i, now, now,
+            ))
+
+        if rng.random() < args.alias_ratio:
+            aliases.append((uuid.uuid4(), painting_id, artist_slug, f"{painting_slug}-old", None))
+        if rng.random() < args.alias_ratio:
+            aliases.append((uuid.uuid4(), painting_id, None, None, f"{artist_slug}-{painting_slug}"))
+    return paintings, facts, aliases
+
+
+async def reset(connection: asyncpg.Connection, prefix: str) -> None:
+    pattern = f"{prefix}-%"
+    async with connection.transaction():
+        for table in ("painting_aliases", "facts"):
+            await connection.execute(
+                f"DELETE FROM {table} WHERE painting_id IN (SELECT id FROM paintings WHERE artist_slug LIKE $1)",
+                pattern,
+            )
+        await connection.execute("DELETE FROM paintings WHERE artist_slug LIKE $1", pattern)
+
+
+async def generate(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    connection = await asyncpg.connect(ASYNCPG_DSN)
+    try:
+        if args.reset:
+            await reset(connection, args.prefix)
+        existing = await connection.fetchval(
+            "SELECT count(*) FROM paintings WHERE artist_slug LIKE $1", f"{args.prefix}-%"
+        )
+        if existing and not args.reset:
+            raise SystemExit(f"{existing} '{args.prefix}' paintings already exist; pass --reset to replace them")
+
+        now = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        totals = [0, 0, 0]
+        for start in range(0, args.paintings, args.batch_size):
+            stop = min(start + args.batch_size, args.paintings)
+            paintings, facts, aliases = chunk_rows(rng, args.prefix, start, stop, args, now)
+            async with connection.transaction():
+                await connection.copy_records_to_table("paintings", records=paintings, columns=PAINTING_COLUMNS)
+                await connection.copy_records_to_table("facts", records=facts, columns=FACT_COLUMNS)
+                await connection.copy_records_to_table("painting_aliases", records=aliases, columns=ALIAS_COLUMNS)
+            for i, rows in enumerate((paintings, facts, aliases)):
+                totals[i] += len(rows)
+            print(f"\r{stop}/{args.paintings} paintings", end="", flush=True)
+        await connection.execute("ANALYZE paintings; ANALYZE facts; ANALYZE painting_aliases")
+        await refresh_summaries(connection)
+        print(
+            f"\npaintings={totals[0]} facts={totals[1]} aliases={totals[2]} "
+            f"elapsed={time.perf_counter() - started:.1f}s"
+        )
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.catalog", description="Generate a synthetic catalog.")
+    parser.add_argument("--paintings", type=int, default=10000)
+    parser.add_argument("--facts-mean", type=float, default=20.0, help="mean number of facts per painting")
+    parser.add_argument("--facts-skew", type=float, default=1.5, help="Pareto shape; lower means a longer tail")
+    parser.add_argument("--facts-max", type=int, default=50000, help="cap on facts for a single painting")
+    parser.add_argument("--alias-ratio", type=float, default=0.2, help="chance of a pair and of a combined alias")
+    parser.add_argument("--genres", type=int, default=40, help="genre cardinality")
+    parser.add_argument("--prefix", default="bench", help="artist slug prefix marking synthetic rows")
+    parser.add_argument("--batch-size", type=int, default=2000, help="paintings per COPY transaction")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="delete previously generated rows first")
+    args = parser.parse_args()
+    if args.facts_skew <= 1:
+        parser.error("--facts-skew must be greater than 1 for the mean to exist")
+    asyncio.run(generate(args))
+
+
+if __name__ == "__main__":
+    main()
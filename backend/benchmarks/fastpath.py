@@ -0,0 +1,70 @@
+"""Compare read_painting/read_facts throughput through the ORM and the asyncpg fast path.
+
+Runs in-process against a seeded database (``make seed``)::
+
+    python -m benchmarks.fastpath --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.db.fastpath import close_fast_pool, open_fast_pool
+from app.main import app
+from app.services.response_cache import response_cache
+
+
+async def measure(client: httpx.AsyncClient, urls: list[str], requests: int, concurrency: int) -> float:
+    queue: asyncio.Queue[str] = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(urls[i % len(urls)])
+
+    async def worker() -> None:
+        while not queue.empty():
+            url = queue.get_nowait()
+            response = await client.get(url)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Cached bodies would be served the same way in both runs; measure the loaders.
+    response_cache.max_bytes = 0
+    response_cache.invalidate()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        painting_url = f"/api/v1/paintings/{args.artist}/{args.painting}"
+        response = await client.get(painting_url)
+        response.raise_for_status()
+        facts_url = f"/api/v1/paintings/by-id/{response.json()['id']}/facts"
+
+        results = {}
+        for name, urls in (("read_painting", [painting_url]), ("read_facts", [facts_url])):
+            await measure(client, urls, args.warmup, args.concurrency)
+            orm = await measure(client, urls, args.requests, args.concurrency)
+            await open_fast_pool()
+            try:
+                await measure(client, urls, args.warmup, args.concurrency)
+                fast = await measure(client, urls, args.requests, args.concurrency)
+            finally:
+                await close_fast_pool()
+            results[name] = (orm, fast)
+
+    print(f"{'endpoint':<16}{'orm req/s':>12}{'fast req/s':>12}{'speedup':>10}")
+    for name, (orm, fast) in results.items():
+        print(f"{name:<16}{orm:>12.0f}{fast:>12.0f}{fast / orm:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fastpath")
+    parser.add_argument("--artist", default="van-gogh")
+    parser.add_argument("--painting", default="starry-night")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,336 @@
+"""Drive the read endpoints at fixed concurrency and record latency percentiles.
+
+Targets are sampled from a catalog produced by ``benchmarks.catalog``. Each scenario
+runs at every ``--concurrency`` level, either in-process through ``httpx.ASGITransport``
+or against a real ``uvicorn`` started as a subprocess::
+
+    python -m benchmarks.load --mode asgi --concurrency 1 16 64 --save baseline.json
+    python -m benchmarks.load --mode uvicorn --workers 4 --compare baseline.json
+
+SQL statements per request are counted through engine and asyncpg hooks in ASGI
+mode, and through ``pg_stat_statements`` (when installed) in uvicorn mode. Caches
+follow the usual environment variables, so ``SLUG_CACHE_MAX_ENTRIES=0
+RESPONSE_CACHE_MAX_BYTES=0`` measures the uncached path.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import asyncpg
+import httpx
+import numpy as np
+from sqlalchemy import event
+
+from app.db.database import ASYNCPG_DSN, engine
+from app.db.fastpath import FAST_READ_PATH, close_fast_pool, open_fast_pool
+from app.main import app
+
+SCENARIOS = {
+    # name: (expected status, SQL producing URL paths)
+    "read_painting": (
+        200,
+        """
+        SELECT '/api/v1/paintings/' || artist_slug || '/' || painting_slug
+        FROM paintings WHERE artist_slug LIKE $1 ORDER BY random() LIMIT $2
+        """,
+    ),
+    "alias_redirect": (
+        301,
+        """
+        SELECT '/api/v1/paintings/' || a.artist_slug || '/' || a.painting_slug
+        FROM painting_aliases a JOIN paintings p ON p.id = a.painting_id
+        WHERE p.artist_slug LIKE $1 AND a.artist_slug IS NOT NULL ORDER BY random() LIMIT $2
+        """,
+    ),
+    "combined_redirect": (
+        301,
+        """
+        SELECT '/api/v1/paintings/' || a.combined_slug
+        FROM painting_aliases a JOIN paintings p ON p.id = a.painting_id
+        WHERE p.artist_slug LIKE $1 AND a.combined_slug IS NOT NULL ORDER BY random() LIMIT $2
+        """,
+    ),
+    "read_facts": (
+        200,
+        """
+        SELECT '/api/v1/paintings/by-id/' || id || '/facts'
+        FROM paintings WHERE artist_slug LIKE $1 ORDER BY random() LIMIT $2
+        """,
+    ),
+}
+
+STATEMENTS_SQL = """
+    SELECT coalesce(sum(calls), 0)::bigint
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+"""
+
+
+@dataclass
+class Result:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float | None
+
+
+class QueryCounter:
+    """Counts statements issued by this process through SQLAlchemy and the asyncpg fast pool."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def _on_query(self, record) -> None:
+        self.count += 1
+
+    async def attach(self, connection: asyncpg.Connection) -> None:
+        connection.add_query_logger(self._on_query)
+
+    async def read(self) -> int:
+        return self.count
+
+
+class StatementsCounter:
+    """Reads the database-wide statement total from pg_stat_statements."""
+
+    def __init__(self, connection: asyncpg.Connection) -> None:
+        self.connection = connection
+
+    @classmethod
+    async def open(cls) -> "StatementsCounter | None":
+        connection = await asyncpg.connect(ASYNCPG_DSN)
+        try:
+            await connection.fetchval(STATEMENTS_SQL)
+        except asyncpg.PostgresError:
+            await connection.close()
+            return None
+        return cls(connection)
+
+    async def read(self) -> int:
+        # Discount the sampling query itself.
+        return await self.connection.fetchval(STATEMENTS_SQL) - 1
+
+    async def close(self) -> None:
+        await self.connection.close()
+
+
+async def load_targets(prefix: str, limit: int) -> dict[str, list[str]]:
+    connection = await asyncpg.connect(ASYNCPG_DSN)
+    try:
+        targets = {}
+        for name, (_, sql) in SCENARIOS.items():
+            targets[name] = [row[0] for row in await connection.fetch(sql, f"{prefix}-%", limit)]
+    finally:
+        await connection.close()
+    return targets
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, urls: list[str], expected: int, requests: int, concurrency: int
+) -> tuple[np.ndarray, int, float]:
+    latencies = np.zeros(requests)
+    errors = 0
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal errors, issued
+        while issued < requests:
+            i = issued
+            issued += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(random.choice(urls))
+                if response.status_code != expected:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies[i] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_all(client: httpx.AsyncClient, targets: dict[str, list[str]], counter, args) -> list[Result]:
+    results = []
+    for name, (expected, _) in SCENARIOS.items():
+        urls = targets[name]
+        if not urls:
+            print(f"skipping {name}: no targets in the '{args.prefix}' catalog", file=sys.stderr)
+            continue
+        for concurrency in args.concurrency:
+            await run_scenario(client, urls, expected, args.warmup, concurrency)
+            before = await counter.read() if counter else None
+            latencies, errors, elapsed = await run_scenario(client, urls, expected, args.requests, concurrency)
+            queries = (await counter.read() - before) / args.requests if counter else None
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            result = Result(
+                name, concurrency, args.requests, errors, args.requests / elapsed, p50, p95, p99, queries
+            )
+            print_result(result)
+            results.append(result)
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {process.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not become healthy in time")
+
+
+async def bench_asgi(targets: dict[str, list[str]], args) -> list[Result]:
+    counter = QueryCounter()
+    if FAST_READ_PATH:
+        await open_fast_pool(init=counter.attach)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_all(client, targets, counter, args)
+    finally:
+        await close_fast_pool()
+        await engine.dispose()
+
+
+async def bench_uvicorn(targets: dict[str, list[str]], args) -> list[Result]:
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=os.environ.copy(),
+    )
+    counter = await StatementsCounter.open()
+    if counter is None:
+        print("pg_stat_statements is not available; queries per request are not reported", file=sys.stderr)
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits) as client:
+            await wait_until_healthy(client, process)
+            return await run_all(client, targets, counter, args)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        if counter is not None:
+            await counter.close()
+
+
+def print_header() -> None:
+    print(
+        f"{'scenario':<19}{'conc':>5}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'sql/req':>9}{'errors':>8}"
+    )
+
+
+def print_result(result: Result) -> None:
+    queries = "-" if result.queries_per_request is None else f"{result.queries_per_request:.2f}"
+    print(
+        f"{result.scenario:<19}{result.concurrency:>5}{result.throughput:>10.0f}{result.p50_ms:>9.2f}"
+        f"{result.p95_ms:>9.2f}{result.p99_ms:>9.2f}{queries:>9}{result.errors:>8}"
+    )
+
+
+def compare(results: list[Result], baseline_path: Path, tolerance: float) -> bool:
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(row["scenario"], row["concurrency"]): row for row in baseline["results"]}
+    print(f"\ncompared with {baseline_path} ({baseline['meta']['created_at']}, mode={baseline['meta']['mode']})")
+    print(f"{'scenario':<19}{'conc':>5}{'req/s':>10}{'p95':>10}{'p99':>10}{'sql/req':>10}")
+    regressed = False
+    for result in results:
+        old = previous.get((result.scenario, result.concurrency))
+        if old is None:
+            continue
+        throughput = result.throughput / old["throughput"] - 1
+        p95 = result.p95_ms / old["p95_ms"] - 1
+        p99 = result.p99_ms / old["p99_ms"] - 1
+        queries = "-"
+        more_queries = False
+        if result.queries_per_request is not None and old["queries_per_request"] is not None:
+            delta = result.queries_per_request - old["queries_per_request"]
+            queries = f"{delta:+.2f}"
+            more_queries = delta > 0.01
+        flagged = throughput < -tolerance or p95 > tolerance or more_queries
+        regressed |= flagged
+        print(
+            f"{result.scenario:<19}{result.concurrency:>5}{throughput:>+10.1%}{p95:>+10.1%}{p99:>+10.1%}"
+            f"{queries:>10}{'  REGRESSION' if flagged else ''}"
+        )
+    return regressed
+
+
+async def main(args: argparse.Namespace) -> int:
+    targets = await load_targets(args.prefix, args.targets)
+    print(f"mode={args.mode} requests={args.requests} fast_read_path={FAST_READ_PATH}")
+    print_header()
+    if args.mode == "asgi":
+        results = await bench_asgi(targets, args)
+    else:
+        results = await bench_uvicorn(targets, args)
+
+    if args.save:
+        meta = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+            "requests": args.requests,
+            "fast_read_path": FAST_READ_PATH,
+            "targets": {name: len(urls) for name, urls in targets.items()},
+        }
+        args.save.write_text(json.dumps({"meta": meta, "results": [asdict(r) for r in results]}, indent=2))
+        print(f"saved {args.save}")
+    if args.compare and compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--targets", type=int, default=1000, help="distinct URLs sampled per scenario")
+    parser.add_argument("--prefix", default="bench", help="artist slug prefix of the synthetic catalog")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative throughput/p95 change")
+    arguments = parser.parse_args()
+    random.seed(arguments.seed)
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,89 @@
+"""Compare the JSON, MessagePack and columnar encodings of a painting's facts.
+
+Needs no database: facts are synthesized, encoded exactly as ``read_facts`` does and
+decoded the way a client would. Sizes are reported raw and with the content
+encodings the response cache serves::
+
+    python -m benchmarks.wire_format --sizes 10 1000 50000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+import uuid
+
+from app.schemas.fact import FactResponse
+from app.services.fastpath import facts_adapter
+from app.services.markdown import render_description
+from app.services.response_cache import brotli
+from app.wire import COLUMNAR, JSON, MSGPACK, available_formats, decode_columnar, decode_msgpack, encode_facts
+
+GEOMETRY_TYPES = ("rect", "rect", "rect", "ellipse", "polygon")
+WORDS = "мазок свет тень фигура небо облако дерево лицо рука складка ткань фон".split()
+
+
+def make_facts(count: int, rng: random.Random) -> tuple[uuid.UUID, list[FactResponse]]:
+    painting_id = uuid.uuid4()
+    facts = []
+    for order_index in range(count):
+        w, h = rng.uniform(0.01, 0.3), rng.uniform(0.01, 0.3)
+        description = render_description(" ".join(rng.choices(WORDS, k=rng.randint(5, 40))))
+        facts.append(FactResponse(
+            id=uuid.uuid4(),
+            painting_id=painting_id,
+            name=" ".join(rng.choices(WORDS, k=rng.randint(1, 4))).capitalize(),
+            description_md=description.text,
+            description_html=description.html,
+            description_text=description.text,
+            geometry_type=rng.choice(GEOMETRY_TYPES),
+            x=rng.uniform(0, 1 - w),
+            y=rng.uniform(0, 1 - h),
+            w=w,
+            h=h,
+            order_index=order_index,
+        ))
+    return painting_id, facts
+
+
+def timed(func, repeat: int) -> tuple[object, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return result, statistics.median(samples) * 1000
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    decoders = {JSON: json.loads, MSGPACK: decode_msgpack, COLUMNAR: decode_columnar}
+    labels = {JSON: "json", MSGPACK: "msgpack", COLUMNAR: "columnar"}
+
+    print(f"{'facts':>7}  {'format':<9}{'raw':>11}{'gzip':>11}{'br':>11}{'encode ms':>11}{'decode ms':>11}")
+    for count in args.sizes:
+        painting_id, facts = make_facts(count, rng)
+        repeat = max(3, min(200, 200_000 // max(count, 1)))
+        json_size = None
+        for media_type in available_formats():
+            if media_type == JSON:
+                body, encode_ms = timed(lambda: facts_adapter.dump_json(facts), repeat)
+            else:
+                body, encode_ms = timed(lambda: encode_facts(media_type, painting_id, facts), repeat)
+            _, decode_ms = timed(lambda: decoders[media_type](body), repeat)
+            json_size = json_size or len(body)
+            gzipped = len(gzip.compress(body, compresslevel=6))
+            brotlied = f"{len(brotli.compress(body, quality=5)):>11,}" if brotli else f"{'-':>11}"
+            print(
+                f"{count:>7}  {labels[media_type]:<9}{len(body):>11,}{gzipped:>11,}{brotlied}"
+                f"{encode_ms:>11.2f}{decode_ms:>11.2f}   {len(body) / json_size:.0%} of json"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.wire_format")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 50000])
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.routers.paintings import _load_bundle
+from app.schemas.fact import FactResponse
+from app.schemas.painting import PaintingBundleResponse
+from app.services.paintings import BUNDLE_FACT_COLUMNS, BUNDLE_PAINTING_COLUMNS, bundle_from_rows
+from app.wire import JSON
+
+PAINTING_ID = uuid.uuid4()
+UPDATED_AT = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+PAINTING = {
+    "id": PAINTING_ID,
+    "name": "Утро в сосновом лесу",
+    "artist_name": "Иван Шишкин",
+    "artist_slug": "ivan-shishkin",
+    "painting_slug": "utro-v-sosnovom-lesu",
+    "museum_name": "Третьяковская галерея",
+    "genre_name": ["пейзаж"],
+    "image_url": "https://example.org/morning.jpg",
+    "source_url": "https://example.org/morning",
+    "license_name": None,
+    "license_url": None,
+    "facts_count": 2,
+    "image_sha256": "ab" * 32,
+    "image_width": 4096,
+    "image_height": 3000,
+}
+
+
+def make_fact(order_index: int) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "painting_id": PAINTING_ID,
+        "name": f"fact {order_index}",
+        "description_md": "**bear**",
+        "description_html": "<p><strong>bear</strong></p>",
+        "description_text": "bear",
+        "geometry_type": "rect",
+        "x": 0.1,
+        "y": 0.2,
+        "w": 0.3,
+        "h": 0.4,
+        "order_index": order_index,
+    }
+
+
+def make_row(fact: dict | None) -> SimpleNamespace:
+    mapping = {**PAINTING, "updated_at": UPDATED_AT, "facts_updated_at": UPDATED_AT, "facts_digest": "d"}
+    for column in BUNDLE_FACT_COLUMNS:
+        mapping[f"fact_{column}"] = None if fact is None else fact[column]
+    return SimpleNamespace(_mapping=mapping)
+
+
+class FakeSession:
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    async def execute(self, statement, params):
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def test_bundle_rows_carry_every_schema_field():
+    schema_fields = set(PaintingBundleResponse.model_fields) - {"facts"}
+    assert schema_fields == set(BUNDLE_PAINTING_COLUMNS)
+    assert set(FactResponse.model_fields) == set(BUNDLE_FACT_COLUMNS)
+
+
+def test_bundle_body_matches_the_schema():
+    facts = [make_fact(0), make_fact(1)]
+
+    validators, body = asyncio.run(_load_bundle(FakeSession([make_row(fact) for fact in facts]), PAINTING_ID, JSON))
+
+    expected = PaintingBundleResponse.model_validate({**PAINTING, "facts": facts})
+    assert body == expected.model_dump_json().encode()
+    document = json.loads(body)
+    assert [fact["name"] for fact in document["facts"]] == ["fact 0", "fact 1"]
+    assert document["tiles"] is not None
+    assert "image_sha256" not in document
+    assert validators.last_modified == UPDATED_AT
+
+
+def test_painting_without_facts_has_an_empty_list():
+    bundle = bundle_from_rows([make_row(None)])
+
+    assert bundle.facts == []
+    assert bundle.painting == PAINTING
+    assert bundle.version.painting_id == PAINTING_ID
+
+
+def test_unknown_painting_has_no_bundle():
+    assert asyncio.run(_load_bundle(FakeSession([]), PAINTING_ID, JSON)) is None
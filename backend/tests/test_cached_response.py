@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from starlette.requests import Request
+
+from app.http_cache import make_validators
+from app.routers.paintings import _cached_response
+from app.services.paintings import PaintingVersion
+
+UPDATED_AT = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class Loaders:
+    """Stands in for the database: counts the version and body queries."""
+
+    def __init__(self, painting_id: uuid.UUID | None, body: bytes = b'{"name":"x"}'):
+        self.version = PaintingVersion(painting_id, UPDATED_AT, None, None) if painting_id else None
+        self.body = body
+        self.version_queries = 0
+        self.body_queries = 0
+
+    async def load(self):
+        self.body_queries += 1
+        if self.version is None:
+            return None
+        return make_validators("painting", self.version), self.body
+
+    async def load_version(self):
+        self.version_queries += 1
+        return self.version
+
+
+def serve(request: Request, loaders: Loaders, painting_id: uuid.UUID):
+    return asyncio.run(
+        _cached_response(request, ("painting", painting_id), painting_id, loaders.load, loaders.load_version)
+    )
+
+
+def test_conditional_miss_answers_304_from_the_version_query():
+    painting_id = uuid.uuid4()
+    loaders = Loaders(painting_id)
+    etag = make_validators("painting", loaders.version).etag
+
+    response = serve(make_request(if_none_match=etag), loaders, painting_id)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert (loaders.version_queries, loaders.body_queries) == (1, 0)
+
+
+def test_conditional_miss_matches_compressed_variant():
+    painting_id = uuid.uuid4()
+    loaders = Loaders(painting_id)
+    etag = make_validators("painting", loaders.version).encoded("gzip").etag
+
+    response = serve(make_request(if_none_match=etag, accept_encoding="gzip"), loaders, painting_id)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert loaders.body_queries == 0
+
+
+def test_if_modified_since_miss_skips_the_body():
+    painting_id = uuid.uuid4()
+    loaders = Loaders(painting_id)
+
+    response = serve(make_request(if_modified_since="Thu, 01 Oct 2026 12:00:00 GMT"), loaders, painting_id)
+
+    assert response.status_code == 304
+    assert loaders.body_queries == 0
+
+
+def test_changed_painting_loads_the_body_once():
+    painting_id = uuid.uuid4()
+    loaders = Loaders(painting_id)
+
+    response = serve(make_request(if_none_match='"stale"'), loaders, painting_id)
+
+    assert response.status_code == 200
+    assert response.body == loaders.body
+    assert (loaders.version_queries, loaders.body_queries) == (1, 1)
+
+
+def test_unconditional_miss_does_not_query_the_version():
+    painting_id = uuid.uuid4()
+    loaders = Loaders(painting_id)
+
+    response = serve(make_request(), loaders, painting_id)
+
+    assert response.status_code == 200
+    assert (loaders.version_queries, loaders.body_queries) == (0, 1)
+
+
+def test_conditional_request_for_missing_painting():
+    painting_id = uuid.uuid4()
+    loaders = Loaders(None)
+
+    assert serve(make_request(if_none_match='"x"'), loaders, painting_id) is None
+    assert loaders.body_queries == 0
@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.db.database import get_session
+from app.main import app
+from app.routers import paintings
+from app.services.fact_edits import FactEditError, FactVersionMismatch
+from app.services.paintings import PaintingVersion
+
+TOKEN = "editor-secret"
+PAINTING_ID = uuid.uuid4()
+URL = f"/api/v1/paintings/by-id/{PAINTING_ID}/facts"
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+
+class FakeSession:
+    async def scalar(self, _statement):
+        return "0/16B3748"
+
+
+async def fake_session():
+    yield FakeSession()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(paintings, "FACTS_EDIT_TOKEN", TOKEN)
+    app.dependency_overrides[get_session] = fake_session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def edit_with(monkeypatch, outcome):
+    calls = []
+
+    async def edit_facts(_session, painting_id, edits, if_match):
+        calls.append((painting_id, if_match))
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(paintings, "edit_facts", edit_facts)
+    return calls
+
+
+def test_editing_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(paintings, "FACTS_EDIT_TOKEN", "")
+    assert client.patch(URL, json={}, headers={**AUTH, "If-Match": '"x"'}).status_code == 403
+
+
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", f"Basic {TOKEN}", TOKEN])
+def test_wrong_token(client, monkeypatch, authorization):
+    calls = edit_with(monkeypatch, None)
+    headers = {"If-Match": '"x"'}
+    if authorization:
+        headers["Authorization"] = authorization
+    response = client.patch(URL, json={}, headers=headers)
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert calls == []
+
+
+def test_if_match_required(client, monkeypatch):
+    calls = edit_with(monkeypatch, None)
+    assert client.patch(URL, json={}, headers=AUTH).status_code == 428
+    assert calls == []
+
+
+def test_stale_if_match(client, monkeypatch):
+    calls = edit_with(monkeypatch, FactVersionMismatch())
+    assert client.patch(URL, json={}, headers={**AUTH, "If-Match": '"stale"'}).status_code == 412
+    assert calls == [(PAINTING_ID, '"stale"')]
+
+
+def test_edit_that_does_not_apply(client, monkeypatch):
+    edit_with(monkeypatch, FactEditError("unknown facts: x"))
+    response = client.patch(URL, json={}, headers={**AUTH, "If-Match": '"x"'})
+    assert response.status_code == 422
+    assert response.json()["detail"] == "unknown facts: x"
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"create": [{"name": "a", "geometry_type": "rect", "x": 0, "y": 0, "w": 0, "h": 0.1}]},
+        {"delete": [str(uuid.UUID(int=1)), str(uuid.UUID(int=1))]},
+        {"order": [str(uuid.UUID(int=1)), str(uuid.UUID(int=1))]},
+    ],
+)
+def test_invalid_payload(client, monkeypatch, payload):
+    calls = edit_with(monkeypatch, None)
+    assert client.patch(URL, json=payload, headers={**AUTH, "If-Match": '"x"'}).status_code == 422
+    assert calls == []
+
+
+def test_unknown_painting(client, monkeypatch):
+    edit_with(monkeypatch, None)
+    assert client.patch(URL, json={}, headers={**AUTH, "If-Match": '"x"'}).status_code == 404
+
+
+def test_successful_edit_returns_new_etag_and_lsn(client, monkeypatch):
+    version = PaintingVersion(PAINTING_ID, datetime(2026, 10, 1, tzinfo=timezone.utc), None, None)
+    edit_with(monkeypatch, (version, []))
+    response = client.patch(URL, json={}, headers={**AUTH, "If-Match": '"x"'})
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["etag"] == paintings.make_validators("facts", version).etag
+    assert response.headers["x-primary-lsn"] == "0/16B3748"
+
+
+def request_with(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.mark.parametrize(
+    "headers, bypass",
+    [
+        ({}, False),
+        ({"authorization": "Bearer wrong"}, False),
+        ({"authorization": f"Bearer {TOKEN}"}, True),
+        ({"x_read_your_writes": "garbage"}, False),
+        ({"x_read_your_writes": "primary"}, True),
+        ({"x_read_your_writes": "0/16B3748"}, True),
+    ],
+)
+def test_only_editors_and_read_your_writes_skip_the_snapshot(monkeypatch, headers, bypass):
+    snapshot = object()
+    monkeypatch.setattr(paintings, "FACTS_EDIT_TOKEN", TOKEN)
+    monkeypatch.setattr(paintings.snapshot_store, "current", lambda: snapshot)
+    assert (paintings._snapshot_for(request_with(**headers)) is None) == bypass
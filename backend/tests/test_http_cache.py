@@ -0,0 +1,127 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from starlette.requests import Request
+
+from app.http_cache import (
+    if_match_satisfied,
+    is_conditional,
+    is_not_modified,
+    make_validators,
+    none_match,
+    not_modified_response,
+    parse_quality_list,
+)
+from app.services.paintings import PaintingVersion
+
+PAINTING_ID = uuid.uuid4()
+UPDATED_AT = datetime(2026, 10, 1, 12, 0, 30, 123456, tzinfo=timezone.utc)
+VERSION = PaintingVersion(PAINTING_ID, UPDATED_AT, None, None)
+
+
+def make_request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_representations_get_distinct_etags():
+    assert make_validators("painting", VERSION).etag != make_validators("facts", VERSION).etag
+
+
+def test_etag_changes_with_the_facts():
+    changed = VERSION._replace(facts_updated_at=UPDATED_AT, facts_digest="abc")
+
+    assert make_validators("facts", VERSION).etag != make_validators("facts", changed).etag
+
+
+def test_last_modified_is_the_later_of_painting_and_facts_in_whole_seconds():
+    facts_updated_at = UPDATED_AT + timedelta(hours=1)
+
+    validators = make_validators("bundle", VERSION._replace(facts_updated_at=facts_updated_at, facts_digest="d"))
+
+    assert validators.last_modified == facts_updated_at.replace(microsecond=0)
+
+
+def test_naive_timestamps_are_utc():
+    naive = VERSION._replace(updated_at=UPDATED_AT.replace(tzinfo=None))
+
+    assert make_validators("painting", naive).last_modified.tzinfo is not None
+
+
+def test_encoded_variants_have_their_own_etag():
+    validators = make_validators("painting", VERSION)
+
+    assert validators.encoded("identity") == validators
+    assert validators.encoded("gzip").etag == validators.etag[:-1] + '-gzip"'
+    assert validators.encoded("br").last_modified == validators.last_modified
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [('"a"', True), ('"b", "a"', True), ('W/"a"', True), ("*", True), ('"b"', False), ('"a-gzip"', False)],
+)
+def test_none_match_uses_weak_comparison(header, expected):
+    assert none_match(header, '"a"') is expected
+
+
+def test_if_none_match_hit_is_not_modified():
+    validators = make_validators("painting", VERSION)
+
+    assert is_not_modified(make_request(if_none_match=validators.etag), validators)
+
+
+def test_if_none_match_overrides_if_modified_since():
+    validators = make_validators("painting", VERSION)
+    request = make_request(if_none_match='"other"', if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT")
+
+    assert not is_not_modified(request, validators)
+
+
+@pytest.mark.parametrize(
+    ("since", "expected"),
+    [
+        ("Thu, 01 Oct 2026 12:00:30 GMT", True),
+        ("Thu, 01 Oct 2026 13:00:00 GMT", True),
+        ("Thu, 01 Oct 2026 12:00:29 GMT", False),
+        ("Thu, 01 Oct 2026 15:00:30 +0300", True),
+        ("not a date", False),
+    ],
+)
+def test_if_modified_since(since, expected):
+    validators = make_validators("painting", VERSION)
+
+    assert is_not_modified(make_request(if_modified_since=since), validators) is expected
+
+
+def test_unconditional_request():
+    request = make_request(accept="application/json")
+
+    assert not is_conditional(request)
+    assert not is_not_modified(request, make_validators("painting", VERSION))
+    assert is_conditional(make_request(if_modified_since="Thu, 01 Oct 2026 12:00:30 GMT"))
+
+
+def test_if_match_is_strong():
+    validators = make_validators("facts", VERSION)
+
+    assert if_match_satisfied(validators.etag, [validators])
+    assert if_match_satisfied(f'"x", {validators.encoded("gzip").etag}', [validators, validators.encoded("gzip")])
+    assert if_match_satisfied("*", [validators])
+    assert not if_match_satisfied(f"W/{validators.etag}", [validators])
+
+
+def test_not_modified_response_repeats_the_validators():
+    validators = make_validators("painting", VERSION)
+
+    response = not_modified_response(validators)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == validators.etag
+    assert response.headers["last-modified"] == "Thu, 01 Oct 2026 12:00:30 GMT"
+    assert "cache-control" in response.headers
+
+
+def test_parse_quality_list():
+    assert parse_quality_list("gzip;q=0.5, BR, identity;q=x") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    assert parse_quality_list(None) == {}
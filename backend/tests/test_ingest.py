@@ -0,0 +1,133 @@
+import pytest
+
+from app.ingest import Batch, RecordError, add_csv_row, add_document, alias_row, fact_id, fact_row, painting_row
+
+PAINTING = {
+    "name": "Звёздная ночь",
+    "artist_name": "Винсент ван Гог",
+    "artist_slug": "van-gogh",
+    "painting_slug": "starry-night",
+    "image_url": "https://example.org/starry-night.jpg",
+    "source_url": "https://example.org/starry-night",
+}
+
+
+def fact(**fields) -> dict:
+    return {"name": "Кипарис", "geometry_type": "rect", "x": 0.1, "y": 0.2, "w": 0.3, "h": 0.4, **fields}
+
+
+def document(**fields) -> dict:
+    return {**PAINTING, **fields}
+
+
+def load(record) -> Batch:
+    batch = Batch()
+    add_document(batch, 1, record)
+    return batch
+
+
+def test_document_with_facts_and_aliases():
+    batch = load(document(
+        genre_name=["Пейзаж", " ", "Постимпрессионизм "],
+        facts=[fact(key="cypress"), fact(order_index=5)],
+        aliases=[{"combined_slug": "van-gogh-starry-night"}, {"artist_slug": "gogh", "painting_slug": "night"}],
+    ))
+    assert batch.paintings[0][6] == ["Пейзаж", "Постимпрессионизм"]
+    assert [row[1] for row in batch.facts] == [
+        fact_id("van-gogh", "starry-night", "cypress"),
+        fact_id("van-gogh", "starry-night", 5),
+    ]
+    assert [row[-1] for row in batch.facts] == [0, 5]
+    assert len(batch.aliases) == 2
+
+
+def test_facts_without_key_or_order_index_use_their_position():
+    batch = load(document(facts=[fact(), fact(), fact()]))
+    assert [row[1] for row in batch.facts] == [fact_id("van-gogh", "starry-night", i) for i in range(3)]
+    assert [row[-1] for row in batch.facts] == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "facts",
+    [
+        [fact(key="a"), fact(key="a")],
+        [fact(order_index=1), fact(order_index=1)],
+        # The second fact falls back to position 1, which the first one claims as its order_index.
+        [fact(order_index=1), fact()],
+    ],
+)
+def test_duplicate_fact_keys_reject_the_document(facts):
+    with pytest.raises(RecordError):
+        load(document(facts=facts))
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"facts": "not a list"},
+        {"facts": {"key": "a"}},
+        {"aliases": "old-slug"},
+        {"aliases": ["old-slug"]},
+        {"facts": ["fact"]},
+        {"genre_name": {"a": 1}},
+        {"genre_name": ["Пейзаж", 3]},
+        {"name": ""},
+    ],
+)
+def test_malformed_documents_are_record_errors(fields):
+    with pytest.raises(RecordError):
+        load(document(**fields))
+
+
+def test_non_object_document():
+    with pytest.raises(RecordError):
+        load(["not", "an", "object"])
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        {"x": "left"},
+        {"x": None},
+        {"w": 0},
+        {"x": 0.9, "w": 1.5},
+        {"order_index": "first"},
+    ],
+)
+def test_bad_fact_fields(fields):
+    with pytest.raises(RecordError):
+        fact_row(1, "van-gogh", "starry-night", fact(**fields), 0)
+
+
+def test_csv_fact_needs_key_or_order_index():
+    with pytest.raises(RecordError):
+        fact_row(1, "van-gogh", "starry-night", fact())
+    row = fact_row(1, "van-gogh", "starry-night", fact(key="cypress"))
+    assert row[-1] == 0
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {},
+        {"combined_slug": "a-b", "artist_slug": "a"},
+        {"artist_slug": "a"},
+    ],
+)
+def test_alias_needs_exactly_one_form(record):
+    with pytest.raises(RecordError):
+        alias_row(1, "van-gogh", "starry-night", record)
+
+
+def test_csv_rows():
+    batch = Batch()
+    add_csv_row(batch, "paintings", 1, {**PAINTING, "genre_name": "Пейзаж|Ночь"})
+    add_csv_row(batch, "facts", 2, {"artist_slug": "van-gogh", "painting_slug": "starry-night", **fact(order_index="2")})
+    add_csv_row(
+        batch, "aliases", 3, {"target_artist_slug": "van-gogh", "target_painting_slug": "starry-night",
+                              "combined_slug": "starry"}
+    )
+    assert batch.paintings[0][6] == ["Пейзаж", "Ночь"]
+    assert batch.facts[0][-1] == 2
+    assert batch.aliases[0][-1] == "starry"
+    assert painting_row(1, PAINTING)[6] is None
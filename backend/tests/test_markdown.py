@@ -0,0 +1,81 @@
+import pytest
+
+from app.services.markdown import EXCERPT_LENGTH, RENDER_VERSION, excerpt, render_description
+
+
+def test_renders_commonmark_with_gfm_tables_and_strikethrough():
+    rendered = render_description("**Шишкин** и ~~Савицкий~~\n\n| a | b |\n|---|---|\n| 1 | 2 |")
+
+    assert "<strong>Шишкин</strong>" in rendered.html
+    assert "<s>Савицкий</s>" in rendered.html
+    assert "<table>" in rendered.html
+    assert rendered.version == RENDER_VERSION
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "<script>alert(1)</script>",
+        '<img src="x" onerror="alert(1)">',
+        '<a href="https://example.org">raw link</a>',
+        "text <iframe src=//evil.example></iframe>",
+    ],
+)
+def test_raw_html_is_escaped(source):
+    html = render_description(source).html
+
+    assert "<script" not in html
+    assert "<img" not in html
+    assert "<iframe" not in html
+    assert "<a " not in html
+    assert "&lt;" in html
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["javascript:alert(1)", "JAVASCRIPT:alert(1)", "vbscript:msgbox(1)", "file:///etc/passwd", "data:text/html,<b>x</b>"],
+)
+def test_scripting_links_are_not_linked(url):
+    html = render_description(f"[click]({url})").html
+
+    assert "<a " not in html
+    assert "href" not in html
+
+
+def test_links_open_in_a_new_tab():
+    html = render_description("[Третьяковка](https://www.tretyakovgallery.ru)").html
+
+    assert 'href="https://www.tretyakovgallery.ru"' in html
+    assert 'target="_blank"' in html
+    assert 'rel="noreferrer"' in html
+
+
+def test_image_data_urls_are_allowed():
+    html = render_description("![dot](data:image/png;base64,iVBORw0KGgo=)").html
+
+    assert 'src="data:image/png;base64,iVBORw0KGgo="' in html
+
+
+def test_plain_text_drops_markup_and_keeps_code():
+    rendered = render_description("# Title\n\nSome *emphasis*,\nsoft break and `code`.\n\n```\nblock\n```")
+
+    assert rendered.text == "Title Some emphasis, soft break and code. block"
+
+
+def test_excerpt_cuts_at_a_word_boundary():
+    text = "слово " * 100
+
+    cut = excerpt(text)
+
+    assert len(cut) <= EXCERPT_LENGTH + 1
+    assert cut.endswith("слово…")
+
+
+def test_short_text_is_not_cut():
+    assert excerpt("short text") == "short text"
+
+
+def test_excerpt_keeps_long_words_whole_only_when_cheap():
+    text = "a " + "x" * 300
+
+    assert excerpt(text, 20) == "a " + "x" * 18 + "…"
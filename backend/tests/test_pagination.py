@@ -0,0 +1,29 @@
+import pytest
+
+from app.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize(
+    "values",
+    [["van-gogh", "starry-night"], ["", ""], ["айвазовский", "девятый-вал"], ["a=b", "c/d?e"]],
+)
+def test_round_trip(values):
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, len(values)) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64!",
+        encode_cursor(["only-one"]),
+        encode_cursor(["a", "b", "c"]),
+        encode_cursor(["a", 1]),
+        encode_cursor({"a": "b"}),
+    ],
+)
+def test_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
@@ -0,0 +1,130 @@
+import gzip
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.http_cache import Validators
+from app.services import response_cache as response_cache_module
+from app.services.response_cache import ResponseCache, negotiate_encoding
+
+VALIDATORS = Validators(etag='"v1"', last_modified=datetime(2026, 10, 1, tzinfo=timezone.utc))
+BODY = b'{"name":"' + b"x" * 1000 + b'"}'
+
+
+def put(cache: ResponseCache, name: str, painting_id: uuid.UUID, body: bytes = BODY):
+    return cache.put((name, painting_id), painting_id, body, VALIDATORS, cache.generation)
+
+
+def test_hit_after_put():
+    cache = ResponseCache(64 * 1024, ttl=60)
+    painting_id = uuid.uuid4()
+    put(cache, "painting", painting_id)
+
+    entry = cache.get(("painting", painting_id))
+
+    assert entry.variants["identity"] == BODY
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = ResponseCache(12 * len(BODY), ttl=60)
+    first, second = uuid.uuid4(), uuid.uuid4()
+    put(cache, "painting", first)
+    for _ in range(11):
+        put(cache, "painting", second)
+        put(cache, "facts", uuid.uuid4())
+
+    assert cache.size <= cache.max_bytes
+    assert cache.get(("painting", first)) is None
+    assert cache.get(("painting", second)) is not None
+    assert cache.evictions > 0
+
+
+def test_oversized_body_is_not_cached():
+    cache = ResponseCache(8 * len(BODY) - 1, ttl=60)
+    painting_id = uuid.uuid4()
+
+    entry = put(cache, "painting", painting_id)
+
+    assert entry.variants["identity"] == BODY
+    assert cache.get(("painting", painting_id)) is None
+    assert cache.size == 0
+
+
+def test_entries_expire(monkeypatch):
+    cache = ResponseCache(64 * 1024, ttl=60)
+    painting_id = uuid.uuid4()
+    put(cache, "painting", painting_id)
+
+    now = response_cache_module.time.monotonic()
+    monkeypatch.setattr(response_cache_module.time, "monotonic", lambda: now + 61)
+
+    assert cache.get(("painting", painting_id)) is None
+    assert cache.size == 0
+
+
+def test_painting_invalidation_drops_only_that_painting():
+    cache = ResponseCache(64 * 1024, ttl=60)
+    changed, other = uuid.uuid4(), uuid.uuid4()
+    for name in ("painting", "facts"):
+        put(cache, name, changed)
+    put(cache, "painting", other)
+
+    cache.invalidate(str(changed))
+
+    assert cache.get(("painting", changed)) is None
+    assert cache.get(("facts", changed)) is None
+    assert cache.get(("painting", other)) is not None
+    assert cache.size == len(BODY)
+
+
+def test_full_invalidation_and_stale_puts():
+    cache = ResponseCache(64 * 1024, ttl=60)
+    painting_id = uuid.uuid4()
+    generation = cache.generation
+    put(cache, "painting", painting_id)
+
+    cache.invalidate("*")
+    cache.put(("facts", painting_id), painting_id, BODY, VALIDATORS, generation)
+
+    assert cache.stats()["entries"] == 0
+    assert cache.size == 0
+
+
+def test_compressed_variant_is_built_once_and_counted():
+    cache = ResponseCache(64 * 1024, ttl=60)
+    entry = put(cache, "painting", uuid.uuid4())
+
+    assert cache.coding(entry, "gzip, deflate") == "gzip"
+    response = cache.response(entry, "gzip")
+    again = cache.response(entry, "gzip")
+
+    assert gzip.decompress(response.body) == BODY
+    assert again.body is response.body
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"v1-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert cache.size == len(BODY) + len(response.body)
+
+
+def test_small_bodies_are_sent_uncompressed():
+    cache = ResponseCache(64 * 1024, ttl=60)
+    entry = put(cache, "painting", uuid.uuid4(), body=b"{}")
+
+    assert cache.coding(entry, "gzip") == "identity"
+    assert "content-encoding" not in cache.response(entry, "identity").headers
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [(None, "identity"), ("gzip", "gzip"), ("gzip;q=0", "identity"), ("*;q=0", "identity"), ("identity", "identity")],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_prefers_brotli_when_available():
+    expected = "br" if response_cache_module.brotli is not None else "gzip"
+
+    assert negotiate_encoding("gzip, br") == expected
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight, SingleFlightTimeout
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_concurrent_calls_share_one_load():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+        release = asyncio.Event()
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        tasks = [asyncio.create_task(flight.do("key", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return flight, calls, results
+
+    flight, calls, results = run(scenario())
+    assert calls == 1
+    assert results == [1] * 5
+    assert flight.stats() == {
+        "in_flight": 0, "waiting": 0, "leaders": 1, "coalesced": 4, "timeouts": 0, "errors": 0
+    }
+
+
+def test_different_keys_do_not_coalesce():
+    async def scenario():
+        flight = SingleFlight("test")
+
+        async def load(value):
+            await asyncio.sleep(0)
+            return value
+
+        return await asyncio.gather(*(flight.do(key, lambda key=key: load(key)) for key in ("a", "b")))
+
+    assert run(scenario()) == ["a", "b"]
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("boom")
+
+        tasks = [asyncio.create_task(flight.do("key", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        async def succeeding():
+            return "ok"
+
+        return flight, results, await flight.do("key", succeeding)
+
+    flight, results, retried = run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retried == "ok"
+    assert flight.errors == 1
+
+
+def test_waiter_times_out_without_cancelling_the_load():
+    async def scenario():
+        flight = SingleFlight("test", timeout=0.01)
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        with pytest.raises(SingleFlightTimeout):
+            await flight.do("key", load)
+        release.set()
+        return flight, await leader
+
+    flight, result = run(scenario())
+    assert result == "done"
+    assert flight.timeouts == 1
+
+
+def test_waiter_takes_over_when_the_leader_is_cancelled():
+    async def scenario():
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return calls
+
+        leader = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return flight, await waiter
+
+    flight, result = run(scenario())
+    assert result == 2
+    assert flight.leaders == 2
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,118 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.services import slug_cache as slug_cache_module
+from app.services.resolver import SlugResolution
+from app.services.slug_cache import MISSING, SlugCache, resolve_combined_slug, resolve_painting_pair
+
+
+def make_resolution(painting_slug: str = "utro") -> SlugResolution:
+    return SlugResolution(uuid.uuid4(), "shishkin", painting_slug, False)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(slug_cache_module.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def test_hit_and_miss_are_counted():
+    cache = SlugCache(10, ttl=60, negative_ttl=5)
+    resolution = make_resolution()
+
+    assert cache.get(("pair", "shishkin", "utro")) is MISSING
+    cache.set(("pair", "shishkin", "utro"), resolution, cache.generation)
+
+    assert cache.get(("pair", "shishkin", "utro")) == resolution
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SlugCache(2, ttl=60, negative_ttl=5)
+    for name in ("a", "b"):
+        cache.set(("pair", "x", name), make_resolution(name), cache.generation)
+    cache.get(("pair", "x", "a"))
+
+    cache.set(("pair", "x", "c"), make_resolution("c"), cache.generation)
+
+    assert cache.get(("pair", "x", "b")) is MISSING
+    assert cache.get(("pair", "x", "a")) is not MISSING
+    assert cache.stats()["size"] == 2
+    assert cache.evictions == 1
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = SlugCache(10, ttl=60, negative_ttl=5)
+    cache.set(("pair", "x", "found"), make_resolution(), cache.generation)
+    cache.set(("pair", "x", "gone"), None, cache.generation)
+
+    clock.now += 10
+    assert cache.get(("pair", "x", "gone")) is MISSING
+    assert cache.get(("pair", "x", "found")) is not MISSING
+
+    clock.now += 60
+    assert cache.get(("pair", "x", "found")) is MISSING
+
+
+def test_negative_entries_are_cached():
+    cache = SlugCache(10, ttl=60, negative_ttl=5)
+    cache.set(("combined", "nope"), None, cache.generation)
+
+    assert cache.get(("combined", "nope")) is None
+    assert cache.negative_hits == 1
+
+
+def test_invalidation_clears_and_rejects_stale_writes():
+    cache = SlugCache(10, ttl=60, negative_ttl=5)
+    cache.set(("pair", "x", "a"), make_resolution(), cache.generation)
+    generation = cache.generation
+
+    cache.invalidate("*")
+    cache.set(("pair", "x", "b"), make_resolution(), generation)
+
+    assert cache.get(("pair", "x", "a")) is MISSING
+    assert cache.get(("pair", "x", "b")) is MISSING
+    assert cache.invalidations == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SlugCache(0, ttl=60, negative_ttl=5)
+    cache.set(("pair", "x", "a"), make_resolution(), cache.generation)
+
+    assert cache.stats()["size"] == 0
+
+
+def test_resolvers_query_once_per_key(monkeypatch):
+    cache = SlugCache(10, ttl=60, negative_ttl=5)
+    monkeypatch.setattr(slug_cache_module, "slug_cache", cache)
+    queries = []
+    resolution = make_resolution()
+
+    async def resolve_slugs(session, **slugs):
+        queries.append(slugs)
+        return resolution if "painting_slug" in slugs else None
+
+    monkeypatch.setattr(slug_cache_module, "resolve_slugs", resolve_slugs)
+
+    async def resolve_twice():
+        for _ in range(2):
+            assert await resolve_painting_pair(None, "shishkin", "utro") == resolution
+            assert await resolve_combined_slug(None, "shishkin-nope") is None
+
+    asyncio.run(resolve_twice())
+
+    assert queries == [
+        {"artist_slug": "shishkin", "painting_slug": "utro"},
+        {"combined_slug": "shishkin-nope"},
+    ]
@@ -0,0 +1,122 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.replicas import get_read_session
+from app.main import app
+from app.services import spatial
+from app.services.spatial import SMALL_PAINTING, SpatialIndexCache, get_facts_at_point, get_facts_in_viewport
+
+
+def make_fact(x: float, y: float, w: float, h: float, order_index: int):
+    return SimpleNamespace(x=x, y=y, w=w, h=h, order_index=order_index)
+
+
+class FakeSession:
+    """Answers the facts_count lookup and the GiST query, counting both."""
+
+    def __init__(self, facts_count: int | None, facts: list):
+        self.facts_count = facts_count
+        self.facts = facts
+        self.count_queries = 0
+        self.sql_queries = 0
+
+    async def scalar(self, stmt):
+        self.count_queries += 1
+        return self.facts_count
+
+    async def execute(self, stmt):
+        self.sql_queries += 1
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: list(self.facts)))
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SpatialIndexCache(8)
+    monkeypatch.setattr(spatial, "spatial_cache", cache)
+    monkeypatch.setattr(spatial, "SPATIAL_CACHE_MIN_FACTS", 3)
+    return cache
+
+
+@pytest.fixture
+def facts(monkeypatch):
+    facts = [
+        make_fact(0.0, 0.0, 0.5, 0.5, 0),
+        make_fact(0.4, 0.4, 0.1, 0.1, 1),
+        make_fact(0.8, 0.8, 0.1, 0.1, 2),
+    ]
+
+    async def get_facts_for_painting(session, painting_id):
+        return facts
+
+    monkeypatch.setattr(spatial, "get_facts_for_painting", get_facts_for_painting)
+    return facts
+
+
+def test_small_painting_decision_is_cached(cache, facts):
+    painting_id = uuid.uuid4()
+    session = FakeSession(facts_count=2, facts=facts[:2])
+
+    for _ in range(3):
+        assert asyncio.run(get_facts_at_point(session, painting_id, 0.45, 0.45)) == facts[:2]
+
+    assert cache.get(painting_id) is SMALL_PAINTING
+    assert (session.count_queries, session.sql_queries) == (1, 3)
+
+
+def test_invalidation_drops_the_small_painting_decision(cache, facts):
+    painting_id = uuid.uuid4()
+    asyncio.run(get_facts_at_point(FakeSession(facts_count=2, facts=facts[:2]), painting_id, 0.45, 0.45))
+
+    cache.invalidate(str(painting_id))
+    session = FakeSession(facts_count=3, facts=facts)
+
+    assert asyncio.run(get_facts_at_point(session, painting_id, 0.45, 0.45)) == facts[:2]
+    assert session.sql_queries == 0
+    assert cache.get(painting_id) is not SMALL_PAINTING
+
+
+def test_large_painting_is_answered_from_memory(cache, facts):
+    painting_id = uuid.uuid4()
+    session = FakeSession(facts_count=3, facts=facts)
+
+    assert asyncio.run(get_facts_in_viewport(session, painting_id, 0.7, 0.7, 0.3, 0.3)) == [facts[2]]
+    assert asyncio.run(get_facts_in_viewport(session, painting_id, 0.0, 0.0, 1.0, 1.0, limit=1)) == [facts[0]]
+    assert (session.count_queries, session.sql_queries) == (1, 0)
+
+
+def test_unknown_painting_returns_none_and_is_not_cached(cache, facts):
+    painting_id = uuid.uuid4()
+    session = FakeSession(facts_count=None, facts=[])
+
+    assert asyncio.run(get_facts_at_point(session, painting_id, 0.5, 0.5)) is None
+    assert asyncio.run(get_facts_in_viewport(session, painting_id, 0.0, 0.0, 1.0, 1.0)) is None
+    assert cache.get(painting_id) is None
+    assert session.sql_queries == 0
+
+
+def test_stale_generation_is_not_cached(cache):
+    painting_id = uuid.uuid4()
+    generation = cache.generation
+    cache.invalidate("*")
+
+    cache.set(painting_id, SMALL_PAINTING, generation)
+
+    assert cache.get(painting_id) is None
+
+
+@pytest.mark.parametrize("path", ["facts/at?x=0.5&y=0.5", "facts/viewport?x=0&y=0&w=1&h=1"])
+def test_spatial_endpoints_answer_404_for_unknown_painting(cache, path):
+    async def fake_session():
+        yield FakeSession(facts_count=None, facts=[])
+
+    app.dependency_overrides[get_read_session] = fake_session
+    try:
+        response = TestClient(app).get(f"/api/v1/paintings/by-id/{uuid.uuid4()}/{path}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 404
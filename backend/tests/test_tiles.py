@@ -0,0 +1,77 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import tiles
+from app.routers.tiles import _byte_range
+
+SHA256 = "ab" * 32
+DATA = bytes(range(100))
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=90-500", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        (" bytes=5-5 ", (5, 5)),
+    ],
+)
+def test_satisfiable_ranges(header, expected):
+    assert _byte_range(header, len(DATA)) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=5-3", "bytes=-", "bytes=0-1,5-6", "items=0-9", "bytes=a-b"])
+def test_invalid_ranges_are_ignored(header):
+    assert _byte_range(header, len(DATA)) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=-0"])
+def test_unsatisfiable_ranges_raise_416(header):
+    with pytest.raises(HTTPException) as raised:
+        _byte_range(header, len(DATA))
+    assert raised.value.status_code == 416
+    assert raised.value.headers["Content-Range"] == "bytes */100"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    tile = tmp_path / "0_0.jpg"
+    tile.write_bytes(DATA)
+    monkeypatch.setattr(tiles, "derivative_file", lambda sha256, path: tile if path == "tiles/0/0_0.jpg" else None)
+    return TestClient(app)
+
+
+def test_range_request_gets_206(client):
+    response = client.get(f"/api/v1/tiles/{SHA256}/tiles/0/0_0.jpg", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == DATA[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/100"
+
+
+def test_invalid_range_gets_the_full_body(client):
+    response = client.get(f"/api/v1/tiles/{SHA256}/tiles/0/0_0.jpg", headers={"Range": "bytes=5-3"})
+
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert "content-range" not in response.headers
+
+
+def test_range_past_the_end_gets_416(client):
+    response = client.get(f"/api/v1/tiles/{SHA256}/tiles/0/0_0.jpg", headers={"Range": "bytes=100-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */100"
+
+
+def test_matching_etag_gets_304(client):
+    etag = f'"{SHA256[:16]}-tiles/0/0_0.jpg"'
+
+    response = client.get(f"/api/v1/tiles/{SHA256}/tiles/0/0_0.jpg", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
@@ -0,0 +1,137 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from app.wire import (
+    COLUMNAR,
+    JSON,
+    MSGPACK,
+    decode_columnar,
+    decode_msgpack,
+    encode_columnar,
+    encode_facts,
+    encode_msgpack,
+    negotiate_format,
+)
+
+PAINTING_ID = uuid.UUID("6f1c2d8e-3b4a-4c5d-8e9f-0a1b2c3d4e5f")
+
+
+def make_fact(order_index: int, **overrides) -> dict:
+    fact = {
+        "id": str(uuid.UUID(int=order_index + 1)),
+        "painting_id": str(PAINTING_ID),
+        "name": f"Деталь {order_index}",
+        "description_md": f"**Факт** {order_index}",
+        "description_html": f"<p><strong>Факт</strong> {order_index}</p>",
+        "description_text": f"Факт {order_index}",
+        "geometry_type": "rect" if order_index % 2 else "ellipse",
+        "x": 0.125,
+        "y": 0.25,
+        "w": 0.5,
+        "h": 0.0625,
+        "order_index": order_index,
+    }
+    fact.update(overrides)
+    return fact
+
+
+FACTS = [
+    make_fact(0),
+    make_fact(1, description_html=None, description_text=None),
+    make_fact(2, description_md="", description_html="", description_text=""),
+    make_fact(3, x=0.1, y=0.2, w=0.3, h=0.4),
+]
+PAINTING = {"id": str(PAINTING_ID), "name": "Звёздная ночь", "facts_count": len(FACTS), "tiles": None}
+
+
+def assert_same_facts(decoded: list[dict], expected: list[dict]) -> None:
+    assert len(decoded) == len(expected)
+    for got, want in zip(decoded, expected):
+        assert set(got) == set(want)
+        for name in ("x", "y", "w", "h"):
+            assert got[name] == pytest.approx(want[name], abs=1e-7)
+        assert {k: v for k, v in got.items() if k not in "xywh"} == {k: v for k, v in want.items() if k not in "xywh"}
+
+
+@pytest.mark.parametrize(
+    "encode, decode",
+    [(encode_msgpack, decode_msgpack), (encode_columnar, decode_columnar)],
+    ids=["msgpack", "columnar"],
+)
+class TestRoundTrip:
+    def test_facts(self, encode, decode):
+        painting, facts = decode(encode(PAINTING_ID, FACTS))
+        assert painting is None
+        assert_same_facts(facts, FACTS)
+
+    def test_bundle_metadata(self, encode, decode):
+        painting, facts = decode(encode(PAINTING_ID, FACTS, PAINTING))
+        assert painting == PAINTING
+        assert_same_facts(facts, FACTS)
+
+    def test_empty(self, encode, decode):
+        assert decode(encode(PAINTING_ID, [])) == (None, [])
+
+    def test_null_renderings(self, encode, decode):
+        facts = [make_fact(0, description_html=None), make_fact(1, description_text=None)]
+        _, decoded = decode(encode(PAINTING_ID, facts))
+        assert [(f["description_html"], f["description_text"]) for f in decoded] == [
+            (None, "Факт 0"),
+            ("<p><strong>Факт</strong> 1</p>", None),
+        ]
+
+
+def test_columnar_without_nulls_has_no_mask():
+    rendered = [fact for fact in FACTS if fact["description_html"] is not None]
+    data = encode_columnar(PAINTING_ID, rendered)
+    assert int.from_bytes(data[4:6], "little") == 0
+    _, decoded = decode_columnar(data)
+    assert_same_facts(decoded, rendered)
+
+
+def test_columnar_arrays_are_aligned():
+    data = encode_columnar(PAINTING_ID, FACTS, PAINTING)
+    # The numeric arrays start after the 28-byte header, the metadata and the ids,
+    # and must be viewable in place.
+    metadata_length = int.from_bytes(data[28:32], "little")
+    start = 28 + 4 + metadata_length + (-(4 + metadata_length) % 4) + 16 * len(FACTS)
+    assert start % 4 == 0
+    xs = np.frombuffer(data, dtype="<f4", count=len(FACTS), offset=start)
+    assert xs.tolist() == pytest.approx([fact["x"] for fact in FACTS])
+
+
+def test_columnar_rejects_other_frames():
+    with pytest.raises(ValueError):
+        decode_columnar(b"AXF1" + bytes(28))
+
+
+def test_encode_facts_accepts_objects():
+    class Row:
+        def __init__(self, fact):
+            self.__dict__.update(fact, id=uuid.UUID(fact["id"]))
+
+    rows = [Row(fact) for fact in FACTS]
+    _, decoded = decode_columnar(encode_facts(COLUMNAR, PAINTING_ID, rows))
+    assert_same_facts(decoded, FACTS)
+    with pytest.raises(ValueError):
+        encode_facts(JSON, PAINTING_ID, rows)
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON),
+        ("*/*", JSON),
+        ("application/json", JSON),
+        ("application/msgpack", MSGPACK),
+        ("application/x-msgpack", MSGPACK),
+        (f"{COLUMNAR}, application/json;q=0.5", COLUMNAR),
+        (f"application/json, {COLUMNAR};q=0.5", JSON),
+        ("application/msgpack;q=0", JSON),
+        ("text/html", JSON),
+    ],
+)
+def test_negotiate_format(accept, expected):
+    assert negotiate_format(accept) == expected
@@ -20,6 +20,7 @@ interface Fact {
   painting_id: string;
   name: string;
   description_md: string;
+  description_html: string | null;
   geometry_type: string;
   x: number;
   y: number;
@@ -28,24 +29,17 @@ interface Fact {
   order_index: number;
 }
 
-async function fetchPainting(artistSlug: string, paintingSlug: string): Promise<Painting> {
-  const baseUrl = process.env.BACKEND_BASE_URL ?? "http://localhost:8000";
-  const response = await fetch(`${baseUrl}/api/v1/paintings/${artistSlug}/${paintingSlug}`, {
-    cache: "no-store",
-  });
-  if (!response.ok) {
-    throw new Error("Painting not found");
-  }
-  return response.json();
+interface PaintingBundle extends Painting {
+  facts: Fact[];
 }
 
-async function fetchFacts(paintingId: string): Promise<Fact[]> {
+async function fetchPaintingBundle(artistSlug: string, paintingSlug: string): Promise<PaintingBundle> {
   const baseUrl = process.env.BACKEND_BASE_URL ?? "http://localhost:8000";
-  const response = await fetch(`${baseUrl}/api/v1/paintings/by-id/${paintingId}/facts`, {
+  const response = await fetch(`${baseUrl}/api/v1/paintings/${artistSlug}/${paintingSlug}/bundle`, {
     cache: "no-store",
   });
   if (!response.ok) {
-    return [];
+    throw new Error("Painting not found");
   }
   return response.json();
 }
@@ -55,8 +49,7 @@ export default async function PaintingPage({
 }: {
   params: { artist_slug: string; painting_slug: string };
 }) {
-  const painting = await fetchPainting(params.artist_slug, params.painting_slug);
-  const facts = await fetchFacts(painting.id);
+  const { facts, ...painting } = await fetchPaintingBundle(params.artist_slug, params.painting_slug);
 
   return <PaintingViewer painting={painting} facts={facts} />;
 }
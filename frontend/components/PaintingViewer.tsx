@@ -26,6 +26,7 @@ interface Fact {
   painting_id: string;
   name: string;
   description_md: string;
+  description_html: string | null;
   geometry_type: string;
   x: number;
   y: number;
@@ -39,6 +40,27 @@ interface Props {
   facts: Fact[];
 }
 
+// The API sends HTML rendered and sanitized when the fact was written; Markdown is
+// only rendered here for facts the backend has not rendered yet.
+function FactDescription({ fact, className }: { fact: Fact; className: string }) {
+  if (fact.description_html) {
+    return <div className={className} dangerouslySetInnerHTML={{ __html: fact.description_html }} />;
+  }
+  return (
+    <div className={className}>
+      <ReactMarkdown
+        remarkPlugins={[remarkGfm]}
+        rehypePlugins={[rehypeSanitize]}
+        components={{
+          a: ({ node, ...props }) => <a {...props} target="_blank" rel="noreferrer" />,
+        }}
+      >
+        {fact.description_md}
+      </ReactMarkdown>
+    </div>
+  );
+}
+
 const slugify = (value: string) =>
   value
     .toLowerCase()
@@ -392,19 +414,10 @@ export default function PaintingViewer({ painting, facts }: Props) {
                   >
                     <div className="text-sm font-semibold text-slate-100">{fact.name}</div>
                     {isSelected && (
-                      <div className="prose prose-invert mt-2 text-sm text-slate-300">
-                        <ReactMarkdown
-                          remarkPlugins={[remarkGfm]}
-                          rehypePlugins={[rehypeSanitize]}
-                          components={{
-                            a: ({ node, ...props }) => (
-                              <a {...props} target="_blank" rel="noreferrer" />
-                            ),
-                          }}
-                        >
-                          {fact.description_md}
-                        </ReactMarkdown>
-                      </div>
+                      <FactDescription
+                        fact={fact}
+                        className="prose prose-invert mt-2 text-sm text-slate-300"
+                      />
                     )}
                   </li>
                 );
@@ -470,17 +483,7 @@ export default function PaintingViewer({ painting, facts }: Props) {
                   </svg>
                 </button>
               </div>
-              <div className="prose prose-invert text-sm text-slate-300">
-                <ReactMarkdown
-                  remarkPlugins={[remarkGfm]}
-                  rehypePlugins={[rehypeSanitize]}
-                  components={{
-                    a: ({ node, ...props }) => <a {...props} target="_blank" rel="noreferrer" />,
-                  }}
-                >
-                  {selectedFact.description_md}
-                </ReactMarkdown>
-              </div>
+              <FactDescription fact={selectedFact} className="prose prose-invert text-sm text-slate-300" />
             </div>
           </div>
         </div>